@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the dataset load strategies of the DuckDB test harness.
+
+For each scale factor, the pack is scaled N times into a temporary pack (see
+harness/scale.py), then each load strategy (tables, views, auto) is timed
+after one untimed warm-up of the SQL parser that 'auto' uses:
+- Load: registering all datasets in a fresh in-memory database
+- Query: running every challenge's solution and tests
+
+Usage:
+    python scripts/benchmark-load-strategies.py [--pack DIR] [--scales 1,10,100] [--repeat N]
+
+Examples:
+    python scripts/benchmark-load-strategies.py                 # Meta pack at 1x and 10x
+    python scripts/benchmark-load-strategies.py --scales 1,100  # Include a 100x copy
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+
+from harness.duck import LOAD_MODES, load_strategies, open_pack_db, parquet_files
+from harness.grader import drop_result, run_solution, run_test
+from harness.pack import PACKS_DIR, load_pack
+from harness.scale import scale_pack
+
+# ANSI color codes
+GREEN = '\033[92m'
+CYAN = '\033[96m'
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+
+def run_once(pack_dir, challenges, mode):
+    """Return (load_seconds, query_seconds) for one cold run of a load strategy."""
+    start = time.perf_counter()
+    strategies = load_strategies(pack_dir, mode, challenges)
+    conn, _ = open_pack_db(pack_dir, use_cache=False, strategies=strategies)
+    loaded = time.perf_counter()
+
+    for challenge in challenges:
+        solution_sql = challenge.get('solution_sql', '')
+        if not solution_sql:
+            continue
+        result, error = run_solution(conn, solution_sql)
+        if error:
+            continue
+        for test in challenge.get('tests', []):
+            run_test(conn, test, solution_sql, result)
+        drop_result(conn, result)
+    finished = time.perf_counter()
+
+    conn.close()
+    return loaded - start, finished - loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark harness dataset load strategies.")
+    parser.add_argument('--pack', type=Path, default=PACKS_DIR / "pack_meta_interview",
+                        help="Pack directory (default: public/packs/pack_meta_interview)")
+    parser.add_argument('--scales', default="1,10",
+                        help="Comma-separated row multipliers (default: 1,10)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Runs per strategy; the median is reported (default: 3)")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',')]
+    challenges = load_pack(args.pack)['challenges']
+
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Load strategy benchmark: {args.pack.name}{RESET}")
+    print(f"Challenges: {len(challenges)}, repeat: {args.repeat}")
+    print(f"{CYAN}{'='*60}{RESET}\n")
+    print(f"{BOLD}{'Scale':>6}  {'Strategy':<8}  {'Rows':>10}  {'Load ms':>9}  {'Query ms':>9}  {'Total ms':>9}{RESET}")
+
+    # Warm up outside the timed runs: the first 'auto' run would otherwise time
+    # starting the parser connection and parsing every challenge's SQL
+    # (sql_tables memoizes it), which the other strategies never pay
+    load_strategies(args.pack, 'auto', challenges)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            pack_dir = args.pack if scale == 1 else scale_pack(args.pack, scale, Path(tmp) / f"x{scale}")
+            rows = sum(
+                duckdb.execute(f"SELECT COUNT(*) FROM read_parquet('{f}')").fetchone()[0]
+                for f in parquet_files(pack_dir)
+            )
+
+            totals = {}
+            for mode in LOAD_MODES:
+                runs = [run_once(pack_dir, challenges, mode) for _ in range(args.repeat)]
+                load_ms = statistics.median(r[0] for r in runs) * 1000
+                query_ms = statistics.median(r[1] for r in runs) * 1000
+                totals[mode] = load_ms + query_ms
+                print(f"{scale:>5}x  {mode:<8}  {rows:>10,}  {load_ms:>9.1f}  {query_ms:>9.1f}  {load_ms + query_ms:>9.1f}")
+
+            fastest = min(totals, key=totals.get)
+            print(f"{GREEN}{'':>6}  fastest: {fastest}{RESET}")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
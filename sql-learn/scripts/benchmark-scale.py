@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Sweep every challenge of a pack across dataset scale factors.
+
+This script:
+1. Builds scaled copies of the pack (N times the rows over about sqrt(N) times
+   the users, events and pages; see harness/scale.py)
+2. Runs each challenge's solution and assertions at every scale factor
+3. Prints latency vs. rows read per challenge, against the browser's query budget
+4. Optionally writes the series as JSON chart data (--chart-json)
+
+The budget is timeoutMs from app/config.json (1500 ms): a challenge stays
+inside it while its slowest single query (solution or assertion) does.
+
+Usage:
+    python scripts/benchmark-scale.py [challenge_id] [--pack DIR] [--scales 1,10,100,1000]
+                                      [--runs N] [--warmup N] [--budget-ms MS] [--chart-json PATH]
+
+Examples:
+    python scripts/benchmark-scale.py                           # Meta pack at 1x..1000x
+    python scripts/benchmark-scale.py --scales 1,10,100         # Quicker sweep
+    python scripts/benchmark-scale.py --chart-json sweep.json   # Save chart data
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from harness.config import config
+from harness.pack import PACKS_DIR, load_pack, pack_label
+from harness.scale import SCALE_MODEL, sweep
+
+# ANSI color codes
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+CYAN = '\033[96m'
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+
+def print_series(challenge_id, series, budget_ms):
+    print(f"\n{BOLD}{challenge_id}{RESET}")
+    print(f"  {'Scale':>6}  {'Rows':>12}  {'Solution ms':>12}  {'Asserts ms':>12}  {'Slowest ms':>12}  Budget")
+    for p in series:
+        if 'error' in p:
+            label = f"{RED}✗ timed out{RESET}" if p['timeout'] else f"{RED}✗ {p['error']}{RESET}"
+            print(f"  {p['scale']:>5}x  {p['rows']:>12,}  {label}")
+            continue
+        share = p['slowest_query_ms'] / budget_ms
+        color = GREEN if share < 0.5 else YELLOW if p['within_budget'] else RED
+        print(f"  {p['scale']:>5}x  {p['rows']:>12,}  {p['solution_ms']:>12.2f}  {p['assertions_ms']:>12.2f}  "
+              f"{p['slowest_query_ms']:>12.2f}  {color}{share:.0%}{RESET}")
+
+
+def largest_scale_within_budget(series):
+    ok = [p['scale'] for p in series if p.get('within_budget')]
+    return max(ok) if ok else None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark challenges across dataset scale factors.")
+    parser.add_argument('challenge_id', nargs='?', help="Only sweep this challenge")
+    parser.add_argument('--pack', type=Path, default=PACKS_DIR / "pack_meta_interview",
+                        help="Pack directory (default: public/packs/pack_meta_interview)")
+    parser.add_argument('--scales', default="1,10,100,1000",
+                        help="Comma-separated scale factors (default: 1,10,100,1000)")
+    parser.add_argument('--runs', type=int, default=3, help="Timed runs per challenge and scale (default: 3)")
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed warm-up runs (default: 1)")
+    parser.add_argument('--budget-ms', type=float, default=config['limits']['timeoutMs'],
+                        help="Per-query latency budget (default: timeoutMs from app/config.json)")
+    parser.add_argument('--timeout-ms', type=int, default=None,
+                        help="Abort queries after this long, 0 to disable (default: 10x the budget)")
+    parser.add_argument('--chart-json', type=Path, metavar='PATH',
+                        help="Write the latency-vs-rows series per challenge as JSON")
+    args = parser.parse_args()
+    if args.timeout_ms is None:
+        args.timeout_ms = int(args.budget_ms * 10)
+    return args
+
+
+def main():
+    args = parse_args()
+    scales = sorted(int(s) for s in args.scales.split(','))
+    pack = load_pack(args.pack)
+    challenges = [
+        c for c in pack['challenges']
+        if c.get('solution_sql') and (not args.challenge_id or c['id'] == args.challenge_id)
+    ]
+    if not challenges:
+        print(f"{RED}No challenges to benchmark{RESET}")
+        sys.exit(1)
+
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Scale sweep: {pack['title']}{RESET}")
+    print(f"Path: {pack_label(args.pack)}")
+    print(f"Scales: {', '.join(f'{s}x' for s in scales)}, runs: {args.runs} (+{args.warmup} warm-up)")
+    print(f"Budget: {args.budget_ms:.0f} ms per query")
+    print(f"Scaling: {SCALE_MODEL}")
+    print(f"{CYAN}{'='*60}{RESET}")
+
+    print()
+    series = sweep(args.pack, challenges, scales, args.runs, args.warmup, args.timeout_ms, args.budget_ms,
+                   log=lambda message: print(f"{CYAN}{message}{RESET}"))
+
+    for challenge_id, points in series.items():
+        print_series(challenge_id, points, args.budget_ms)
+
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Largest scale within {args.budget_ms:.0f} ms{RESET}")
+    print(f"{CYAN}{'='*60}{RESET}")
+    over = 0
+    for challenge_id, points in series.items():
+        largest = largest_scale_within_budget(points)
+        if largest == scales[-1]:
+            print(f"  {GREEN}✓{RESET} {challenge_id}: {largest}x")
+        else:
+            over += 1
+            label = f"{largest}x" if largest else "none"
+            print(f"  {RED}✗{RESET} {challenge_id}: {label}")
+    print(f"\n{over} of {len(series)} challenge(s) exceed the budget at {scales[-1]}x\n")
+
+    if args.chart_json:
+        with open(args.chart_json, 'w') as f:
+            json.dump({
+                'pack': pack['id'],
+                'scale_model': SCALE_MODEL,
+                'budget_ms': args.budget_ms,
+                'scales': scales,
+                'challenges': series,
+            }, f, indent=2)
+        print(f"Chart data written to {args.chart_json}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark challenge solutions and assertions against a stored baseline.
+
+This script:
+1. Runs each challenge's solution_sql and tests N times after a warm-up
+2. Records median (p50) and p95 latency for the solution and the assertions
+3. Compares them with the pack's baseline in scripts/baselines/<pack path>.json
+   (keyed on the directory: app/ and public/ packs share ids)
+4. Fails when a challenge got slower than the baseline by more than the threshold
+
+Baselines are machine-dependent: refresh them with --update-baseline on the
+machine that runs the comparison, and again whenever the pack's data is
+regenerated (and commit the file).
+
+Usage:
+    python scripts/benchmark-solutions.py [challenge_id] [--pack DIR | --all] [--runs N] [--warmup N]
+                                          [--threshold FRACTION] [--min-delta-ms MS] [--update-baseline]
+
+Examples:
+    python scripts/benchmark-solutions.py                      # Compare meta pack with its baseline
+    python scripts/benchmark-solutions.py --update-baseline    # Record a new baseline
+    python scripts/benchmark-solutions.py --threshold 0.25     # Fail on >25% regressions
+"""
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+import duckdb
+
+from harness.bench import bench_challenge
+from harness.config import config
+from harness.duck import open_pack_db
+from harness.pack import PACKS_DIR, discover_packs, load_pack, pack_key, pack_label
+
+# ANSI color codes
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+CYAN = '\033[96m'
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+METRICS = ('solution', 'assertions')
+
+
+def baseline_path(pack_dir):
+    return BASELINES_DIR / f"{pack_key(pack_dir)}.json"
+
+
+def load_baseline(pack_dir):
+    path = baseline_path(pack_dir)
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(pack_dir, pack, measurements, args):
+    BASELINES_DIR.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        'pack': pack['id'],
+        'path': pack_label(pack_dir),
+        'duckdb_version': duckdb.__version__,
+        'machine': f"{platform.system()} {platform.machine()}",
+        'runs': args.runs,
+        'warmup': args.warmup,
+        'challenges': {
+            challenge_id: {
+                metric: {k: round(m[metric][k], 3) for k in ('p50_ms', 'p95_ms')}
+                for metric in METRICS
+            }
+            for challenge_id, m in measurements.items() if 'error' not in m
+        },
+    }
+    with open(baseline_path(pack_dir), 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def regressions(current, baseline, threshold, min_delta_ms):
+    """Metrics whose median is above baseline by more than ``threshold`` and ``min_delta_ms``."""
+    found = []
+    for metric in METRICS:
+        now = current[metric]['p50_ms']
+        before = baseline[metric]['p50_ms']
+        if now > before * (1 + threshold) and now - before > min_delta_ms:
+            found.append((metric, before, now))
+    return found
+
+
+def bench_pack(pack_dir, args):
+    """Benchmark a pack; returns the number of regressed challenges."""
+    pack = load_pack(pack_dir)
+    challenges = [
+        c for c in pack['challenges']
+        if not args.challenge_id or c['id'] == args.challenge_id
+    ]
+    if not challenges:
+        return 0
+
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Benchmarking Pack: {pack['title']}{RESET}")
+    print(f"Path: {pack_label(pack_dir)}")
+    print(f"Runs: {args.runs} (+{args.warmup} warm-up)")
+    print(f"{CYAN}{'='*60}{RESET}\n")
+
+    conn, _ = open_pack_db(pack_dir)
+    measurements = {}
+    for challenge in challenges:
+        measurements[challenge['id']] = bench_challenge(
+            conn, challenge, runs=args.runs, warmup=args.warmup, timeout_ms=args.timeout_ms
+        )
+    conn.close()
+
+    baseline = load_baseline(pack_dir)
+    base = (baseline or {}).get('challenges', {})
+    regressed = 0
+
+    print(f"{BOLD}{'Challenge':<34} {'Solution p50/p95 ms':>20} {'Asserts p50/p95 ms':>20}  Baseline{RESET}")
+    for challenge_id, m in measurements.items():
+        if 'error' in m:
+            print(f"{RED}{challenge_id:<34} Error: {m['error']}{RESET}")
+            continue
+
+        sol, asr = m['solution'], m['assertions']
+        timings = (f"{sol['p50_ms']:>9.2f} /{sol['p95_ms']:>9.2f} "
+                   f"{asr['p50_ms']:>9.2f} /{asr['p95_ms']:>9.2f}")
+
+        if args.update_baseline or challenge_id not in base:
+            status = f"{YELLOW}new{RESET}" if not args.update_baseline else f"{GREEN}recorded{RESET}"
+            print(f"{challenge_id:<34} {timings}  {status}")
+            continue
+
+        found = regressions(m, base[challenge_id], args.threshold, args.min_delta_ms)
+        if found:
+            regressed += 1
+            detail = ", ".join(f"{metric} {before:.2f} → {now:.2f} ms" for metric, before, now in found)
+            print(f"{RED}{challenge_id:<34} {timings}  ✗ {detail}{RESET}")
+        else:
+            print(f"{challenge_id:<34} {timings}  {GREEN}✓{RESET}")
+
+    if args.update_baseline:
+        if args.challenge_id and baseline:
+            # Only refresh the benchmarked challenge
+            measurements = {
+                **{cid: {metric: base[cid][metric] for metric in METRICS} for cid in base},
+                **measurements,
+            }
+        save_baseline(pack_dir, pack, measurements, args)
+        print(f"\n{GREEN}Baseline written to {baseline_path(pack_dir)}{RESET}")
+    elif baseline is None:
+        print(f"\n{YELLOW}No baseline at {baseline_path(pack_dir)} (run with --update-baseline){RESET}")
+
+    return regressed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark challenge solutions against a stored baseline.")
+    parser.add_argument('challenge_id', nargs='?', help="Only benchmark this challenge")
+    parser.add_argument('--pack', action='append', type=Path, dest='packs', metavar='DIR',
+                        help="Pack directory to benchmark (repeatable; default: pack_meta_interview)")
+    parser.add_argument('--all', action='store_true',
+                        help="Benchmark every pack under public/packs and app/packs")
+    parser.add_argument('--runs', type=int, default=10, help="Timed runs per challenge (default: 10)")
+    parser.add_argument('--warmup', type=int, default=2, help="Untimed warm-up runs (default: 2)")
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help="Allowed slowdown of the median as a fraction of the baseline (default: 0.5)")
+    parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                        help="Ignore slowdowns smaller than this many ms (default: 2.0)")
+    parser.add_argument('--timeout-ms', type=int, default=config['limits']['timeoutMs'],
+                        help="Per-query time budget, 0 to disable (default: timeoutMs from app/config.json)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Write the measurements as the new baseline instead of comparing")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    pack_dirs = discover_packs() if args.all else (args.packs or [PACKS_DIR / "pack_meta_interview"])
+
+    regressed = sum(bench_pack(pack_dir, args) for pack_dir in pack_dirs)
+
+    print()
+    if regressed:
+        print(f"{RED}✗ {regressed} challenge(s) regressed beyond {args.threshold:.0%} "
+              f"(and {args.min_delta_ms} ms){RESET}\n")
+    else:
+        print(f"{GREEN}✓ No regressions{RESET}\n")
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
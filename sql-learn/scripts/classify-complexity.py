@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Classify how each challenge's queries grow with dataset size.
+
+This script:
+1. Times every solution and SQL assertion at several scale factors
+   (or reads the chart data written by benchmark-scale.py --chart-json)
+2. Fits latency to c + a * rows^k per query (see harness/complexity.py)
+3. Reports the growth class (constant, linear, n^1.5, quadratic, cubic+)
+4. Flags super-linear queries, naming the query and its estimated exponent
+
+Exits 1 if any query is super-linear or timed out during the sweep.
+
+Usage:
+    python scripts/classify-complexity.py [challenge_id] [--pack DIR] [--scales 1,10,100,1000]
+                                          [--from-json PATH] [--report-json PATH]
+
+Examples:
+    python scripts/classify-complexity.py                            # Sweep and classify the meta pack
+    python scripts/classify-complexity.py q16_mutual_friends_count   # One challenge
+    python scripts/classify-complexity.py --from-json sweep.json     # Reuse a benchmark-scale.py run
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from harness.complexity import classify
+from harness.config import config
+from harness.pack import PACKS_DIR, load_pack, pack_label
+from harness.scale import SCALE_MODEL, sweep
+
+# ANSI color codes
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+CYAN = '\033[96m'
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+
+def query_series(points):
+    """Split a challenge's sweep points into ``{query: [(rows, ms)]}``.
+
+    The solution is keyed ``'solution'`` and assertions by test name.
+    Points where the solution failed are left out.
+    """
+    series = {'solution': []}
+    for p in points:
+        if 'error' in p:
+            continue
+        series['solution'].append((p['rows'], p['solution_ms']))
+        for name, ms in p['tests'].items():
+            series.setdefault(name, []).append((p['rows'], ms))
+    return series
+
+
+def classify_challenge(challenge, points):
+    """Classify the solution and every SQL assertion of a challenge.
+
+    Returns a list of ``{'challenge', 'query', 'sql', 'class', 'exponent',
+    'fixed_ms', 'largest_ms', 'super_linear', 'timed_out_at'}`` dicts.
+    """
+    sql = {'solution': challenge.get('solution_sql', '')}
+    sql.update({t.get('name', ''): t.get('sql', '') for t in challenge.get('tests', [])})
+    timed_out = next((p['scale'] for p in points if p.get('timeout')), None)
+
+    found = []
+    for query, samples in query_series(points).items():
+        # ROWCOUNT and SCHEMA_EQ assertions read stored metadata and run no SQL
+        if not sql.get(query):
+            continue
+        entry = {
+            'challenge': challenge['id'],
+            'query': query,
+            'sql': sql[query],
+            'largest_ms': samples[-1][1] if samples else None,
+            'timed_out_at': timed_out if query == 'solution' else None,
+        }
+        try:
+            fit = classify(samples)
+        except ValueError:
+            fit = {'class': 'unknown', 'exponent': None, 'fixed_ms': None, 'super_linear': False}
+        entry.update({k: fit[k] for k in ('class', 'exponent', 'fixed_ms', 'super_linear')})
+        if entry['timed_out_at']:
+            entry['super_linear'] = True
+        found.append(entry)
+    return found
+
+
+def first_line(sql, width=90):
+    line = " ".join(sql.split())
+    return line if len(line) <= width else line[:width - 1] + "…"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Classify the growth of challenge queries with dataset size.")
+    parser.add_argument('challenge_id', nargs='?', help="Only classify this challenge")
+    parser.add_argument('--pack', type=Path, default=PACKS_DIR / "pack_meta_interview",
+                        help="Pack directory (default: public/packs/pack_meta_interview)")
+    parser.add_argument('--scales', default="1,10,100,1000",
+                        help="Comma-separated scale factors, at least three (default: 1,10,100,1000)")
+    parser.add_argument('--runs', type=int, default=3, help="Timed runs per challenge and scale (default: 3)")
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed warm-up runs (default: 1)")
+    parser.add_argument('--timeout-ms', type=int, default=config['limits']['timeoutMs'] * 10,
+                        help="Abort queries after this long, 0 to disable (default: 10x timeoutMs)")
+    parser.add_argument('--from-json', type=Path, metavar='PATH',
+                        help="Classify the chart data of a benchmark-scale.py run instead of sweeping")
+    parser.add_argument('--report-json', type=Path, metavar='PATH',
+                        help="Write every classified query as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    pack = load_pack(args.pack)
+    challenges = [
+        c for c in pack['challenges']
+        if c.get('solution_sql') and (not args.challenge_id or c['id'] == args.challenge_id)
+    ]
+
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Complexity classes: {pack['title']}{RESET}")
+    print(f"Path: {pack_label(args.pack)}")
+
+    if args.from_json:
+        with open(args.from_json, 'r') as f:
+            chart = json.load(f)
+        series = chart['challenges']
+        challenges = [c for c in challenges if c['id'] in series]
+        scale_model = chart.get('scale_model', "N id-shifted copies (older benchmark-scale.py run)")
+    else:
+        scale_model = SCALE_MODEL
+    print(f"Scaling: {scale_model}")
+    print(f"{CYAN}{'='*60}{RESET}\n")
+
+    if not args.from_json:
+        scales = [int(s) for s in args.scales.split(',')]
+        series = sweep(args.pack, challenges, scales, args.runs, args.warmup, args.timeout_ms,
+                       log=lambda message: print(f"{CYAN}{message}{RESET}"))
+
+    queries = []
+    for challenge in challenges:
+        queries.extend(classify_challenge(challenge, series[challenge['id']]))
+
+    print(f"\n{BOLD}{'Challenge':<34} {'Query':<30} {'Class':<10} {'k':>5} {'Largest ms':>11}{RESET}")
+    for q in queries:
+        exponent = f"{q['exponent']:.2f}" if q['exponent'] is not None else "-"
+        largest = f"{q['largest_ms']:.2f}" if q['largest_ms'] is not None else "-"
+        color = RED if q['super_linear'] else GREEN if q['class'] in ('constant', 'linear') else YELLOW
+        print(f"{q['challenge']:<34} {q['query']:<30} {color}{q['class']:<10}{RESET} {exponent:>5} {largest:>11}")
+
+    flagged = [q for q in queries if q['super_linear']]
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Super-linear queries{RESET}")
+    print(f"{CYAN}{'='*60}{RESET}")
+    print(f"{YELLOW}Growth relative to the rows read when scaling as: {scale_model}{RESET}")
+    if not flagged:
+        print(f"{GREEN}✓ None{RESET}")
+    for q in sorted(flagged, key=lambda q: -(q['exponent'] or 0)):
+        growth = f"~rows^{q['exponent']:.2f} ({q['class']})" if q['exponent'] is not None else q['class']
+        if q['timed_out_at']:
+            growth += f", timed out at {q['timed_out_at']}x"
+        print(f"{RED}✗ {q['challenge']} / {q['query']}: {growth}{RESET}")
+        print(f"    {first_line(q['sql'])}")
+    print()
+
+    if args.report_json:
+        with open(args.report_json, 'w') as f:
+            json.dump({'pack': pack['id'], 'scale_model': scale_model, 'queries': queries}, f, indent=2)
+        print(f"Report written to {args.report_json}\n")
+
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,45 +10,322 @@ carefully designed edge cases to catch common SQL mistakes:
 3. Boundary cases (exactly 4-day streaks, exactly 1 post, etc.)
 4. Edge cases for each specific challenge
 
+Tables are built column by column: random values are drawn as whole NumPy
+arrays and written straight to Parquet through pyarrow, with no per-row
+Python objects. Every table has its own ``numpy.random.Generator`` seeded
+from SEED and the table name, so tables are independent of each other and
+are generated concurrently on --jobs processes (no generator reads another
+table's output); the output is the same for any --jobs. --only regenerates
+just the named tables, leaving the others untouched, and a file whose new
+content is identical to the existing one is not rewritten (its mtime, and
+so the test harness caches keyed on it, stay valid).
+
+--scale N adds N-1 background blocks for load testing. Block k repeats the
+core and edge users 1-25 (with their events, pages, advertisers, posts,
+calls, logins, ...) as ids k * 1000 + id; the decoys and boundary users
+(26-30, 40, 41, 50-53), pages 8-10 and the Q7 video calls stay in block 0
+only, so every planted edge case survives. Aggregate targets (CTR counts,
+weekly signups, monthly revenue, MAU) are multiplied by N. After writing,
+every challenge's solution is run over the output and its answer reported.
+
+Tables are streamed: each one is generated a chunk of blocks at a time and
+appended to its Parquet file in row groups of --row-group-size rows, so
+peak memory stays flat however large the scale.
+
 Usage:
-    python scripts/generate-meta-interview-data-v3.py
+    python scripts/generate-meta-interview-data-v3.py [--scale N] [--output-dir DIR] [--row-group-size ROWS]
+                                                      [--jobs N] [--only TABLE,...]
+
+Examples:
+    python scripts/generate-meta-interview-data-v3.py              # The shipped pack
+    python scripts/generate-meta-interview-data-v3.py --scale 100  # .cache/packs/pack_meta_interview-x100
+    python scripts/generate-meta-interview-data-v3.py --only logins,calls
 
 For detailed edge case documentation, see: docs/DATA_DESIGN.md
 """
 
-import pandas as pd
-import numpy as np
-from datetime import datetime, date, timedelta
-import random
+import argparse
+import contextlib
+import filecmp
+import io
+import json
 import os
+import shutil
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Set seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+import duckdb
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Seed for reproducibility
+SEED = 42
+
+ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = ROOT / "public" / "packs" / "pack_meta_interview"
+SCALED_DIR = ROOT / ".cache" / "packs"
+
+# --scale: background block k (1..N-1) copies users 1-25 as k * BLOCK_STRIDE + id
+BLOCK_STRIDE = 1000
+BACKGROUND_USERS = 25
+
+# Default rows per Parquet row group (DuckDB's own row group size, so each
+# row group is one scan task), and the rows per generated chunk. Chunking is
+# fixed so the data does not depend on --row-group-size.
+ROW_GROUP_SIZE = 122_880
+CHUNK_ROWS = 122_880
+
+# Column types of every table (dates are DATE, not TIMESTAMP, so date
+# subtraction in the solutions yields days)
+SCHEMAS = {
+    "users": pa.schema([
+        ("user_id", pa.int64()), ("username", pa.string()), ("email", pa.string()),
+        ("country", pa.string()), ("signup_date", pa.date32()), ("is_active", pa.bool_()),
+    ]),
+    "posts": pa.schema([
+        ("post_id", pa.int64()), ("user_id", pa.int64()), ("post_date", pa.date32()),
+        ("content", pa.string()), ("category", pa.string()), ("engagement_score", pa.int64()),
+    ]),
+    "actions": pa.schema([
+        ("action_id", pa.int64()), ("user_id", pa.int64()), ("app_id", pa.int64()),
+        ("action_type", pa.string()), ("action_date", pa.date32()),
+    ]),
+    "pages": pa.schema([
+        ("page_id", pa.int64()), ("page_name", pa.string()), ("category", pa.string()),
+        ("created_date", pa.date32()),
+    ]),
+    "page_likes": pa.schema([
+        ("like_id", pa.int64()), ("user_id", pa.int64()), ("page_id", pa.int64()),
+        ("liked_date", pa.date32()),
+    ]),
+    "events": pa.schema([
+        ("event_id", pa.int64()), ("event_name", pa.string()), ("is_private", pa.bool_()),
+        ("event_date", pa.date32()),
+    ]),
+    "event_attendance": pa.schema([
+        ("attendance_id", pa.int64()), ("user_id", pa.int64()), ("event_id", pa.int64()),
+        ("attendance_status", pa.string()),
+    ]),
+    "friendships": pa.schema([
+        ("friendship_id", pa.int64()), ("user1_id", pa.int64()), ("user2_id", pa.int64()),
+        ("friendship_date", pa.date32()),
+    ]),
+    "signups": pa.schema([
+        ("signup_id", pa.int64()), ("user_id", pa.int64()), ("signup_date", pa.date32()),
+        ("last_login_date", pa.date32()), ("signup_week", pa.int64()),
+    ]),
+    "calls": pa.schema([
+        ("call_id", pa.int64()), ("caller_id", pa.int64()), ("callee_id", pa.int64()),
+        ("call_type", pa.string()), ("call_date", pa.date32()), ("duration_seconds", pa.int64()),
+    ]),
+    "messenger_activity": pa.schema([
+        ("activity_id", pa.int64()), ("user_id", pa.int64()), ("activity_type", pa.string()),
+        ("activity_date", pa.date32()),
+    ]),
+    "comments": pa.schema([
+        ("comment_id", pa.int64()), ("user_id", pa.int64()), ("post_id", pa.int64()),
+        ("comment_text", pa.string()), ("comment_date", pa.date32()),
+    ]),
+    "logins": pa.schema([
+        ("user_id", pa.int64()), ("login_date", pa.date32()), ("device_type", pa.string()),
+    ]),
+    "advertisers": pa.schema([
+        ("user_id", pa.int64()), ("status", pa.string()),
+    ]),
+    "daily_pay": pa.schema([
+        ("user_id", pa.int64()), ("paid_date", pa.date32()), ("amount", pa.int64()),
+    ]),
+    "transactions": pa.schema([
+        ("transaction_id", pa.int64()), ("user_id", pa.int64()), ("amount", pa.int64()),
+        ("transaction_date", pa.date32()),
+    ]),
+    "user_records": pa.schema([
+        ("user_id", pa.int64()), ("name", pa.string()), ("email", pa.string()),
+        ("updated_at", pa.timestamp("us")),
+    ]),
+    "monthly_active": pa.schema([
+        ("year", pa.int64()), ("month", pa.int64()), ("mau", pa.int64()),
+    ]),
+}
+
+
+# ============================================================
+# COLUMN BUILDERS
+# ============================================================
+def table_rng(name):
+    """The table's own random stream, derived from SEED and the table name only."""
+    return np.random.default_rng([SEED, zlib.crc32(name.encode())])
+
+
+def ids(n, start=1):
+    """Sequential ids ``start .. start + n - 1``."""
+    return np.arange(start, start + n)
+
+
+def to_dates(year, month, day):
+    """Vectorized ``date(year, month, day)`` as ``datetime64[D]``."""
+    months = (np.asarray(year) - 1970) * 12 + np.asarray(month) - 1
+    return months.astype("datetime64[M]").astype("datetime64[D]") + (np.asarray(day) - 1)
+
+
+def random_dates(rng, n, year, months=(1, 11), days=(1, 28)):
+    """``n`` dates in ``year`` with month and day drawn uniformly from the inclusive ranges."""
+    month = rng.integers(months[0], months[1] + 1, n)
+    day = rng.integers(days[0], days[1] + 1, n)
+    return to_dates(year, month, day)
+
+
+def choice(rng, options, n):
+    """``n`` values drawn uniformly from ``options``."""
+    return pa.array(options).take(rng.integers(0, len(options), n))
+
 
-OUTPUT_DIR = Path(__file__).parent.parent / "public" / "packs" / "pack_meta_interview"
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+def repeat(values, counts):
+    """Each of ``values`` repeated ``counts`` times, in order."""
+    return pa.array(values).take(np.repeat(np.arange(len(values)), counts))
 
-print("=" * 70)
-print("Meta Interview Pack v3 - Comprehensive Data Generator")
-print("=" * 70)
+
+def sample_groups(rng, population, sizes):
+    """Draw ``sizes[g]`` distinct members of ``population`` for every group ``g``.
+
+    Vectorized ``random.sample``: returns ``(group, member)`` arrays with the
+    groups in order.
+    """
+    population = np.asarray(population)
+    sizes = np.asarray(sizes)
+    order = rng.random((len(sizes), len(population))).argsort(axis=1)
+    keep = np.arange(len(population)) < sizes[:, None]
+    return np.repeat(np.arange(len(sizes)), sizes), population[order[keep]]
+
+
+def concat(*parts):
+    """Element-wise string concatenation of string scalars and arrays."""
+    strings = [part if isinstance(part, str) else pc.cast(pa.array(part), pa.string()) for part in parts]
+    return pc.binary_join_element_wise(*strings, "")
+
+
+def rows(n, **columns):
+    """A section of ``n`` rows; scalar values are repeated down the column."""
+    section = {}
+    for name, value in columns.items():
+        if isinstance(value, str):
+            value = pa.repeat(value, n)
+        elif np.isscalar(value):
+            value = np.full(n, value)
+        section[name] = value if isinstance(value, (pa.Array, pa.ChunkedArray)) else pa.array(value)
+    return section
+
+
+def stack(*sections):
+    """Concatenate sections column by column."""
+    return {
+        name: pa.concat_arrays([
+            chunk for section in sections
+            for chunk in (section[name].chunks if isinstance(section[name], pa.ChunkedArray) else [section[name]])
+        ])
+        for name in sections[0]
+    }
+
+
+def background(n, blocks, copied=None):
+    """Row index and id offset of ``n`` planted rows repeated for every block in ``blocks``.
+
+    Block 0 is every planted row with offset 0; background block k repeats
+    the rows where ``copied`` is true (default: all) with offset
+    ``k * BLOCK_STRIDE``. Index the planted columns with the first array and
+    add the second to their id columns.
+    """
+    copied_rows = np.arange(n) if copied is None else np.flatnonzero(copied)
+    background_blocks = np.arange(max(blocks.start, 1), blocks.stop)
+    planted_rows = np.arange(n) if 0 in blocks else np.arange(0)
+    index = np.concatenate([planted_rows, np.tile(copied_rows, len(background_blocks))])
+    offset = np.concatenate([
+        np.zeros(len(planted_rows), dtype=np.int64),
+        np.repeat(BLOCK_STRIDE * background_blocks, len(copied_rows)),
+    ])
+    return index, offset
+
+
+def group_blocks(groups, per_block, blocks):
+    """Id offset of each member of ``sample_groups`` run with ``per_block`` groups for every block."""
+    return BLOCK_STRIDE * (blocks.start + groups // per_block)
+
+
+def num_rows(columns):
+    """Row count of a table given as columns."""
+    return len(next(iter(columns.values())))
+
+
+def table_chunks(generate, rng, scale, chunk_rows, chunked=True):
+    """Yield ``generate``'s columns for block 0, then for the background blocks about ``chunk_rows`` rows at a time.
+
+    ``generate(rng, blocks, first_id)`` builds the rows of a range of blocks,
+    numbering sequential ids from ``first_id``. Unchunked tables are
+    generated for all blocks at once.
+    """
+    if not chunked:
+        yield generate(rng, range(scale), 1)
+        return
+    planted = generate(rng, range(1), 1)
+    yield planted
+    first_id = num_rows(planted) + 1
+    per_chunk = max(1, chunk_rows // max(num_rows(planted), 1))
+    for start in range(1, scale, per_chunk):
+        columns = generate(rng, range(start, min(start + per_chunk, scale)), first_id)
+        first_id += num_rows(columns)
+        yield columns
+
+
+def write_table(output_dir, name, chunks, row_group_size=ROW_GROUP_SIZE):
+    """Stream ``chunks`` (dicts of columns) into ``<name>.parquet`` with the table's schema.
+
+    Chunks are buffered into row groups of exactly ``row_group_size`` rows
+    (the last one may be shorter), so at most about two row groups are held
+    in memory. The table is written to a temporary file that replaces the
+    existing one only if their bytes differ. Returns ``(row count, changed)``.
+    """
+    schema = SCHEMAS[name]
+    path = output_dir / f"{name}.parquet"
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    pending, pending_rows, count = [], 0, 0
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for columns in chunks:
+            table = pa.table(columns, schema=schema)
+            pending.append(table)
+            pending_rows += table.num_rows
+            count += table.num_rows
+            if pending_rows >= row_group_size:
+                buffered = pa.concat_tables(pending)
+                full = pending_rows - pending_rows % row_group_size
+                writer.write_table(buffered.slice(0, full), row_group_size=row_group_size)
+                pending, pending_rows = [buffered.slice(full).combine_chunks()], pending_rows - full
+        if pending_rows or not count:
+            writer.write_table(pa.concat_tables(pending) if pending else schema.empty_table(),
+                               row_group_size=row_group_size)
+    if path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+        tmp_path.unlink()
+        return count, False
+    os.replace(tmp_path, path)
+    return count, True
 
 
 # ============================================================
 # 1. USERS TABLE (30 users - expanded from 20)
 # ============================================================
-def generate_users():
+def generate_users(rng, blocks, first_id):
     """
     Base users table with 30 users:
     - Users 1-20: Core users with full activity
     - Users 21-25: Edge case users (minimal activity)
     - Users 26-30: Decoy users (should be excluded by most queries)
+    - Background blocks: copies of users 1-25 (username suffixed _<block>)
     """
-    print("\n[1/18] Generating users.parquet...")
-
-    users_data = {
-        "user_id": list(range(1, 31)),
+    planted = {
+        "user_id": ids(30),
         "username": [
             # Core users 1-20
             "alice_smith", "bob_jones", "carol_white", "david_brown", "emma_davis",
@@ -60,13 +337,12 @@ def generate_users():
             # Decoy users 26-30
             "zack_decoy1", "amy_decoy2", "brian_decoy3", "chloe_decoy4", "dan_decoy5"
         ],
-        "email": [f"user{i}@example.com" for i in range(1, 31)],
         "country": [
             "US", "US", "BR", "US", "UK", "US", "BR", "US", "UK", "US",
             "BR", "US", "UK", "US", "BR", "US", "UK", "BR", "US", "UK",
             "US", "BR", "UK", "US", "BR", "US", "UK", "BR", "US", "UK"
         ],
-        "signup_date": [
+        "signup_date": np.array([
             # Core users
             "2023-01-15", "2023-02-20", "2023-03-10", "2023-04-05", "2023-05-12",
             "2023-06-18", "2023-07-22", "2023-08-30", "2023-09-14", "2023-10-25",
@@ -76,21 +352,31 @@ def generate_users():
             "2024-07-01", "2024-07-15", "2024-08-01", "2024-08-15", "2024-09-01",
             # Decoy users
             "2024-05-01", "2024-05-15", "2024-06-01", "2024-06-15", "2024-07-01"
-        ],
+        ], dtype="datetime64[D]"),
         "is_active": [True] * 28 + [False, True]
     }
 
-    df = pd.DataFrame(users_data)
-    df['signup_date'] = pd.to_datetime(df['signup_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "users.parquet", index=False)
-    print(f"   Created {len(df)} users (20 core + 5 edge + 5 decoy)")
-    return df
+    index, offset = background(30, blocks, planted["user_id"] <= BACKGROUND_USERS)
+    block = offset // BLOCK_STRIDE
+    user_id = planted["user_id"][index] + offset
+    users = {
+        "user_id": user_id,
+        "username": concat(pa.array(planted["username"]).take(index), pc.if_else(block > 0, concat("_", block), "")),
+        "email": concat("user", user_id, "@example.com"),
+        "country": pa.array(planted["country"]).take(index),
+        "signup_date": planted["signup_date"][index],
+        "is_active": pa.array(planted["is_active"]).take(index),
+    }
+
+    if 0 in blocks:
+        print(f"   - 20 core + 5 edge + 5 decoy users")
+    return users
 
 
 # ============================================================
 # 2. POSTS TABLE (Q1: Average Post Hiatus, Q14: Second Highest Engagement)
 # ============================================================
-def generate_posts():
+def generate_posts(rng, blocks, first_id):
     """
     Q1: Average Post Hiatus
     - 7 users with 2+ posts in 2024 (correct answer)
@@ -106,11 +392,6 @@ def generate_posts():
     - Category with tied second-highest scores
     - Category with only 1 post (should be excluded)
     """
-    print("\n[2/18] Generating posts.parquet...")
-
-    posts_data = []
-    post_id = 1
-
     # ===== Q1 DATA: Post Hiatus =====
 
     # Users with 2+ posts in 2024 (will be in results) - 7 users
@@ -149,56 +430,30 @@ def generate_posts():
 
     categories = ["tech", "lifestyle", "news", "sports", "entertainment"]
 
-    # Generate Q1 posts
-    for user_id, dates in multi_posters_2024.items():
-        for post_date in dates:
-            posts_data.append({
-                "post_id": post_id,
-                "user_id": user_id,
-                "post_date": post_date,
-                "content": f"Post {post_id} content",
-                "category": random.choice(categories[:3]),  # Only first 3 categories for Q1 posts
-                "engagement_score": random.randint(100, 500)
-            })
-            post_id += 1
-
-    for user_id, dates in single_posters_2024.items():
-        for post_date in dates:
-            posts_data.append({
-                "post_id": post_id,
-                "user_id": user_id,
-                "post_date": post_date,
-                "content": f"Post {post_id} content",
-                "category": random.choice(categories[:3]),
-                "engagement_score": random.randint(100, 500)
-            })
-            post_id += 1
-
-    for user_id, dates in posts_2023.items():
-        for post_date in dates:
-            posts_data.append({
-                "post_id": post_id,
-                "user_id": user_id,
-                "post_date": post_date,
-                "content": f"Post {post_id} content",
-                "category": random.choice(categories[:3]),
-                "engagement_score": random.randint(100, 500)
-            })
-            post_id += 1
-
-    for user_id, dates in posts_2025.items():
-        for post_date in dates:
-            posts_data.append({
-                "post_id": post_id,
-                "user_id": user_id,
-                "post_date": post_date,
-                "content": f"Post {post_id} content",
-                "category": random.choice(categories[:3]),
-                "engagement_score": random.randint(100, 500)
-            })
-            post_id += 1
+    # Q1 posts, in the order above, then their background copies
+    planted = [
+        (user_id, post_date)
+        for group in (multi_posters_2024, single_posters_2024, posts_2023, posts_2025)
+        for user_id, dates in group.items()
+        for post_date in dates
+    ]
+    index, offset = background(len(planted), blocks)
+    n = len(index)
+    q1_posts = rows(
+        n,
+        user_id=np.array([user_id for user_id, _ in planted])[index] + offset,
+        post_date=np.array([post_date for _, post_date in planted], dtype="datetime64[D]")[index],
+        content=concat("Post ", ids(n, start=first_id), " content"),
+        category=choice(rng, categories[:3], n),  # Only first 3 categories for Q1 posts
+        engagement_score=rng.integers(100, 501, n),
+    )
 
     # ===== Q14 DATA: Second Highest Engagement per Category =====
+    # (block 0 only: background posts are Q1-style, 100-500 in the first
+    # 3 categories, below every planted second place)
+    if 0 not in blocks:
+        q1_posts["post_id"] = ids(n, start=first_id)
+        return q1_posts
 
     # Category engagement scores (designed for clear 2nd place)
     category_scores = {
@@ -210,34 +465,31 @@ def generate_posts():
         "single": [999],                         # EDGE CASE: Only 1 post - should be excluded
     }
 
-    for category, scores in category_scores.items():
-        for score in scores:
-            posts_data.append({
-                "post_id": post_id,
-                "user_id": random.randint(1, 20),
-                "post_date": f"2024-{random.randint(1, 11):02d}-{random.randint(1, 28):02d}",
-                "content": f"Q14 post in {category}",
-                "category": category,
-                "engagement_score": score
-            })
-            post_id += 1
-
-    df = pd.DataFrame(posts_data)
-    df['post_date'] = pd.to_datetime(df['post_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "posts.parquet", index=False)
-
-    print(f"   Created {len(df)} posts")
+    q14_categories = repeat(list(category_scores), [len(scores) for scores in category_scores.values()])
+    m = len(q14_categories)
+    q14_posts = rows(
+        m,
+        user_id=rng.integers(1, 21, m),
+        post_date=random_dates(rng, m, 2024),
+        content=concat("Q14 post in ", q14_categories),
+        category=q14_categories,
+        engagement_score=np.concatenate([scores for scores in category_scores.values()]),
+    )
+
+    posts = stack(q1_posts, q14_posts)
+    posts["post_id"] = ids(n + m, start=first_id)
+
     print(f"   - Q1: 7 users with 2+ posts in 2024 (expected answer)")
     print(f"   - Edge: 5 posts from 2023, 3 posts from 2025")
     print(f"   - Edge: 1 user with exactly 1 post in 2024")
     print(f"   - Q14: 6 categories including 'single' with only 1 post")
-    return df
+    return posts
 
 
 # ============================================================
 # 3. ACTIONS TABLE (Q2, Q3, Q10, Q19)
 # ============================================================
-def generate_actions():
+def generate_actions(rng, blocks, first_id):
     """
     Multi-purpose table for:
     - Q2: MAU Retention (users in both June AND July 2024)
@@ -253,10 +505,7 @@ def generate_actions():
     - Actions from 2023 (should be excluded from 2024 CTR)
     - Actions from Oct 31 and Dec 1 (boundary testing for Nov rolling window)
     """
-    print("\n[3/18] Generating actions.parquet...")
-
-    actions_data = []
-    action_id = 1
+    sections = []
 
     # ===== Q2: MAU Retention =====
     # Users active in BOTH June AND July 2024: 1, 2, 3, 4, 5, 6 (answer = 6 users)
@@ -271,33 +520,24 @@ def generate_actions():
     # User active in both months but only 1 day each (still counts)
     both_months_users.append(30)
 
-    # Generate June 2024 actions
-    for user_id in june_only_users + both_months_users:
-        num_actions = 3 if user_id == 30 else random.randint(2, 4)
-        for _ in range(num_actions):
-            day = random.randint(1, 30)
-            actions_data.append({
-                "action_id": action_id,
-                "user_id": user_id,
-                "app_id": random.randint(1, 4),
-                "action_type": random.choice(["login", "post", "like", "comment"]),
-                "action_date": f"2024-06-{day:02d}"
-            })
-            action_id += 1
-
-    # Generate July 2024 actions
-    for user_id in july_only_users + both_months_users:
-        num_actions = 3 if user_id == 30 else random.randint(2, 4)
-        for _ in range(num_actions):
-            day = random.randint(1, 31)
-            actions_data.append({
-                "action_id": action_id,
-                "user_id": user_id,
-                "app_id": random.randint(1, 4),
-                "action_type": random.choice(["login", "post", "like", "comment"]),
-                "action_date": f"2024-07-{day:02d}"
-            })
-            action_id += 1
+    # June and July 2024 actions: 2-4 per user (user 30 always 3); background
+    # blocks copy users 1-6, never the decoys
+    for month, days_in_month, month_users in (
+        (6, 30, june_only_users + both_months_users),
+        (7, 31, july_only_users + both_months_users),
+    ):
+        month_users = np.array(month_users)
+        index, offset = background(len(month_users), blocks, month_users <= BACKGROUND_USERS)
+        month_users = month_users[index] + offset
+        counts = np.where(month_users == 30, 3, rng.integers(2, 5, len(month_users)))
+        n = counts.sum()
+        sections.append(rows(
+            n,
+            user_id=np.repeat(month_users, counts),
+            app_id=rng.integers(1, 5, n),
+            action_type=choice(rng, ["login", "post", "like", "comment"], n),
+            action_date=to_dates(2024, month, rng.integers(1, days_in_month + 1, n)),
+        ))
 
     # ===== Q3: CTR calculation =====
     # App 1: 40 impressions, 10 clicks = 25% CTR
@@ -316,102 +556,89 @@ def generate_actions():
         6: {"impressions": 0, "clicks": 5},     # excluded - EDGE CASE
     }
 
-    for app_id, counts in ctr_design.items():
-        # Add impressions
-        for _ in range(counts["impressions"]):
-            actions_data.append({
-                "action_id": action_id,
-                "user_id": random.randint(1, 20),
-                "app_id": app_id,
-                "action_type": "impression",
-                "action_date": f"2024-{random.randint(1, 11):02d}-{random.randint(1, 28):02d}"
-            })
-            action_id += 1
-
-        # Add clicks
-        for _ in range(counts["clicks"]):
-            actions_data.append({
-                "action_id": action_id,
-                "user_id": random.randint(1, 20),
-                "app_id": app_id,
-                "action_type": "click",
-                "action_date": f"2024-{random.randint(1, 11):02d}-{random.randint(1, 28):02d}"
-            })
-            action_id += 1
+    # Impressions then clicks, app by app; every background block repeats
+    # the design, so each app's CTR is unchanged
+    segments = [
+        (app_id, action_type, counts[f"{action_type}s"])
+        for app_id, counts in ctr_design.items()
+        for action_type in ("impression", "click")
+    ]
+    counts = [count for _, _, count in segments]
+    index, offset = background(sum(counts), blocks)
+    n = len(index)
+    sections.append(rows(
+        n,
+        user_id=rng.integers(1, 21, n) + offset,
+        app_id=np.repeat([app_id for app_id, _, _ in segments], counts)[index],
+        action_type=repeat([action_type for _, action_type, _ in segments], counts).take(index),
+        action_date=random_dates(rng, n, 2024),
+    ))
 
     # EDGE CASE: Actions from 2023 (should NOT count for 2024 CTR)
-    for _ in range(20):
-        actions_data.append({
-            "action_id": action_id,
-            "user_id": random.randint(1, 20),
-            "app_id": random.randint(1, 4),
-            "action_type": random.choice(["impression", "click"]),
-            "action_date": f"2023-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
-        })
-        action_id += 1
+    _, offset = background(20, blocks)
+    n = len(offset)
+    sections.append(rows(
+        n,
+        user_id=rng.integers(1, 21, n) + offset,
+        app_id=rng.integers(1, 5, n),
+        action_type=choice(rng, ["impression", "click"], n),
+        action_date=random_dates(rng, n, 2023, months=(1, 12)),
+    ))
 
     # ===== Q10: Rolling 7-Day Active Users (November 2024) =====
     # EDGE CASE: Actions from Oct 31 (should NOT appear in Nov 1's 7-day window if using >= Nov 1)
-    for user_id in range(1, 6):
-        actions_data.append({
-            "action_id": action_id,
-            "user_id": user_id,
-            "app_id": random.randint(1, 4),
-            "action_type": "login",
-            "action_date": "2024-10-31"
-        })
-        action_id += 1
-
-    # November data (30 days)
-    for day in range(1, 31):
-        # Vary the number of active users per day (between 5-15)
-        num_active = random.randint(5, 15)
-        active_users = random.sample(range(1, 21), num_active)
-        for user_id in active_users:
-            actions_data.append({
-                "action_id": action_id,
-                "user_id": user_id,
-                "app_id": random.randint(1, 4),
-                "action_type": random.choice(["login", "post", "like"]),
-                "action_date": f"2024-11-{day:02d}"
-            })
-            action_id += 1
+    index, offset = background(5, blocks)
+    boundary_users = ids(5)[index] + offset
+    sections.append(rows(
+        len(boundary_users),
+        user_id=boundary_users,
+        app_id=rng.integers(1, 5, len(boundary_users)),
+        action_type="login",
+        action_date=np.datetime64("2024-10-31"),
+    ))
+
+    # November data (30 days), 5-15 distinct active users per day and block
+    groups, active_users = sample_groups(rng, ids(20), rng.integers(5, 16, 30 * len(blocks)))
+    n = len(active_users)
+    sections.append(rows(
+        n,
+        user_id=active_users + group_blocks(groups, 30, blocks),
+        app_id=rng.integers(1, 5, n),
+        action_type=choice(rng, ["login", "post", "like"], n),
+        action_date=to_dates(2024, 11, groups % 30 + 1),
+    ))
 
     # EDGE CASE: Actions from Dec 1 (should NOT appear in Nov 30's forward window)
-    for user_id in range(1, 6):
-        actions_data.append({
-            "action_id": action_id,
-            "user_id": user_id,
-            "app_id": random.randint(1, 4),
-            "action_type": "login",
-            "action_date": "2024-12-01"
-        })
-        action_id += 1
-
-    df = pd.DataFrame(actions_data)
-    df['action_date'] = pd.to_datetime(df['action_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "actions.parquet", index=False)
-
-    print(f"   Created {len(df)} actions")
-    print(f"   - Q2: 6 users in both June & July (+ 2 June-only, 2 July-only decoys)")
-    print(f"   - Q3: 5 apps with valid CTR + 1 app with no impressions")
-    print(f"   - Q10: 30 days November + Oct 31 & Dec 1 boundary data")
-    return df
+    sections.append(rows(
+        len(boundary_users),
+        user_id=boundary_users,
+        app_id=rng.integers(1, 5, len(boundary_users)),
+        action_type="login",
+        action_date=np.datetime64("2024-12-01"),
+    ))
+
+    actions = stack(*sections)
+    actions["action_id"] = ids(len(actions["user_id"]), start=first_id)
+
+    if 0 in blocks:
+        print(f"   - Q2: 6 users in both June & July (+ 2 June-only, 2 July-only decoys)")
+        print(f"   - Q3: 5 apps with valid CTR + 1 app with no impressions")
+        print(f"   - Q10: 30 days November + Oct 31 & Dec 1 boundary data")
+    return actions
 
 
 # ============================================================
 # 4. PAGES TABLE (Q4: Pages With No Likes)
 # ============================================================
-def generate_pages():
+def generate_pages(rng, blocks, first_id):
     """
     Q4: Pages With No Likes
     - 10 pages total
     - Pages 8, 9, 10 have NO likes (answer = 3 pages)
+    - Background blocks copy the liked pages 1-7 only
     """
-    print("\n[4/18] Generating pages.parquet...")
-
-    pages_data = {
-        "page_id": list(range(1, 11)),
+    planted = {
+        "page_id": ids(10),
         "page_name": [
             "Meta Developers", "React Community", "PyTorch Hub", "Instagram Creators",
             "WhatsApp Business", "Oculus Gaming", "Facebook AI", "Spark AR Studio",
@@ -422,20 +649,26 @@ def generate_pages():
             "Business", "Gaming", "Technology", "Creative",
             "Business", "Technology"
         ],
-        "created_date": [f"2023-{i:02d}-01" for i in range(1, 11)]
+        "created_date": to_dates(2023, ids(10), 1)
+    }
+
+    index, offset = background(10, blocks, planted["page_id"] <= 7)
+    pages = {
+        "page_id": planted["page_id"][index] + offset,
+        "page_name": pa.array(planted["page_name"]).take(index),
+        "category": pa.array(planted["category"]).take(index),
+        "created_date": planted["created_date"][index],
     }
 
-    df = pd.DataFrame(pages_data)
-    df['created_date'] = pd.to_datetime(df['created_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "pages.parquet", index=False)
-    print(f"   Created {len(df)} pages (pages 8, 9, 10 will have NO likes)")
-    return df
+    if 0 in blocks:
+        print(f"   - Pages 8, 9, 10 will have NO likes")
+    return pages
 
 
 # ============================================================
 # 5. PAGE_LIKES TABLE (Q4, Q13)
 # ============================================================
-def generate_page_likes():
+def generate_page_likes(rng, blocks, first_id):
     """
     Q4: Pages With No Likes - pages 8, 9, 10 have NO likes
     Q13: Page Recommendations - friends' likes for recommendations
@@ -444,47 +677,38 @@ def generate_page_likes():
     - Page 11 could have a NULL user_id like (testing NULL handling)
       But we keep it simple: pages 8-10 simply have no records
     """
-    print("\n[5/18] Generating page_likes.parquet...")
-
-    page_likes_data = []
-    like_id = 1
-
-    # Only pages 1-7 have likes (pages 8-10 have NONE)
-    for page_id in range(1, 8):
-        num_likes = random.randint(3, 8)
-        likers = random.sample(range(1, 21), num_likes)
-        for user_id in likers:
-            page_likes_data.append({
-                "like_id": like_id,
-                "user_id": user_id,
-                "page_id": page_id,
-                "liked_date": f"2024-{random.randint(1, 11):02d}-{random.randint(1, 28):02d}"
-            })
-            like_id += 1
-
-    df = pd.DataFrame(page_likes_data)
-    df['liked_date'] = pd.to_datetime(df['liked_date']).dt.date
-    df = df.drop_duplicates(subset=["user_id", "page_id"])
-    df.to_parquet(OUTPUT_DIR / "page_likes.parquet", index=False)
+    # Only pages 1-7 have likes (pages 8-10 have NONE); each liker is drawn
+    # without replacement, so (user_id, page_id) is unique. Background
+    # blocks like their own copies of pages 1-7.
+    groups, likers = sample_groups(rng, ids(20), rng.integers(3, 9, 7 * len(blocks)))
+    n = len(likers)
+    offset = group_blocks(groups, 7, blocks)
+    page_likes = {
+        "like_id": ids(n, start=first_id),
+        "user_id": likers + offset,
+        "page_id": groups % 7 + 1 + offset,
+        "liked_date": random_dates(rng, n, 2024),
+    }
 
-    print(f"   Created {len(df)} page likes (NONE for pages 8, 9, 10)")
-    return df
+    if 0 in blocks:
+        print(f"   - NONE for pages 8, 9, 10")
+    return page_likes
 
 
 # ============================================================
 # 6. EVENTS TABLE (Q5: Friend Recommendations)
 # ============================================================
-def generate_events():
+def generate_events(rng, blocks, first_id):
     """
     Q5: Friend Recommendations based on shared private events
     - Private events for shared attendance
     - Public events (should NOT count)
     """
-    print("\n[6/18] Generating events.parquet...")
-
-    events_data = {
-        "event_id": list(range(1, 21)),
-        "event_name": [
+    index, offset = background(20, blocks)
+    event_ids = ids(20)[index]
+    events = {
+        "event_id": event_ids + offset,
+        "event_name": pa.array([
             # Private events (1-12)
             "Tech Meetup", "Book Club", "Hiking Trip", "Coding Workshop",
             "Wine Tasting", "Game Night", "Cooking Class", "Photography Walk",
@@ -492,30 +716,21 @@ def generate_events():
             # Public events (13-20)
             "Movie Night", "Yoga Class", "Art Exhibition", "Music Festival",
             "Dance Party", "Food Fair", "Sports Day", "Community Picnic"
-        ],
-        "is_private": [
-            # 1-12 are private
-            True, True, True, True, True, True, True, True, True, True, True, True,
-            # 13-20 are public
-            False, False, False, False, False, False, False, False
-        ],
-        "event_date": [
-            f"2024-{(i % 12) + 1:02d}-{((i * 3) % 28) + 1:02d}"
-            for i in range(1, 21)
-        ]
+        ]).take(index),
+        # 1-12 are private, 13-20 are public
+        "is_private": event_ids <= 12,
+        "event_date": to_dates(2024, event_ids % 12 + 1, event_ids * 3 % 28 + 1),
     }
 
-    df = pd.DataFrame(events_data)
-    df['event_date'] = pd.to_datetime(df['event_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "events.parquet", index=False)
-    print(f"   Created {len(df)} events (12 private, 8 public)")
-    return df
+    if 0 in blocks:
+        print(f"   - 12 private, 8 public")
+    return events
 
 
 # ============================================================
 # 7. EVENT_ATTENDANCE TABLE (Q5: Friend Recommendations)
 # ============================================================
-def generate_event_attendance():
+def generate_event_attendance(rng, blocks, first_id):
     """
     Q5: Friend Recommendations
     Design pairs that share 2+ PRIVATE events and are NOT friends.
@@ -525,8 +740,6 @@ def generate_event_attendance():
     - Pair sharing 2 PUBLIC events (should be excluded - only private counts)
     - Pair sharing only 1 private event (should be excluded - need 2+)
     """
-    print("\n[7/18] Generating event_attendance.parquet...")
-
     # Design attendance to create specific recommendation pairs
     # Private events: 1-12, Public events: 13-20
 
@@ -574,34 +787,29 @@ def generate_event_attendance():
         20: [5, 15, 16],           # 1 private (5) - only 1 shared
     }
 
-    attendance_data = []
-    attendance_id = 1
-
-    for user_id, events in attendance_mapping.items():
-        for event_id in events:
-            attendance_data.append({
-                "attendance_id": attendance_id,
-                "user_id": user_id,
-                "event_id": event_id,
-                "attendance_status": random.choice(["going", "interested", "maybe"])
-            })
-            attendance_id += 1
-
-    df = pd.DataFrame(attendance_data)
-    df.to_parquet(OUTPUT_DIR / "event_attendance.parquet", index=False)
+    # Background blocks repeat the design with their own users and events
+    attendees = np.repeat(list(attendance_mapping), [len(events) for events in attendance_mapping.values()])
+    index, offset = background(len(attendees), blocks)
+    n = len(index)
+    attendance = {
+        "attendance_id": ids(n, start=first_id),
+        "user_id": attendees[index] + offset,
+        "event_id": np.concatenate(list(attendance_mapping.values()))[index] + offset,
+        "attendance_status": choice(rng, ["going", "interested", "maybe"], n),
+    }
 
-    print(f"   Created {len(df)} attendance records")
-    print(f"   - 6 valid recommendation pairs (share 2+ private, not friends)")
-    print(f"   - Edge: pair (15,16) shares 3 private but ARE friends")
-    print(f"   - Edge: pair (17,18) shares 2 PUBLIC only")
-    print(f"   - Edge: pair (19,20) shares only 1 private")
-    return df
+    if 0 in blocks:
+        print(f"   - 6 valid recommendation pairs (share 2+ private, not friends)")
+        print(f"   - Edge: pair (15,16) shares 3 private but ARE friends")
+        print(f"   - Edge: pair (17,18) shares 2 PUBLIC only")
+        print(f"   - Edge: pair (19,20) shares only 1 private")
+    return attendance
 
 
 # ============================================================
 # 8. FRIENDSHIPS TABLE (Q5, Q13, Q16)
 # ============================================================
-def generate_friendships():
+def generate_friendships(rng, blocks, first_id):
     """
     Friendship graph for:
     - Q5: Friend recommendations (exclude existing friends)
@@ -612,9 +820,7 @@ def generate_friendships():
     - Users 15-16 ARE friends (should be excluded from Q5 despite shared events)
     - Pairs with exactly 2 mutual friends (boundary for Q16's 3+ requirement)
     """
-    print("\n[8/18] Generating friendships.parquet...")
-
-    friendships_raw = [
+    friendships_raw = np.array([
         # Core friendship network
         (1, 2), (1, 4), (2, 3), (2, 6), (3, 4), (3, 8),
         (4, 6), (4, 10), (5, 6), (5, 9), (6, 7), (6, 10),
@@ -634,37 +840,34 @@ def generate_friendships():
         # Sparse connections for users 21-30
         (21, 1), (22, 2), (23, 3), (24, 4), (25, 5),
         (26, 6), (27, 7), (28, 8), (29, 9), (30, 10),
-    ]
-
-    friendships_data = []
-    friendship_id = 1
-
-    seen = set()
-    for a, b in friendships_raw:
-        pair = (min(a, b), max(a, b))
-        if pair not in seen:
-            seen.add(pair)
-            friendships_data.append({
-                "friendship_id": friendship_id,
-                "user1_id": pair[0],
-                "user2_id": pair[1],
-                "friendship_date": f"2023-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
-            })
-            friendship_id += 1
-
-    df = pd.DataFrame(friendships_data)
-    df['friendship_date'] = pd.to_datetime(df['friendship_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "friendships.parquet", index=False)
+    ])
+
+    # Store each pair once as (smaller id, larger id), keeping first appearances in order
+    pairs = np.sort(friendships_raw, axis=1)
+    _, first = np.unique(pairs, axis=0, return_index=True)
+    pairs = pairs[np.sort(first)]
+
+    # Background blocks copy the pairs among users 1-25
+    index, offset = background(len(pairs), blocks, pairs[:, 1] <= BACKGROUND_USERS)
+    pairs = pairs[index] + offset[:, None]
+
+    n = len(pairs)
+    friendships = {
+        "friendship_id": ids(n, start=first_id),
+        "user1_id": pairs[:, 0],
+        "user2_id": pairs[:, 1],
+        "friendship_date": random_dates(rng, n, 2023, months=(1, 12)),
+    }
 
-    print(f"   Created {len(df)} friendship pairs")
-    print(f"   - Includes (15, 16) friendship for Q5 edge case")
-    return df
+    if 0 in blocks:
+        print(f"   - Includes (15, 16) friendship for Q5 edge case")
+    return friendships
 
 
 # ============================================================
 # 9. SIGNUPS TABLE (Q6: Weekly Churn Rate)
 # ============================================================
-def generate_signups():
+def generate_signups(rng, blocks, first_id):
     """
     Q6: Weekly Churn Rate
     Design: Users who signed up in June 2024 with varying churn rates.
@@ -674,11 +877,6 @@ def generate_signups():
     - User who signed up, logged in 29 days later (churned - beyond 28 days)
     - Week with high churn vs low churn for testing
     """
-    print("\n[9/18] Generating signups.parquet...")
-
-    signups_data = []
-    signup_id = 1
-
     # Week 1 (June 1-7): 10 signups, 3 churned (30% churn)
     # Week 2 (June 8-14): 12 signups, 2 churned (16.67% churn)
     # Week 3 (June 15-21): 8 signups, 4 churned (50% churn)
@@ -691,63 +889,60 @@ def generate_signups():
         {"week": 4, "start": 22, "end": 28, "total": 15, "churned": 3},
     ]
 
-    for week_data in churn_design:
-        for i in range(week_data["total"]):
-            day = random.randint(week_data["start"], week_data["end"])
-            is_churned = i < week_data["churned"]
-
-            signup_date = date(2024, 6, day)
-
-            if is_churned:
-                # Churned = last login within first few days, then nothing
-                last_login = signup_date + timedelta(days=random.randint(1, 15))
-            else:
-                # Active users have recent logins (November)
-                last_login = date(2024, 11, random.randint(1, 28))
-
-            signups_data.append({
-                "signup_id": signup_id,
-                "user_id": 100 + signup_id,
-                "signup_date": signup_date,
-                "last_login_date": last_login,
-                "signup_week": week_data["week"]
-            })
-            signup_id += 1
+    totals = [week_data["total"] for week_data in churn_design]
+    n = sum(totals)
+    # The first `churned` signups of each week churn
+    position = np.arange(n) - np.repeat(np.cumsum(totals) - totals, totals)
+    is_churned = position < np.repeat([week_data["churned"] for week_data in churn_design], totals)
+
+    # Background blocks repeat every week's signups, so the churn rates hold
+    index, offset = background(n, blocks)
+    week = np.repeat([week_data["week"] for week_data in churn_design], totals)[index]
+    start = np.repeat([week_data["start"] for week_data in churn_design], totals)[index]
+    end = np.repeat([week_data["end"] for week_data in churn_design], totals)[index]
+    is_churned = is_churned[index]
+    user_id = 100 + ids(n)[index] + offset
+    n = len(index)
+
+    signup_date = to_dates(2024, 6, rng.integers(start, end + 1))
+    # Churned = last login within first few days, then nothing;
+    # active users have recent logins (November)
+    last_login = np.where(
+        is_churned,
+        signup_date + rng.integers(1, 16, n),
+        to_dates(2024, 11, rng.integers(1, 29, n)),
+    )
+
+    designed = rows(n, user_id=user_id, signup_date=signup_date, last_login_date=last_login, signup_week=week)
+
+    if 0 not in blocks:
+        designed["signup_id"] = ids(n, start=first_id)
+        return designed
 
     # EDGE CASE: User logged in exactly 27 days later (NOT churned)
-    signups_data.append({
-        "signup_id": signup_id,
-        "user_id": 100 + signup_id,
-        "signup_date": date(2024, 6, 10),
-        "last_login_date": date(2024, 7, 7),  # 27 days later - within 28
-        "signup_week": 2
-    })
-    signup_id += 1
-
     # EDGE CASE: User logged in exactly 29 days later (churned)
-    signups_data.append({
-        "signup_id": signup_id,
-        "user_id": 100 + signup_id,
-        "signup_date": date(2024, 6, 10),
-        "last_login_date": date(2024, 7, 9),  # 29 days later - beyond 28
-        "signup_week": 2
-    })
-    signup_id += 1
-
-    df = pd.DataFrame(signups_data)
-    df.to_parquet(OUTPUT_DIR / "signups.parquet", index=False)
-
-    print(f"   Created {len(df)} signups across 4 weeks")
+    boundaries = rows(
+        2,
+        user_id=100 + sum(totals) + ids(2),
+        signup_date=np.datetime64("2024-06-10"),
+        last_login_date=np.array(["2024-07-07", "2024-07-09"], dtype="datetime64[D]"),
+        signup_week=2,
+    )
+
+    signups = stack(designed, boundaries)
+    signups["signup_id"] = ids(n + 2, start=first_id)
+
+    print(f"   - 4 weeks of signups")
     print(f"   - Week 1: 30% churn, Week 2: ~17% churn")
     print(f"   - Week 3: 50% churn, Week 4: 20% churn")
     print(f"   - Edge: 27-day login (not churned) vs 29-day login (churned)")
-    return df
+    return signups
 
 
 # ============================================================
 # 10. CALLS TABLE (Q7, Q8)
 # ============================================================
-def generate_calls():
+def generate_calls(rng, blocks, first_id):
     """
     Q7: Messenger Video Call Percentage
     Q8: Users With 3+ Distinct Calls
@@ -757,11 +952,6 @@ def generate_calls():
     - User 51: Makes 3 calls to 2 distinct people (should NOT count as 3+ distinct)
     - User made video call but NOT on Messenger that day (for Q7)
     """
-    print("\n[10/18] Generating calls.parquet...")
-
-    calls_data = []
-    call_id = 1
-
     # ===== Q8: Users with 3+ distinct callees in last 7 days =====
     # Last 7 days = 2024-11-24 to 2024-11-30
 
@@ -791,96 +981,72 @@ def generate_calls():
         51: [98, 98, 97],     # 3 calls but only 2 distinct people
     }
 
-    for caller_id, callees in high_callers.items():
-        for callee_id in callees:
-            calls_data.append({
-                "call_id": call_id,
-                "caller_id": caller_id,
-                "callee_id": callee_id,
-                "call_type": random.choice(["video", "audio"]),
-                "call_date": f"2024-11-{random.randint(24, 30):02d}",
-                "duration_seconds": random.randint(60, 1800)
-            })
-            call_id += 1
-
-    for caller_id, callees in low_callers.items():
-        for callee_id in callees:
-            calls_data.append({
-                "call_id": call_id,
-                "caller_id": caller_id,
-                "callee_id": callee_id,
-                "call_type": random.choice(["video", "audio"]),
-                "call_date": f"2024-11-{random.randint(24, 30):02d}",
-                "duration_seconds": random.randint(60, 1800)
-            })
-            call_id += 1
-
-    for caller_id, callees in repeat_caller.items():
-        for callee_id in callees:
-            calls_data.append({
-                "call_id": call_id,
-                "caller_id": caller_id,
-                "callee_id": callee_id,
-                "call_type": "audio",
-                "call_date": f"2024-11-{random.randint(24, 30):02d}",
-                "duration_seconds": random.randint(60, 1800)
-            })
-            call_id += 1
-
-    for caller_id, callees in almost_qualifier.items():
-        for callee_id in callees:
-            calls_data.append({
-                "call_id": call_id,
-                "caller_id": caller_id,
-                "callee_id": callee_id,
-                "call_type": "audio",
-                "call_date": f"2024-11-{random.randint(24, 30):02d}",
-                "duration_seconds": random.randint(60, 1800)
-            })
-            call_id += 1
+    # Background blocks copy the high and low callers; the edge cases stay in block 0.
+    # These calls fall on Nov 24-28 or 30: the video calls on 2024-11-29 are
+    # only the planted Q7 ones below
+    sections = []
+    for callers, call_type, copied in (
+        ({**high_callers, **low_callers}, None, True),
+        ({**repeat_caller, **almost_qualifier}, "audio", False),
+    ):
+        counts = [len(callees) for callees in callers.values()]
+        index, offset = background(sum(counts), blocks, np.full(sum(counts), copied))
+        n = len(index)
+        day = rng.integers(24, 30, n)
+        sections.append(rows(
+            n,
+            caller_id=np.repeat(list(callers), counts)[index] + offset,
+            callee_id=np.concatenate(list(callers.values()))[index] + offset,
+            call_type=call_type or choice(rng, ["video", "audio"], n),
+            call_date=to_dates(2024, 11, np.where(day >= 29, day + 1, day)),
+            duration_seconds=rng.integers(60, 1801, n),
+        ))
+
+    if 0 not in blocks:
+        calls = stack(*sections)
+        calls["call_id"] = ids(len(calls["caller_id"]), start=first_id)
+        return calls
 
     # ===== Q7: Video call percentage (yesterday = 2024-11-29) =====
     # Video callers on 2024-11-29: Users 1, 3, 5 (will be counted if on Messenger)
-    video_callers_yesterday = [1, 3, 5]
-
-    for user_id in video_callers_yesterday:
-        calls_data.append({
-            "call_id": call_id,
-            "caller_id": user_id,
-            "callee_id": random.choice([x for x in range(1, 21) if x != user_id]),
-            "call_type": "video",
-            "call_date": "2024-11-29",
-            "duration_seconds": random.randint(300, 1200)
-        })
-        call_id += 1
+    video_callers_yesterday = np.array([1, 3, 5])
+
+    # Callee drawn from users 1-20 other than the caller
+    callees = rng.integers(1, 20, len(video_callers_yesterday))
+    callees += callees >= video_callers_yesterday
+    sections.append(rows(
+        len(video_callers_yesterday),
+        caller_id=video_callers_yesterday,
+        callee_id=callees,
+        call_type="video",
+        call_date=np.datetime64("2024-11-29"),
+        duration_seconds=rng.integers(300, 1201, len(video_callers_yesterday)),
+    ))
 
     # EDGE CASE: User 52 made video call yesterday but NOT on Messenger
-    calls_data.append({
-        "call_id": call_id,
-        "caller_id": 52,
-        "callee_id": 53,
-        "call_type": "video",
-        "call_date": "2024-11-29",
-        "duration_seconds": 600
-    })
-    call_id += 1
-
-    df = pd.DataFrame(calls_data)
-    df['call_date'] = pd.to_datetime(df['call_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "calls.parquet", index=False)
-
-    print(f"   Created {len(df)} calls")
+    sections.append(rows(
+        1,
+        caller_id=52,
+        callee_id=53,
+        call_type="video",
+        call_date=np.datetime64("2024-11-29"),
+        duration_seconds=600,
+    ))
+
+    calls = stack(*sections)
+    calls["call_id"] = ids(len(calls["caller_id"]), start=first_id)
+
     print(f"   - Q8: 5 users with 3+ distinct callees")
     print(f"   - Edge: User 50 calls same person 5x (1 distinct)")
     print(f"   - Edge: User 51 calls 2 people 3x total")
     print(f"   - Q7: 3 video callers on 2024-11-29")
-    return df
+    return calls
 
 
 # ============================================================
 # 11. MESSENGER_ACTIVITY TABLE (Q7, Q17)
 # ============================================================
-def generate_messenger_activity():
+def generate_messenger_activity(rng, blocks, first_id):
     """
     Q7: Video Call Percentage
     - Active on Messenger yesterday: 10 users
@@ -889,72 +1055,59 @@ def generate_messenger_activity():
     Q17: DAU/MAU Stickiness
     - Daily active users across multiple months
     """
-    print("\n[11/18] Generating messenger_activity.parquet...")
-
-    messenger_data = []
-    activity_id = 1
+    sections = []
 
     # Q7: Active on Messenger on 2024-11-29 (yesterday)
     # Users 1-10 are active on Messenger
-    messenger_active_yesterday = list(range(1, 11))
-
-    for user_id in messenger_active_yesterday:
-        messenger_data.append({
-            "activity_id": activity_id,
-            "user_id": user_id,
-            "activity_type": "message_sent",
-            "activity_date": "2024-11-29"
-        })
-        activity_id += 1
+    if 0 in blocks:
+        sections.append(rows(
+            10,
+            user_id=ids(10),
+            activity_type="message_sent",
+            activity_date=np.datetime64("2024-11-29"),
+        ))
 
     # Note: User 52 made video call but is NOT in messenger_activity for 2024-11-29
     # This is the edge case - they should NOT count in the percentage
 
-    # Add activity for other days in November (for rolling calculations)
-    for day in range(25, 29):
-        for user_id in random.sample(range(1, 21), random.randint(5, 12)):
-            messenger_data.append({
-                "activity_id": activity_id,
-                "user_id": user_id,
-                "activity_type": random.choice(["message_sent", "message_read", "status_update"]),
-                "activity_date": f"2024-11-{day:02d}"
-            })
-            activity_id += 1
+    # Add activity for other days in November (for rolling calculations);
+    # background blocks are never active on 2024-11-29, so Q7 keeps 30%
+    groups, active_users = sample_groups(rng, ids(20), rng.integers(5, 13, 4 * len(blocks)))
+    n = len(active_users)
+    sections.append(rows(
+        n,
+        user_id=active_users + group_blocks(groups, 4, blocks),
+        activity_type=choice(rng, ["message_sent", "message_read", "status_update"], n),
+        activity_date=to_dates(2024, 11, groups % 4 + 25),
+    ))
 
     # Q17: Stickiness data - daily activity across months
-    # Generate Jun-Nov 2024 daily data
-    for month in range(6, 12):
-        days_in_month = 30 if month in [6, 9, 11] else 31
-        if month == 11:
-            days_in_month = 28  # Only go to 28 to avoid overlap
-
-        for day in range(1, days_in_month + 1):
-            # Vary daily active users
-            num_active = random.randint(8, 18)
-            active_users = random.sample(range(1, 26), num_active)
-            for user_id in active_users:
-                messenger_data.append({
-                    "activity_id": activity_id,
-                    "user_id": user_id,
-                    "activity_type": random.choice(["message_sent", "message_read"]),
-                    "activity_date": f"2024-{month:02d}-{day:02d}"
-                })
-                activity_id += 1
-
-    df = pd.DataFrame(messenger_data)
-    df['activity_date'] = pd.to_datetime(df['activity_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "messenger_activity.parquet", index=False)
-
-    print(f"   Created {len(df)} messenger activity records")
-    print(f"   - Q7: 10 users active on 2024-11-29, 3 made video calls (30%)")
-    print(f"   - Q17: Daily activity Jun-Nov for stickiness calculation")
-    return df
+    # Generate Jun-Nov 2024 daily data (November only to the 28th to avoid overlap)
+    dates = np.arange(np.datetime64("2024-06-01"), np.datetime64("2024-11-29"))
+
+    # Vary daily active users
+    groups, active_users = sample_groups(rng, ids(25), rng.integers(8, 19, len(dates) * len(blocks)))
+    n = len(active_users)
+    sections.append(rows(
+        n,
+        user_id=active_users + group_blocks(groups, len(dates), blocks),
+        activity_type=choice(rng, ["message_sent", "message_read"], n),
+        activity_date=dates[groups % len(dates)],
+    ))
+
+    activity = stack(*sections)
+    activity["activity_id"] = ids(len(activity["user_id"]), start=first_id)
+
+    if 0 in blocks:
+        print(f"   - Q7: 10 users active on 2024-11-29, 3 made video calls (30%)")
+        print(f"   - Q17: Daily activity Jun-Nov for stickiness calculation")
+    return activity
 
 
 # ============================================================
 # 12. COMMENTS TABLE (Q9: Comment Histogram)
 # ============================================================
-def generate_comments():
+def generate_comments(rng, blocks, first_id):
     """
     Q9: Comment Histogram
     Distribution of users across comment count buckets:
@@ -967,11 +1120,6 @@ def generate_comments():
     Edge cases:
     - Users at exact boundaries (0, 1, 2, 3, 5, 6, 10, 11)
     """
-    print("\n[12/18] Generating comments.parquet...")
-
-    comments_data = []
-    comment_id = 1
-
     # Design exact bucket distribution
     comment_distribution = {
         # 10+ comments (bucket '10+')
@@ -1001,43 +1149,32 @@ def generate_comments():
         # No entries for these users
     }
 
-    for user_id, num_comments in comment_distribution.items():
-        for _ in range(num_comments):
-            comments_data.append({
-                "comment_id": comment_id,
-                "user_id": user_id,
-                "post_id": random.randint(1, 50),
-                "comment_text": f"Sample comment {comment_id}",
-                "comment_date": f"2024-{random.randint(1, 11):02d}-{random.randint(1, 28):02d}"
-            })
-            comment_id += 1
-
-    df = pd.DataFrame(comments_data)
-    df['comment_date'] = pd.to_datetime(df['comment_date']).dt.date
-    df.to_parquet(OUTPUT_DIR / "comments.parquet", index=False)
-
-    # Count users in each bucket
-    bucket_counts = {
-        "0": 15,        # Users 16-30 have 0 comments
-        "1-2": 6,       # Users 10-15
-        "3-5": 3,       # Users 7-9
-        "6-10": 3,      # Users 4-6
-        "10+": 3,       # Users 1-3
+    # Background blocks repeat the distribution for their own users
+    commenters = np.repeat(list(comment_distribution), list(comment_distribution.values()))
+    index, offset = background(len(commenters), blocks)
+    n = len(index)
+    comment_ids = ids(n, start=first_id)
+    comments = {
+        "comment_id": comment_ids,
+        "user_id": commenters[index] + offset,
+        "post_id": rng.integers(1, 50 * blocks.stop + 1, n),
+        "comment_text": concat("Sample comment ", comment_ids),
+        "comment_date": random_dates(rng, n, 2024),
     }
 
-    print(f"   Created {len(df)} comments")
-    print(f"   - Bucket '0': 15 users (16-30)")
-    print(f"   - Bucket '1-2': 6 users")
-    print(f"   - Bucket '3-5': 3 users")
-    print(f"   - Bucket '6-10': 3 users")
-    print(f"   - Bucket '10+': 3 users")
-    return df
+    if 0 in blocks:
+        print(f"   - Bucket '0': 15 users (16-30)")
+        print(f"   - Bucket '1-2': 6 users")
+        print(f"   - Bucket '3-5': 3 users")
+        print(f"   - Bucket '6-10': 3 users")
+        print(f"   - Bucket '10+': 3 users")
+    return comments
 
 
 # ============================================================
 # 13. LOGINS TABLE (Q11: Consecutive Login Streak)
 # ============================================================
-def generate_logins():
+def generate_logins(rng, blocks, first_id):
     """
     Q11: Consecutive Login Streak
     Find users with 5+ consecutive day login streaks.
@@ -1047,193 +1184,147 @@ def generate_logins():
     - User with 5 days, gap, 3 days (longest streak = 5, not 8)
     - User with multiple logins per day (count as 1 day)
     """
-    print("\n[13/18] Generating logins.parquet...")
-
-    records = []
+    devices = ["mobile", "desktop", "tablet"]
 
     # Users with 5+ day streaks (these are the answer) - 8 users
     streak_configs = [
-        (1, 15, datetime(2024, 10, 1)),   # User 1: 15-day streak
-        (2, 12, datetime(2024, 10, 5)),   # User 2: 12-day streak
-        (3, 10, datetime(2024, 10, 10)),  # User 3: 10-day streak
-        (4, 9, datetime(2024, 10, 8)),    # User 4: 9-day streak
-        (5, 8, datetime(2024, 10, 12)),   # User 5: 8-day streak
-        (6, 7, datetime(2024, 10, 15)),   # User 6: 7-day streak
-        (7, 6, datetime(2024, 10, 18)),   # User 7: 6-day streak
-        (8, 5, datetime(2024, 10, 20)),   # User 8: 5-day streak (minimum)
+        (1, 15, "2024-10-01"),   # User 1: 15-day streak
+        (2, 12, "2024-10-05"),   # User 2: 12-day streak
+        (3, 10, "2024-10-10"),   # User 3: 10-day streak
+        (4, 9, "2024-10-08"),    # User 4: 9-day streak
+        (5, 8, "2024-10-12"),    # User 5: 8-day streak
+        (6, 7, "2024-10-15"),    # User 6: 7-day streak
+        (7, 6, "2024-10-18"),    # User 7: 6-day streak
+        (8, 5, "2024-10-20"),    # User 8: 5-day streak (minimum)
     ]
-
-    for user_id, streak_len, start_date in streak_configs:
-        for day_offset in range(streak_len):
-            login_date = start_date + timedelta(days=day_offset)
-            # Sometimes multiple logins per day (should count as 1 day)
-            num_logins = random.randint(1, 3)
-            for _ in range(num_logins):
-                records.append({
-                    "user_id": user_id,
-                    "login_date": login_date.date(),
-                    "device_type": random.choice(["mobile", "desktop", "tablet"])
-                })
-
-        # Add some non-consecutive logins before the streak
-        for _ in range(random.randint(2, 4)):
-            extra_date = start_date - timedelta(days=random.randint(10, 30))
-            records.append({
-                "user_id": user_id,
-                "login_date": extra_date.date(),
-                "device_type": random.choice(["mobile", "desktop", "tablet"])
-            })
+    index, offset = background(len(streak_configs), blocks)
+    streak_users = np.array([user_id for user_id, _, _ in streak_configs])[index] + offset
+    streak_lengths = np.array([streak_len for _, streak_len, _ in streak_configs])[index]
+    streak_starts = np.array([start for _, _, start in streak_configs], dtype="datetime64[D]")[index]
+
+    def streaks(users, starts, lengths):
+        """One ``(user, date)`` per day of each streak."""
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(users, lengths), np.repeat(starts, lengths) + offsets
+
+    # Sometimes multiple logins per day (should count as 1 day)
+    users, dates = streaks(streak_users, streak_starts, streak_lengths)
+    logins_per_day = rng.integers(1, 4, len(dates))
+    n = logins_per_day.sum()
+    streak_logins = rows(
+        n,
+        user_id=np.repeat(users, logins_per_day),
+        login_date=np.repeat(dates, logins_per_day),
+        device_type=choice(rng, devices, n),
+    )
+
+    # Add some non-consecutive logins 10-30 days before each streak
+    extras = rng.integers(2, 5, len(streak_users))
+    n = extras.sum()
+    early_logins = rows(
+        n,
+        user_id=np.repeat(streak_users, extras),
+        login_date=np.repeat(streak_starts, extras) - rng.integers(10, 31, n),
+        device_type=choice(rng, devices, n),
+    )
+
+    sections = [streak_logins, early_logins]
 
     # EDGE CASE: User 40 with exactly 4 consecutive days (should NOT qualify)
-    start_date = datetime(2024, 10, 1)
-    for day_offset in range(4):
-        login_date = start_date + timedelta(days=day_offset)
-        records.append({
-            "user_id": 40,
-            "login_date": login_date.date(),
-            "device_type": "mobile"
-        })
-
-    # EDGE CASE: User 41 with 5 days, gap, 3 days (longest streak = 5, not 8)
-    start_date = datetime(2024, 10, 1)
-    # First streak: 5 days
-    for day_offset in range(5):
-        login_date = start_date + timedelta(days=day_offset)
-        records.append({
-            "user_id": 41,
-            "login_date": login_date.date(),
-            "device_type": "mobile"
-        })
-    # Gap of 2 days, then 3 more days
-    gap_start = start_date + timedelta(days=7)  # Skip day 5 and 6
-    for day_offset in range(3):
-        login_date = gap_start + timedelta(days=day_offset)
-        records.append({
-            "user_id": 41,
-            "login_date": login_date.date(),
-            "device_type": "mobile"
-        })
-
-    # Users with broken streaks (shouldn't be in results)
-    for user_id in range(42, 50):
-        start_date = datetime(2024, 10, 1) + timedelta(days=random.randint(0, 20))
-        streak_len = random.randint(1, 4)  # Max 4 days
-
-        for day_offset in range(streak_len):
-            login_date = start_date + timedelta(days=day_offset)
-            records.append({
-                "user_id": user_id,
-                "login_date": login_date.date(),
-                "device_type": random.choice(["mobile", "desktop", "tablet"])
-            })
-
-    df = pd.DataFrame(records)
-    df.to_parquet(OUTPUT_DIR / "logins.parquet", index=False)
-
-    print(f"   Created {len(df)} login records")
-    print(f"   - 8 users with 5+ day streaks (answer)")
-    print(f"   - Edge: User 40 with exactly 4 days (excluded)")
-    print(f"   - Edge: User 41 with 5+3 days but gap (streak=5)")
-    return df
+    # EDGE CASE: User 41 with 5 days, gap of 2 days, 3 days (longest streak = 5, not 8)
+    # (block 0 only)
+    if 0 in blocks:
+        users, dates = streaks(
+            np.array([40, 41, 41]),
+            np.array(["2024-10-01", "2024-10-01", "2024-10-08"], dtype="datetime64[D]"),
+            np.array([4, 5, 3]),
+        )
+        sections.append(rows(len(dates), user_id=users, login_date=dates, device_type="mobile"))
+
+    # Users with broken streaks (shouldn't be in results): max 4 days
+    index, offset = background(8, blocks)
+    broken_users = np.arange(42, 50)[index] + offset
+    users, dates = streaks(
+        broken_users,
+        np.datetime64("2024-10-01") + rng.integers(0, 21, len(broken_users)),
+        rng.integers(1, 5, len(broken_users)),
+    )
+    sections.append(rows(len(dates), user_id=users, login_date=dates, device_type=choice(rng, devices, len(dates))))
+
+    logins = stack(*sections)
+
+    if 0 in blocks:
+        print(f"   - 8 users with 5+ day streaks (answer)")
+        print(f"   - Edge: User 40 with exactly 4 days (excluded)")
+        print(f"   - Edge: User 41 with 5+3 days but gap (streak=5)")
+    return logins
 
 
 # ============================================================
 # 14. ADVERTISERS TABLE (Q12: State Machine)
 # ============================================================
-def generate_advertisers():
+def generate_advertisers(rng, blocks, first_id):
     """
     Q12: Advertiser Status Transitions
     Test all 8 state transitions based on payment status.
     """
-    print("\n[14/18] Generating advertisers.parquet...")
-
     # Design specific test cases for each transition
     # User IDs are chosen to make testing easy
-    advertisers = [
-        # NEW + paid → EXISTING (users 1-2)
-        {"user_id": 1, "status": "NEW"},
-        {"user_id": 2, "status": "NEW"},
-
-        # NEW + not paid → CHURN (users 3-4)
-        {"user_id": 3, "status": "NEW"},
-        {"user_id": 4, "status": "NEW"},
-
-        # EXISTING + paid → EXISTING (users 5-7)
-        {"user_id": 5, "status": "EXISTING"},
-        {"user_id": 6, "status": "EXISTING"},
-        {"user_id": 7, "status": "EXISTING"},
-
-        # EXISTING + not paid → CHURN (users 8-10)
-        {"user_id": 8, "status": "EXISTING"},
-        {"user_id": 9, "status": "EXISTING"},
-        {"user_id": 10, "status": "EXISTING"},
-
-        # CHURN + paid → RESURRECT (users 11-13)
-        {"user_id": 11, "status": "CHURN"},
-        {"user_id": 12, "status": "CHURN"},
-        {"user_id": 13, "status": "CHURN"},
-
-        # CHURN + not paid → CHURN (users 14-16)
-        {"user_id": 14, "status": "CHURN"},
-        {"user_id": 15, "status": "CHURN"},
-        {"user_id": 16, "status": "CHURN"},
-
-        # RESURRECT + paid → EXISTING (users 17-18)
-        {"user_id": 17, "status": "RESURRECT"},
-        {"user_id": 18, "status": "RESURRECT"},
-
-        # RESURRECT + not paid → CHURN (users 19-20)
-        {"user_id": 19, "status": "RESURRECT"},
-        {"user_id": 20, "status": "RESURRECT"},
-    ]
-
-    df = pd.DataFrame(advertisers)
-    df.to_parquet(OUTPUT_DIR / "advertisers.parquet", index=False)
+    index, offset = background(20, blocks)
+    advertisers = {
+        "user_id": ids(20)[index] + offset,
+        "status": pa.array([
+            # NEW + paid → EXISTING (users 1-2), NEW + not paid → CHURN (users 3-4)
+            "NEW", "NEW", "NEW", "NEW",
+            # EXISTING + paid → EXISTING (users 5-7), EXISTING + not paid → CHURN (users 8-10)
+            "EXISTING", "EXISTING", "EXISTING", "EXISTING", "EXISTING", "EXISTING",
+            # CHURN + paid → RESURRECT (users 11-13), CHURN + not paid → CHURN (users 14-16)
+            "CHURN", "CHURN", "CHURN", "CHURN", "CHURN", "CHURN",
+            # RESURRECT + paid → EXISTING (users 17-18), RESURRECT + not paid → CHURN (users 19-20)
+            "RESURRECT", "RESURRECT", "RESURRECT", "RESURRECT",
+        ]).take(index),
+    }
 
-    print(f"   Created {len(df)} advertisers")
-    print(f"   - NEW: 4 (2 will pay, 2 won't)")
-    print(f"   - EXISTING: 6 (3 will pay, 3 won't)")
-    print(f"   - CHURN: 6 (3 will pay, 3 won't)")
-    print(f"   - RESURRECT: 4 (2 will pay, 2 won't)")
-    return df
+    if 0 in blocks:
+        print(f"   - NEW: 4 (2 will pay, 2 won't)")
+        print(f"   - EXISTING: 6 (3 will pay, 3 won't)")
+        print(f"   - CHURN: 6 (3 will pay, 3 won't)")
+        print(f"   - RESURRECT: 4 (2 will pay, 2 won't)")
+    return advertisers
 
 
 # ============================================================
 # 15. DAILY_PAY TABLE (Q12: State Machine)
 # ============================================================
-def generate_daily_pay():
+def generate_daily_pay(rng, blocks, first_id):
     """
     Q12: Advertiser Status Transitions
     Payment records for "today" (2024-12-01)
     """
-    print("\n[15/18] Generating daily_pay.parquet...")
-
-    # Users who paid today
-    paid_users = [1, 2, 5, 6, 7, 11, 12, 13, 17, 18]
-
-    daily_pay = []
-    for user_id in paid_users:
-        daily_pay.append({
-            "user_id": user_id,
-            "paid_date": date(2024, 12, 1),
-            "amount": random.randint(50, 500)
-        })
-
-    df = pd.DataFrame(daily_pay)
-    df.to_parquet(OUTPUT_DIR / "daily_pay.parquet", index=False)
-
-    print(f"   Created {len(df)} payment records for 2024-12-01")
-    print(f"   - Paid: users 1,2 (NEW→EXISTING)")
-    print(f"   - Paid: users 5,6,7 (EXISTING→EXISTING)")
-    print(f"   - Paid: users 11,12,13 (CHURN→RESURRECT)")
-    print(f"   - Paid: users 17,18 (RESURRECT→EXISTING)")
-    return df
+    # Users who paid today (and their background copies)
+    paid_users = np.array([1, 2, 5, 6, 7, 11, 12, 13, 17, 18])
+    index, offset = background(len(paid_users), blocks)
+    paid_users = paid_users[index] + offset
+
+    daily_pay = rows(
+        len(paid_users),
+        user_id=paid_users,
+        paid_date=np.datetime64("2024-12-01"),
+        amount=rng.integers(50, 501, len(paid_users)),
+    )
+
+    if 0 in blocks:
+        print(f"   - Paid: users 1,2 (NEW→EXISTING)")
+        print(f"   - Paid: users 5,6,7 (EXISTING→EXISTING)")
+        print(f"   - Paid: users 11,12,13 (CHURN→RESURRECT)")
+        print(f"   - Paid: users 17,18 (RESURRECT→EXISTING)")
+    return daily_pay
 
 
 # ============================================================
 # 16. TRANSACTIONS TABLE (Q15: Cumulative Revenue)
 # ============================================================
-def generate_transactions():
+def generate_transactions(rng, blocks, first_id):
     """
     Q15: Cumulative Revenue by Month
 
@@ -1241,11 +1332,6 @@ def generate_transactions():
     - Transactions from 2023 (should be excluded from 2024 cumulative)
     - Multiple transactions same day
     """
-    print("\n[16/18] Generating transactions.parquet...")
-
-    records = []
-    transaction_id = 1
-
     # Monthly revenue targets (growing pattern)
     monthly_targets = [
         10000, 10800, 11500, 12300, 13200,  # Jan-May
@@ -1253,52 +1339,56 @@ def generate_transactions():
         20200, 22000                         # Nov-Dec
     ]
 
-    # Generate 2024 transactions
-    for month_idx, target in enumerate(monthly_targets):
-        month = month_idx + 1
-        remaining = target
-        day = 1
+    block_ids = np.arange(blocks.start, blocks.stop)
 
-        while remaining > 0:
-            amount = min(remaining, random.randint(50, 500))
-            remaining -= amount
+    def customers(per_block):
+        """Customer ids 1-100 of each block, ``per_block[b]`` for block ``b``."""
+        return rng.integers(1, 101, per_block.sum()) + BLOCK_STRIDE * np.repeat(block_ids, per_block)
 
-            trans_date = date(2024, month, min(day, 28))
-
-            records.append({
-                "transaction_id": transaction_id,
-                "user_id": random.randint(1, 100),
-                "amount": amount,
-                "transaction_date": trans_date
-            })
-
-            transaction_id += 1
-            day = min(day + random.randint(0, 2), 28)
+    # Generate 2024 transactions: every block draws amounts of 50-500 until
+    # the month's target is reached (the last one is cut to hit it exactly),
+    # each 0-2 days after the previous one and no later than the 28th
+    sections = []
+    for month_idx, target in enumerate(monthly_targets):
+        draws = target // 50 + 1  # enough to reach the target at the minimum amount
+        running = np.cumsum(rng.integers(50, 501, (len(block_ids), draws)), axis=1)
+        per_block = (running < target).sum(axis=1) + 1
+        kept = np.arange(draws) < per_block[:, None]
+        amounts = np.diff(np.minimum(running, target), axis=1, prepend=0)[kept]
+        gaps = np.zeros_like(running)
+        gaps[:, 1:][kept[:, 1:]] = rng.integers(0, 3, (per_block - 1).sum())
+        day = np.minimum(1 + np.cumsum(gaps, axis=1), 28)[kept]
+        sections.append(rows(
+            len(amounts),
+            user_id=customers(per_block),
+            amount=amounts,
+            transaction_date=to_dates(2024, month_idx + 1, day),
+        ))
 
     # EDGE CASE: Add 2023 transactions (should be excluded from 2024 cumulative)
-    for month in range(1, 13):
-        for _ in range(random.randint(5, 10)):
-            records.append({
-                "transaction_id": transaction_id,
-                "user_id": random.randint(1, 100),
-                "amount": random.randint(50, 300),
-                "transaction_date": date(2023, month, random.randint(1, 28))
-            })
-            transaction_id += 1
+    per_month = rng.integers(5, 11, 12 * len(block_ids))
+    n = per_month.sum()
+    sections.append(rows(
+        n,
+        user_id=customers(per_month.reshape(-1, 12).sum(axis=1)),
+        amount=rng.integers(50, 301, n),
+        transaction_date=to_dates(2023, np.repeat(np.tile(ids(12), len(block_ids)), per_month),
+                                  rng.integers(1, 29, n)),
+    ))
 
-    df = pd.DataFrame(records)
-    df.to_parquet(OUTPUT_DIR / "transactions.parquet", index=False)
+    transactions = stack(*sections)
+    transactions["transaction_id"] = ids(len(transactions["user_id"]), start=first_id)
 
-    print(f"   Created {len(df)} transactions")
-    print(f"   - 2024: 12 months of growing revenue")
-    print(f"   - 2023: ~80 transactions (should be excluded)")
-    return df
+    if 0 in blocks:
+        print(f"   - 2024: 12 months of growing revenue")
+        print(f"   - 2023: ~80 transactions (should be excluded)")
+    return transactions
 
 
 # ============================================================
 # 17. USER_RECORDS TABLE (Q18: Deduplication)
 # ============================================================
-def generate_user_records():
+def generate_user_records(rng, blocks, first_id):
     """
     Q18: Deduplicate User Records
     Keep most recent record per user_id.
@@ -1307,99 +1397,58 @@ def generate_user_records():
     - User with 3+ duplicate records
     - Records with different data quality (old records have "(old)" in name)
     """
-    print("\n[17/18] Generating user_records.parquet...")
-
-    records = []
-
-    first_names = [
+    first_names = np.array([
         "Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry",
         "Ivy", "Jack", "Kate", "Leo", "Mia", "Noah", "Olivia", "Paul",
         "Quinn", "Rose", "Sam", "Tina", "Uma", "Victor", "Wendy", "Xavier",
         "Yara", "Zack", "Amy", "Brian", "Chloe", "David"
-    ]
+    ])
 
     domains = ["gmail.com", "yahoo.com", "outlook.com", "icloud.com"]
 
-    # Users 1-15: single record each
-    for i in range(1, 16):
-        name = first_names[i - 1]
-        records.append({
-            "user_id": i,
-            "name": name,
-            "email": f"{name.lower()}@{random.choice(domains)}",
-            "updated_at": datetime(2024, 10, random.randint(1, 28),
-                                   random.randint(0, 23), random.randint(0, 59))
-        })
-
-    # Users 16-27: 2 records each (duplicates)
-    for i in range(16, 28):
-        name = first_names[i - 1]
-        base_email = f"{name.lower()}@{random.choice(domains)}"
-
-        # Old record
-        records.append({
-            "user_id": i,
-            "name": f"{name} (old)",
-            "email": f"{name.lower()}.old@{random.choice(domains)}",
-            "updated_at": datetime(2024, 10, random.randint(1, 14),
-                                   random.randint(0, 23), random.randint(0, 59))
-        })
-
-        # New record (most recent - should be kept)
-        records.append({
-            "user_id": i,
-            "name": name,
-            "email": base_email,
-            "updated_at": datetime(2024, 11, random.randint(1, 28),
-                                   random.randint(0, 23), random.randint(0, 59))
-        })
+    def records(user_ids, label, month, days):
+        """One record per user and background copy, updated on a random day and time of 2024-``month``."""
+        index, offset = background(len(user_ids), blocks, user_ids <= BACKGROUND_USERS)
+        names = first_names[user_ids[index] - 1]
+        user_ids = user_ids[index] + offset
+        n = len(user_ids)
+        updated_at = (
+            to_dates(2024, month, rng.integers(days[0], days[1] + 1, n)).astype("datetime64[us]")
+            + rng.integers(0, 24, n).astype("timedelta64[h]")
+            + rng.integers(0, 60, n).astype("timedelta64[m]")
+        )
+        suffix = f".{label}" if label else ""
+        return rows(
+            n,
+            user_id=user_ids,
+            name=concat(names, f" ({label})") if label else names,
+            email=concat(np.char.lower(names), f"{suffix}@", choice(rng, domains, n)),
+            updated_at=updated_at,
+        )
 
+    # Users 1-15: single record each
+    # Users 16-27: 2 records each (duplicates); the newest should be kept
     # Users 28-30: 3 records each (EDGE CASE)
-    for i in range(28, 31):
-        name = first_names[i - 1]
-        base_email = f"{name.lower()}@{random.choice(domains)}"
-
-        # Oldest record
-        records.append({
-            "user_id": i,
-            "name": f"{name} (oldest)",
-            "email": f"{name.lower()}.oldest@{random.choice(domains)}",
-            "updated_at": datetime(2024, 9, random.randint(1, 28),
-                                   random.randint(0, 23), random.randint(0, 59))
-        })
-
-        # Middle record
-        records.append({
-            "user_id": i,
-            "name": f"{name} (old)",
-            "email": f"{name.lower()}.old@{random.choice(domains)}",
-            "updated_at": datetime(2024, 10, random.randint(1, 28),
-                                   random.randint(0, 23), random.randint(0, 59))
-        })
-
-        # Most recent record (should be kept)
-        records.append({
-            "user_id": i,
-            "name": name,
-            "email": base_email,
-            "updated_at": datetime(2024, 11, random.randint(15, 28),
-                                   random.randint(0, 23), random.randint(0, 59))
-        })
-
-    df = pd.DataFrame(records)
-    df.to_parquet(OUTPUT_DIR / "user_records.parquet", index=False)
-
-    print(f"   Created {len(df)} records for 30 users")
-    print(f"   - 15 users with 1 record each")
-    print(f"   - 12 users with 2 records each")
-    print(f"   - 3 users with 3 records each (edge case)")
-    return df
+    user_records = stack(
+        records(ids(15), None, 10, (1, 28)),
+        records(ids(12, start=16), "old", 10, (1, 14)),
+        records(ids(12, start=16), None, 11, (1, 28)),
+        records(ids(3, start=28), "oldest", 9, (1, 28)),
+        records(ids(3, start=28), "old", 10, (1, 28)),
+        records(ids(3, start=28), None, 11, (15, 28)),
+    )
+
+    if 0 in blocks:
+        print(f"   - 15 users with 1 record each")
+        print(f"   - 12 users with 2 records each")
+        print(f"   - 3 users with 3 records each (edge case)")
+    return user_records
 
 
 # ============================================================
 # 18. MONTHLY_ACTIVE TABLE (Q20: YoY MAU Growth)
 # ============================================================
-def generate_monthly_active():
+def generate_monthly_active(rng, blocks, first_id):
     """
     Q20: Year-over-Year MAU Growth
 
@@ -1407,119 +1456,260 @@ def generate_monthly_active():
     - 2022 data (should be excluded from 2023-2024 comparison)
     - Month with negative YoY growth (2024 < 2023)
     - Month with exactly 0% growth
-    """
-    print("\n[18/18] Generating monthly_active.parquet...")
 
-    records = []
+    One row per year and month at every scale: generated in a single chunk
+    for all blocks, with the MAU values multiplied by the block count.
+    """
+    scale = len(blocks)
 
     # 2022 baseline (EDGE CASE - should be excluded)
-    base_2022 = [160, 155, 165, 170, 175, 168, 162, 158, 172, 180, 190, 200]
+    base_2022 = scale * np.array([160, 155, 165, 170, 175, 168, 162, 158, 172, 180, 190, 200])
 
     # 2023 baseline
-    base_2023 = [180, 175, 185, 190, 195, 188, 182, 178, 192, 200, 210, 220]
-
-    # 2024 with growth (and edge cases)
-    for month in range(1, 13):
-        # 2022 data
-        records.append({
-            "year": 2022,
-            "month": month,
-            "mau": base_2022[month - 1]
-        })
-
-        # 2023 data
-        mau_2023 = base_2023[month - 1]
-        records.append({
-            "year": 2023,
-            "month": month,
-            "mau": mau_2023
-        })
-
-        # 2024 data with varied growth
-        if month == 6:
-            # EDGE CASE: Negative growth (June 2024 < June 2023)
-            mau_2024 = int(mau_2023 * 0.95)  # -5% growth
-        elif month == 9:
-            # EDGE CASE: Exactly 0% growth
-            mau_2024 = mau_2023  # 0% growth
-        else:
-            # Normal positive growth (12-20%)
-            growth_rate = 0.12 + random.uniform(0, 0.08)
-            mau_2024 = int(mau_2023 * (1 + growth_rate))
-
-        records.append({
-            "year": 2024,
-            "month": month,
-            "mau": mau_2024
-        })
-
-    df = pd.DataFrame(records)
-    df.to_parquet(OUTPUT_DIR / "monthly_active.parquet", index=False)
-
-    print(f"   Created {len(df)} monthly MAU records")
+    base_2023 = scale * np.array([180, 175, 185, 190, 195, 188, 182, 178, 192, 200, 210, 220])
+
+    # 2024 with normal positive growth (12-20%)...
+    growth_rate = 0.12 + rng.uniform(0, 0.08, 12)
+    # ...except EDGE CASE: Negative growth (June 2024 < June 2023, -5%)
+    growth_rate[5] = -0.05
+    # ...and EDGE CASE: Exactly 0% growth (September)
+    growth_rate[8] = 0.0
+    mau_2024 = (base_2023 * (1 + growth_rate)).astype(np.int64)
+
+    # One row per year for each month, month by month
+    monthly_active = {
+        "year": np.tile([2022, 2023, 2024], 12),
+        "month": np.repeat(ids(12), 3),
+        "mau": np.column_stack([base_2022, base_2023, mau_2024]).ravel(),
+    }
+
     print(f"   - 2022: 12 months (edge case - should be excluded)")
     print(f"   - 2023: 12 months baseline")
     print(f"   - 2024: 12 months with growth variations")
     print(f"   - Edge: June 2024 has negative YoY growth")
     print(f"   - Edge: September 2024 has 0% YoY growth")
-    return df
+    return monthly_active
+
+
+# ============================================================
+# EXPECTED ANSWERS
+# ============================================================
+# Planted edge cases that must hold at every scale: (description, SQL that
+# returns true when the edge case is intact)
+PLANTED_CHECKS = [
+    ("Q3: app CTRs are 25%, 15%, 5%, 2%, 0% (app 6 has no impressions)", """
+        SELECT list(ctr ORDER BY app_id) = [25.0, 15.0, 5.0, 2.0, 0.0]
+        FROM (
+            SELECT app_id, ROUND(100.0 * COUNT(*) FILTER (action_type = 'click')
+                                 / COUNT(*) FILTER (action_type = 'impression'), 2) AS ctr
+            FROM actions WHERE YEAR(action_date) = 2024
+            GROUP BY app_id HAVING COUNT(*) FILTER (action_type = 'impression') > 0
+        )
+    """),
+    ("Q2: users 26, 27 active in June only", """
+        SELECT COUNT(DISTINCT user_id) = 2 AND bool_and(MONTH(action_date) = 6)
+        FROM actions
+        WHERE user_id IN (26, 27) AND action_date BETWEEN '2024-06-01' AND '2024-07-31'
+    """),
+    ("Q2: users 28, 29 active in July only", """
+        SELECT COUNT(DISTINCT user_id) = 2 AND bool_and(MONTH(action_date) = 7)
+        FROM actions
+        WHERE user_id IN (28, 29) AND action_date BETWEEN '2024-06-01' AND '2024-07-31'
+    """),
+    ("Q4: pages 8, 9, 10 are the only pages with no likes", """
+        SELECT list(page_id ORDER BY page_id) = [8, 9, 10]
+        FROM pages WHERE page_id NOT IN (SELECT page_id FROM page_likes)
+    """),
+    ("Q7: 3 of the 10 Messenger users on 2024-11-29 made video calls", """
+        SELECT COUNT(*) = 10 AND COUNT(*) FILTER (user_id IN (
+            SELECT caller_id FROM calls WHERE call_type = 'video' AND call_date = '2024-11-29'
+        )) = 3
+        FROM (SELECT DISTINCT user_id FROM messenger_activity WHERE activity_date = '2024-11-29')
+    """),
+    ("Q11: user 40 logs in 4 days in a row, user 41's longest streak is 5", """
+        WITH days AS (
+            SELECT DISTINCT user_id, login_date FROM logins WHERE user_id IN (40, 41)
+        ), islands AS (
+            SELECT user_id, COUNT(*) AS streak
+            FROM (
+                SELECT user_id, login_date - CAST(ROW_NUMBER() OVER (
+                    PARTITION BY user_id ORDER BY login_date) AS INTEGER) AS island
+                FROM days
+            )
+            GROUP BY user_id, island
+        )
+        SELECT list(longest ORDER BY user_id) = [4, 5]
+        FROM (SELECT user_id, MAX(streak) AS longest FROM islands GROUP BY user_id)
+    """),
+]
+
+
+def format_row(columns, row, width=90):
+    """``column=value`` pairs of a result row, cut to ``width`` characters."""
+    text = ", ".join(f"{column}={value}" for column, value in zip(columns, row))
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def report_expected_answers(output_dir):
+    """Print every challenge's answer over the generated tables and check the planted edge cases.
+
+    Returns True when every planted edge case holds.
+    """
+    pack = json.loads((OUTPUT_DIR / "pack.json").read_text())
+    conn = duckdb.connect()
+    for path in sorted(output_dir.glob("*.parquet")):
+        conn.execute(f"CREATE VIEW {path.stem} AS SELECT * FROM read_parquet('{path}')")
+
+    print("\n" + "-" * 70)
+    print("EXPECTED ANSWERS FOR EACH CHALLENGE:")
+    print("-" * 70)
+    for challenge in pack["challenges"]:
+        try:
+            result = conn.execute(challenge["solution_sql"])
+            columns = [column[0] for column in result.description]
+            rows_ = result.fetchall()
+        except duckdb.Error as e:
+            print(f"{challenge['id']:<36} ERROR: {e}")
+            continue
+        first = format_row(columns, rows_[0]) if rows_ else "-"
+        print(f"{challenge['id']:<36} {len(rows_):>8,} rows  first: {first}")
+
+    print("\n" + "-" * 70)
+    print("PLANTED EDGE CASES:")
+    print("-" * 70)
+    intact = True
+    for description, sql in PLANTED_CHECKS:
+        ok = conn.execute(sql).fetchone()[0]
+        intact = intact and bool(ok)
+        print(f"{'✓' if ok else '✗'} {description}")
+    conn.close()
+    return intact
 
 
 # ============================================================
 # MAIN EXECUTION
 # ============================================================
+# (table, generator, generated in chunks of blocks)
+TABLES = [
+    ("users", generate_users, True),
+    ("posts", generate_posts, True),
+    ("actions", generate_actions, True),
+    ("pages", generate_pages, True),
+    ("page_likes", generate_page_likes, True),
+    ("events", generate_events, True),
+    ("event_attendance", generate_event_attendance, True),
+    ("friendships", generate_friendships, True),
+    ("signups", generate_signups, True),
+    ("calls", generate_calls, True),
+    ("messenger_activity", generate_messenger_activity, True),
+    ("comments", generate_comments, True),
+    ("logins", generate_logins, True),
+    ("advertisers", generate_advertisers, True),
+    ("daily_pay", generate_daily_pay, True),
+    ("transactions", generate_transactions, True),
+    ("user_records", generate_user_records, True),
+    ("monthly_active", generate_monthly_active, False),
+]
+
+
+# Each table draws from its own table_rng stream, so tables are independent:
+# any subset can be generated, in any order or in parallel
+def generate_table(name, output_dir, scale, row_group_size):
+    """Generate and write one table; returns ``(name, row count, changed, progress lines)``.
+
+    Runs in a worker process, so the table's progress lines are captured and
+    printed by the parent.
+    """
+    generate, chunked = next((generate, chunked) for table, generate, chunked in TABLES if table == name)
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        chunks = table_chunks(generate, table_rng(name), scale, CHUNK_ROWS, chunked)
+        count, changed = write_table(output_dir, name, chunks, row_group_size)
+    return name, count, changed, log.getvalue()
+
+
+def generate_tables(output_dir, scale, row_group_size, jobs, names):
+    """Generate the tables in ``names``, up to ``jobs`` at a time.
+
+    No generator reads another table's output, so the tables need no
+    ordering; progress is printed in TABLES order whatever finishes first.
+    """
+    position = {name: i for i, (name, _, _) in enumerate(TABLES, 1)}
+    names = [name for name, _, _ in TABLES if name in names]
+
+    def report(name, count, changed, log):
+        print(f"\n[{position[name]}/{len(TABLES)}] Generating {name}.parquet...")
+        print(log, end="")
+        print(f"   Created {count:,} rows" if changed else f"   Unchanged ({count:,} rows), file kept")
+
+    if jobs <= 1:
+        for name in names:
+            report(*generate_table(name, output_dir, scale, row_group_size))
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # Wait in table order, so the output reads the same as a -j 1 run
+        futures = [pool.submit(generate_table, name, output_dir, scale, row_group_size) for name in names]
+        for future in futures:
+            report(*future.result())
+
+
 def main():
     """Generate all datasets with comprehensive edge cases."""
+    parser = argparse.ArgumentParser(description="Generate the pack_meta_interview datasets")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Background volume multiplier (default: 1, the shipped pack)")
+    parser.add_argument("--output-dir", type=Path,
+                        help="Output directory (default: the pack at --scale 1, "
+                             ".cache/packs/pack_meta_interview-x<N> otherwise)")
+    parser.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE,
+                        help=f"Rows per Parquet row group (default: {ROW_GROUP_SIZE:,})")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Tables generated in parallel processes (default: CPU count)")
+    parser.add_argument("--only", metavar="TABLE,...",
+                        help="Regenerate only these tables (comma-separated); the others are left as they are")
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error("--scale must be at least 1")
+    if args.row_group_size < 1:
+        parser.error("--row-group-size must be at least 1")
+    tables = [name for name, _, _ in TABLES]
+    names = tables
+    if args.only:
+        names = [name.strip() for name in args.only.split(",") if name.strip()]
+        unknown = sorted(set(names) - set(tables))
+        if unknown:
+            parser.error(f"unknown table(s): {', '.join(unknown)} (choose from {', '.join(tables)})")
+
+    output_dir = args.output_dir or (
+        OUTPUT_DIR if args.scale == 1 else SCALED_DIR / f"pack_meta_interview-x{args.scale}"
+    )
+    missing = [name for name in tables if name not in names and not (output_dir / f"{name}.parquet").exists()]
+    if missing:
+        parser.error(f"--only needs the other tables in {output_dir}; missing: {', '.join(missing)}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if output_dir.resolve() != OUTPUT_DIR.resolve():
+        # A runnable pack: test-solutions-duckdb.py --pack <output_dir>
+        pack_json = output_dir / "pack.json"
+        if not (pack_json.exists() and filecmp.cmp(OUTPUT_DIR / "pack.json", pack_json, shallow=False)):
+            shutil.copy(OUTPUT_DIR / "pack.json", pack_json)
+
+    print("=" * 70)
+    print("Meta Interview Pack v3 - Comprehensive Data Generator")
+    if args.scale > 1:
+        print(f"Scale: {args.scale}x background volume")
+    print("=" * 70)
 
-    # Generate all tables
-    generate_users()
-    generate_posts()
-    generate_actions()
-    generate_pages()
-    generate_page_likes()
-    generate_events()
-    generate_event_attendance()
-    generate_friendships()
-    generate_signups()
-    generate_calls()
-    generate_messenger_activity()
-    generate_comments()
-    generate_logins()
-    generate_advertisers()
-    generate_daily_pay()
-    generate_transactions()
-    generate_user_records()
-    generate_monthly_active()
+    # Generate all tables, streaming each one to disk chunk by chunk
+    generate_tables(output_dir, args.scale, args.row_group_size, args.jobs, names)
 
     # Summary
     print("\n" + "=" * 70)
     print("Dataset Generation Complete!")
     print("=" * 70)
-    print(f"\nOutput directory: {OUTPUT_DIR}")
+    print(f"\nOutput directory: {output_dir}")
 
-    print("\n" + "-" * 70)
-    print("EXPECTED ANSWERS FOR EACH CHALLENGE:")
-    print("-" * 70)
-    print("Q1  (Post Hiatus):       7 users with 2+ posts in 2024")
-    print("Q2  (MAU Retention):     7 users active in both June & July")
-    print("Q3  (CTR):               5 apps (25%, 15%, 5%, 2%, 0%)")
-    print("Q4  (Pages No Likes):    3 pages (IDs 8, 9, 10)")
-    print("Q5  (Friend Recs):       6 user pairs (2+ shared private events)")
-    print("Q6  (Weekly Churn):      4 weeks with varying rates")
-    print("Q7  (Video Call %):      30% (3/10 active users)")
-    print("Q8  (3+ Calls):          5 users")
-    print("Q9  (Histogram):         5 buckets, 30 total users")
-    print("Q10 (Rolling 7-Day):     30 days of November")
-    print("Q11 (Login Streak):      8 users with 5+ day streaks")
-    print("Q12 (Advertiser Status): 20 advertisers with state transitions")
-    print("Q13 (Page Recs):         Top 3 pages per user from friends")
-    print("Q14 (2nd Engagement):    5 categories (excluding 'single')")
-    print("Q15 (Cumulative Rev):    12 months of 2024")
-    print("Q16 (Mutual Friends):    Pairs with 3+ mutual, not friends")
-    print("Q17 (DAU/MAU):           6 months of stickiness ratios")
-    print("Q18 (Deduplicate):       30 unique users")
-    print("Q19 (First Activity):    Users with first date and count")
-    print("Q20 (YoY Growth):        12 months comparing 2023 vs 2024")
+    intact = report_expected_answers(output_dir)
 
     print("\n" + "-" * 70)
     print("KEY EDGE CASES ADDED:")
@@ -1538,12 +1728,14 @@ def main():
 
     # List generated files
     print("\nGenerated files:")
-    for f in sorted(os.listdir(OUTPUT_DIR)):
+    for f in sorted(os.listdir(output_dir)):
         if f.endswith(".parquet"):
-            path = OUTPUT_DIR / f
+            path = output_dir / f
             size = os.path.getsize(path)
             print(f"  {f}: {size:,} bytes")
 
+    return 0 if intact else 1
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
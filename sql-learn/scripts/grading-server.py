@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Grade submissions through a local HTTP API backed by warm DuckDB connections.
+
+This script:
+1. Opens each pack's cached database read-only once, with a pool of
+   connections per pack, so no request loads data and no submission can
+   modify the datasets or read files on the host (external access is off)
+2. Grades POST /grade requests concurrently, one pooled connection per
+   request, and answers with grader.ts's GradeResult
+3. Caches verdicts keyed on the normalized SQL (see harness/sqltext.py):
+   resubmissions that differ only in whitespace, comments or trailing
+   semicolons are answered without running a query, and identical
+   submissions arriving together are graded once
+4. Estimates each new query's cost from its EXPLAIN plan first
+   (harness/precheck.py): queries that can't finish within the time budget
+   are rejected without running, and queries estimated to take a large
+   share of it wait for a slow lane of a quarter of the pack's connections,
+   so they can't hold up the fast ones
+5. Reports request counts, cache hit rate, throughput and latency
+   percentiles at GET /metrics, and prints them on shutdown
+
+Endpoints:
+    POST /grade    {"pack_id": "...", "challenge_id": "...", "sql": "..."}
+                   -> {"pass", "checks", "stats", "cached", "pack_id", "challenge_id"}
+    GET  /metrics  Request, cache, throughput and latency counters
+    GET  /health   {"status": "ok", "packs": [...]}
+
+Packs are read once at startup; restart the server after editing a pack.
+Verdicts that hit the time budget are not cached, since they depend on load.
+The server is meant for local use and has no authentication.
+
+Usage:
+    python scripts/grading-server.py [--pack DIR ...] [--host HOST] [--port PORT | --socket PATH]
+                                     [--workers N] [--cache-size N] [--timeout-ms MS] [--no-precheck]
+                                     [--verbose]
+
+Examples:
+    python scripts/grading-server.py                                   # Every pack on 127.0.0.1:8787
+    python scripts/grading-server.py --pack public/packs/pack_meta_interview --workers 8
+    python scripts/grading-server.py --socket /tmp/sql-learn-grader.sock
+    curl -s localhost:8787/grade -d '{"pack_id": "pack_basics", "challenge_id": "q1_select_all", "sql": "SELECT 1"}'
+    curl -s --unix-socket /tmp/sql-learn-grader.sock http://localhost/metrics
+"""
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from harness.config import config
+from harness.duck import open_read_only
+from harness.grader import clean_sql, grade, is_timeout
+from harness.pack import discover_packs, load_pack, pack_label
+from harness.precheck import estimate_cost
+from harness.sqltext import normalize_sql, statement_count
+from harness.timing import summarize
+
+# ANSI color codes
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+CYAN = '\033[96m'
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+# Latencies kept for the percentiles in /metrics
+LATENCY_WINDOW = 10000
+# Seconds of requests counted in the recent throughput
+THROUGHPUT_WINDOW = 60
+MAX_BODY_BYTES = 1 << 20
+
+
+def open_pack(pack_dir, workers):
+    """Load a pack and open its pool of ``workers`` read-only connections."""
+    pack = load_pack(pack_dir)
+    conn, datasets = open_read_only(pack_dir)
+    pool = queue.Queue()
+    for _ in range(workers):
+        pool.put(conn.cursor())
+    return {
+        'id': pack['id'],
+        'dir': pack_dir,
+        'challenges': {c['id']: c for c in pack['challenges']},
+        'conn': conn,
+        'pool': pool,
+        # At most this many slow queries hold connections at once
+        'slow_lane': threading.Semaphore(max(1, workers // 4)),
+        'workers': workers,
+        'rows': sum(d['rows'] for d in datasets),
+    }
+
+
+def new_metrics():
+    return {
+        'lock': threading.Lock(),
+        'started': time.time(),
+        'requests': 0,
+        'graded': 0,
+        'cache_hits': 0,
+        'rejected': 0,
+        'errors': 0,
+        'timeouts': 0,
+        'precheck_rejected': 0,
+        'slow_lane': 0,
+        'request_ms': deque(maxlen=LATENCY_WINDOW),
+        'grade_ms': deque(maxlen=LATENCY_WINDOW),
+        'wait_ms': deque(maxlen=LATENCY_WINDOW),
+        'recent': deque(),
+    }
+
+
+def record(metrics, **counts):
+    """Add to the counters in ``counts``; ``*_ms`` keys are latency samples."""
+    with metrics['lock']:
+        for key, value in counts.items():
+            if key.endswith('_ms'):
+                metrics[key].append(value)
+            else:
+                metrics[key] += value
+
+
+def metrics_snapshot(state):
+    """JSON-ready view of the metrics, with throughput and latency percentiles."""
+    metrics = state['metrics']
+    now = time.time()
+    with metrics['lock']:
+        recent = metrics['recent']
+        while recent and recent[0] < now - THROUGHPUT_WINDOW:
+            recent.popleft()
+        uptime = now - metrics['started']
+        snapshot = {
+            'uptime_s': round(uptime, 3),
+            'requests': metrics['requests'],
+            'graded': metrics['graded'],
+            'cache_hits': metrics['cache_hits'],
+            'cache_hit_rate': round(metrics['cache_hits'] / metrics['requests'], 4) if metrics['requests'] else 0.0,
+            'rejected': metrics['rejected'],
+            'errors': metrics['errors'],
+            'timeouts': metrics['timeouts'],
+            'precheck_rejected': metrics['precheck_rejected'],
+            'slow_lane': metrics['slow_lane'],
+            'throughput_rps': round(metrics['requests'] / uptime, 3) if uptime else 0.0,
+            'recent_throughput_rps': round(len(recent) / min(THROUGHPUT_WINDOW, uptime or 1), 3),
+            'latency': {
+                key: {k: round(v, 3) for k, v in summarize(list(metrics[key])).items()}
+                for key in ('request_ms', 'grade_ms', 'wait_ms')
+            },
+        }
+    with state['verdicts']['lock']:
+        snapshot['cached_verdicts'] = len(state['verdicts']['entries'])
+    snapshot['packs'] = {
+        pack_id: {'workers': p['workers'], 'idle': p['pool'].qsize(), 'challenges': len(p['challenges'])}
+        for pack_id, p in state['packs'].items()
+    }
+    return snapshot
+
+
+def new_verdict_cache(size):
+    return {'lock': threading.Lock(), 'entries': OrderedDict(), 'size': size}
+
+
+def cached_verdict(cache, key, compute):
+    """Return ``(verdict, cached)`` for ``key``, calling ``compute()`` on a miss.
+
+    Entries are futures, so concurrent requests for a key being graded wait
+    for that grading instead of starting their own. Least recently used
+    entries are evicted past the cache size; ``compute`` may return
+    ``(verdict, False)`` to keep a verdict out of the cache.
+    """
+    with cache['lock']:
+        future = cache['entries'].get(key)
+        owner = future is None
+        if owner:
+            future = cache['entries'][key] = Future()
+        else:
+            cache['entries'].move_to_end(key)
+    if not owner:
+        return future.result(), True
+
+    try:
+        verdict, keep = compute()
+    except BaseException as e:
+        with cache['lock']:
+            cache['entries'].pop(key, None)
+        future.set_exception(e)
+        raise
+    with cache['lock']:
+        if not keep or cache['size'] <= 0:
+            cache['entries'].pop(key, None)
+        while len(cache['entries']) > cache['size']:
+            cache['entries'].popitem(last=False)
+    future.set_result(verdict)
+    return verdict, False
+
+
+def grade_submission(state, pack, challenge, sql):
+    """Grade ``sql`` on a pooled connection of ``pack``; returns ``(verdict, cacheable)``.
+
+    The query's cost is estimated first: queries over the time budget get a
+    timeout verdict without running, and slow ones wait for the slow lane.
+    """
+    if statement_count(sql) != 1:
+        message = "Submit exactly one SQL statement"
+        return {'pass': False, 'checks': [{'name': 'execution_error', 'pass': False, 'message': message}],
+                'stats': {'elapsedMs': 0, 'rowsReturned': 0}}, True
+
+    tests = challenge.get('tests', [])
+    waited = time.perf_counter()
+    cursor = pack['pool'].get()
+    try:
+        estimate = estimate_cost(cursor, clean_sql(sql), state['timeout_ms']) if state['precheck'] else None
+        verdict_of = estimate['verdict'] if estimate else 'ok'
+        if verdict_of == 'slow':
+            # Give the connection back and queue for the slow lane
+            pack['pool'].put(cursor)
+            cursor = None
+            with pack['slow_lane']:
+                cursor = pack['pool'].get()
+                started = time.perf_counter()
+                verdict = grade(cursor, sql, tests, state['timeout_ms'], state['max_rows'])
+        else:
+            started = time.perf_counter()
+            # A rejected query is explained again by grade(), which then doesn't run it
+            verdict = grade(cursor, sql, tests, state['timeout_ms'], state['max_rows'],
+                            precheck=verdict_of == 'reject')
+    finally:
+        if cursor is not None:
+            pack['pool'].put(cursor)
+
+    timed_out = verdict_of != 'reject' and any(is_timeout(c.get('message')) for c in verdict['checks'])
+    record(state['metrics'], graded=1, timeouts=int(timed_out), precheck_rejected=int(verdict_of == 'reject'),
+           slow_lane=int(verdict_of == 'slow'),
+           wait_ms=(started - waited) * 1000, grade_ms=(time.perf_counter() - started) * 1000)
+    # Estimates don't depend on load, so rejections are cached like any verdict
+    return verdict, not timed_out
+
+
+def handle_grade(state, body):
+    """Answer a POST /grade body; returns ``(http_status, payload)``."""
+    try:
+        request = json.loads(body)
+        pack_id, challenge_id, sql = request['pack_id'], request['challenge_id'], request['sql']
+    except (ValueError, TypeError, KeyError):
+        return 400, {'error': "Expected a JSON object with pack_id, challenge_id and sql"}
+    if not isinstance(sql, str) or not sql.strip():
+        return 400, {'error': "sql must be a non-empty string"}
+
+    pack = state['packs'].get(pack_id)
+    if pack is None:
+        return 404, {'error': f"Unknown pack: {pack_id}"}
+    challenge = pack['challenges'].get(challenge_id)
+    if challenge is None:
+        return 404, {'error': f"Unknown challenge: {pack_id}/{challenge_id}"}
+
+    key = (pack_id, challenge_id, normalize_sql(sql))
+    try:
+        verdict, cached = cached_verdict(
+            state['verdicts'], key, lambda: grade_submission(state, pack, challenge, sql)
+        )
+    except Exception as e:
+        # grade() reports SQL errors as checks; anything else is the server's fault
+        record(state['metrics'], errors=1)
+        return 500, {'error': f"Grading failed: {type(e).__name__}: {e}"}
+    if cached:
+        record(state['metrics'], cache_hits=1)
+    return 200, {'pack_id': pack_id, 'challenge_id': challenge_id, 'cached': cached, **verdict}
+
+
+class GradingHandler(BaseHTTPRequestHandler):
+    server_version = "sql-learn-grader/1.0"
+    # Keep-alive: clients grading many submissions reuse one connection
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path == '/metrics':
+            self.send_json(200, metrics_snapshot(state))
+        elif self.path == '/health':
+            self.send_json(200, {'status': 'ok', 'packs': sorted(state['packs'])})
+        else:
+            self.send_json(404, {'error': f"Not found: {self.path}"})
+
+    def do_POST(self):
+        state = self.server.state
+        started = time.perf_counter()
+        length = int(self.headers.get('Content-Length') or 0)
+        if self.path != '/grade':
+            self.rfile.read(length)
+            self.send_json(404, {'error': f"Not found: {self.path}"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            status, payload = 413, {'error': f"Request body over {MAX_BODY_BYTES} bytes"}
+        else:
+            status, payload = handle_grade(state, self.rfile.read(length))
+        self.send_json(status, payload)
+
+        metrics = state['metrics']
+        record(metrics, requests=1, rejected=int(status != 200), request_ms=(time.perf_counter() - started) * 1000)
+        with metrics['lock']:
+            metrics['recent'].append(time.time())
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.state['verbose']:
+            super().log_message(format, *args)
+
+
+class UnixGradingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def start_server(state, args):
+    """Bind the HTTP server to ``--socket`` or ``--host``/``--port``; returns ``(server, address)``."""
+    if args.socket:
+        if args.socket.exists():
+            args.socket.unlink()
+        server = UnixGradingServer(str(args.socket), GradingHandler)
+        address = f"unix:{args.socket}"
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), GradingHandler)
+        server.daemon_threads = True
+        address = f"http://{args.host}:{server.server_address[1]}"
+    server.state = state
+    return server, address
+
+
+def print_metrics(state):
+    snapshot = metrics_snapshot(state)
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}METRICS{RESET}")
+    print(f"{CYAN}{'='*60}{RESET}")
+    print(f"Requests: {snapshot['requests']} in {snapshot['uptime_s']:.1f}s "
+          f"({snapshot['throughput_rps']:.1f}/s)")
+    print(f"Graded: {snapshot['graded']}, cache hits: {snapshot['cache_hits']} "
+          f"({snapshot['cache_hit_rate']:.0%}), rejected: {snapshot['rejected']}, errors: {snapshot['errors']}, "
+          f"timeouts: {snapshot['timeouts']}")
+    print(f"Pre-check: {snapshot['precheck_rejected']} rejected, {snapshot['slow_lane']} sent to the slow lane")
+    for key, label in (('request_ms', 'Request'), ('grade_ms', 'Grading'), ('wait_ms', 'Pool wait')):
+        stats = snapshot['latency'][key]
+        print(f"{label + ' latency:':<20} p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+              f"max {stats['max_ms']:.2f} ms")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Grade submissions over a local HTTP API.")
+    parser.add_argument('--pack', action='append', type=Path, dest='packs', metavar='DIR',
+                        help="Pack directory to serve (repeatable; default: every pack)")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8787, help="Port to listen on, 0 for any (default: 8787)")
+    parser.add_argument('--socket', type=Path, metavar='PATH', help="Listen on a Unix socket instead of TCP")
+    parser.add_argument('--workers', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Pooled connections per pack, i.e. concurrent gradings (default: CPU count)")
+    parser.add_argument('--cache-size', type=int, default=10000,
+                        help="Verdicts kept in the cache, 0 to disable (default: 10000)")
+    parser.add_argument('--timeout-ms', type=int, default=config['limits']['timeoutMs'],
+                        help="Per-query time budget, 0 to disable (default: timeoutMs from app/config.json)")
+    parser.add_argument('--no-precheck', action='store_true',
+                        help="Run every query instead of rejecting ones estimated to exceed the time budget")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Log every request")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    packs = {}
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Grading server{RESET}")
+    print(f"{CYAN}{'='*60}{RESET}")
+    for pack_dir in args.packs or discover_packs():
+        try:
+            pack = open_pack(pack_dir, args.workers)
+        except RuntimeError as e:
+            print(f"{RED}✗ {pack_label(pack_dir)}: {e}{RESET}")
+            sys.exit(1)
+        if pack['id'] in packs:
+            # public/packs is discovered first and wins over app/packs
+            print(f"{YELLOW}⚠ Skipping {pack_label(pack_dir)}: pack id {pack['id']} is already served{RESET}")
+            pack['conn'].close()
+            continue
+        packs[pack['id']] = pack
+        print(f"{GREEN}✓{RESET} {pack['id']}: {len(pack['challenges'])} challenges, "
+              f"{pack['rows']} rows ({pack_label(pack_dir)})")
+
+    state = {
+        'packs': packs,
+        'verdicts': new_verdict_cache(args.cache_size),
+        'metrics': new_metrics(),
+        'timeout_ms': args.timeout_ms,
+        'max_rows': config['limits']['maxRowsLoadedPerPack'],
+        'precheck': not args.no_precheck and bool(args.timeout_ms),
+        'verbose': args.verbose,
+    }
+    server, address = start_server(state, args)
+    print(f"\n{CYAN}Listening on {address} with {args.workers} connections per pack (Ctrl-C to stop){RESET}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and args.socket.exists():
+            args.socket.unlink()
+        print_metrics(state)
+        for pack in packs.values():
+            pack['conn'].close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the Python pack scripts (test harness, test authoring tools).
+
+Run the scripts from the repo as usual (``python scripts/<name>.py``); the
+``scripts`` directory is then on ``sys.path`` and this package is importable.
+"""
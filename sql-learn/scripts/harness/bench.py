@@ -0,0 +1,52 @@
+"""
+Repeated timing of challenge solutions and assertions.
+"""
+
+from .grader import drop_result, run_solution, run_test
+from .timing import summarize, timed
+
+
+def bench_challenge(conn, challenge, runs=10, warmup=2, timeout_ms=None):
+    """Time a challenge's solution and assertions over ``runs`` runs after ``warmup`` runs.
+
+    Returns ``{'solution': stats, 'assertions': stats, 'tests': [...]}`` where
+    stats are ``timing.summarize`` dicts, ``assertions`` covers all of the
+    challenge's tests together and ``tests`` holds ``{'name', 'assert', **stats}``
+    per test. Returns ``{'error': message}`` if the solution fails.
+    """
+    solution_sql = challenge.get('solution_sql', '')
+    if not solution_sql:
+        return {'error': 'No solution'}
+
+    tests = challenge.get('tests', [])
+    solution_ms = []
+    assertion_ms = []
+    test_ms = [[] for _ in tests]
+    for i in range(warmup + runs):
+        with timed() as solution_timing:
+            result, error = run_solution(conn, solution_sql, timeout_ms)
+        if error:
+            return {'error': error}
+
+        timings = []
+        with timed() as assertion_timing:
+            for test in tests:
+                with timed() as test_timing:
+                    run_test(conn, test, solution_sql, result, timeout_ms)
+                timings.append(test_timing['wall_ms'])
+        drop_result(conn, result)
+
+        if i >= warmup:
+            solution_ms.append(solution_timing['wall_ms'])
+            assertion_ms.append(assertion_timing['wall_ms'])
+            for samples, ms in zip(test_ms, timings):
+                samples.append(ms)
+
+    return {
+        'solution': summarize(solution_ms),
+        'assertions': summarize(assertion_ms),
+        'tests': [
+            {'name': test.get('name', ''), 'assert': test.get('assert', ''), **summarize(samples)}
+            for test, samples in zip(tests, test_ms)
+        ],
+    }
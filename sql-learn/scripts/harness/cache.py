@@ -0,0 +1,135 @@
+"""
+Persistent cache of challenge test results.
+
+A challenge's result is reused while nothing that could change it has
+changed. The cache key covers its ``solution_sql`` and ``tests``, the content
+hashes of the parquet files it reads, the DuckDB version, the grader source
+and the run's ``--timeout-ms`` and ``--precheck`` (with the pre-check's
+source), so a verdict reached under one time budget isn't replayed under
+another. Results live in one JSON file per pack under
+``sql-learn/.cache/results/``.
+
+The challenge -> tables index, used to load only the datasets the selected
+challenges read, is cached next to the pack's database in
+``sql-learn/.cache/duckdb/``, keyed on pack.json and the dataset names.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import duckdb
+
+from .duck import CACHE_DIR, cache_path, file_digest, parquet_files
+from .pack import challenge_tables
+
+RESULTS_DIR = CACHE_DIR.parent / "results"
+TABLE_INDEX_SUFFIX = ".tables.json"
+# Grading logic changes invalidate every cached result
+GRADER_DIGEST = file_digest(Path(__file__).resolve().parent / "grader.py")
+PRECHECK_DIGEST = file_digest(Path(__file__).resolve().parent / "precheck.py")
+
+
+def results_path(pack_dir, cache_dir=RESULTS_DIR):
+    return Path(cache_dir) / cache_path(pack_dir).with_suffix(".json").name
+
+
+def load_result_cache(pack_dir, cache_dir=RESULTS_DIR):
+    """Load a pack's result cache from ``cache_dir`` (empty if missing or unreadable)."""
+    try:
+        with open(results_path(pack_dir, cache_dir), 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache.setdefault('files', {})
+    cache.setdefault('results', {})
+    return cache
+
+
+def save_result_cache(pack_dir, cache, cache_dir=RESULTS_DIR):
+    path = results_path(pack_dir, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(cache, f)
+    tmp.replace(path)
+
+
+def dataset_hashes(pack_dir, cache):
+    """SHA-256 of each parquet file, re-hashing only files whose size/mtime changed."""
+    files = {}
+    for parquet_file in parquet_files(pack_dir):
+        stat = parquet_file.stat()
+        known = cache['files'].get(parquet_file.stem)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            files[parquet_file.stem] = known
+        else:
+            files[parquet_file.stem] = [stat.st_size, stat.st_mtime_ns, file_digest(parquet_file)]
+    cache['files'] = files
+    return {name: entry[2] for name, entry in files.items()}
+
+
+def challenge_key(challenge, hashes, timeout_ms=None, precheck=False):
+    """Cache key for a challenge given the pack's ``dataset_hashes`` and the run's grading options."""
+    tables = sorted(challenge_tables(challenge, hashes))
+    payload = json.dumps({
+        'solution_sql': challenge.get('solution_sql', ''),
+        'tests': challenge.get('tests', []),
+        'datasets': {name: hashes[name] for name in tables},
+        'duckdb': duckdb.__version__,
+        'grader': GRADER_DIGEST,
+        'timeout_ms': timeout_ms or None,
+        # The pre-check only runs with a time budget
+        'precheck': PRECHECK_DIGEST if precheck and timeout_ms else None,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def table_index(pack_dir):
+    """``{challenge_id: sorted dataset tables}`` for every challenge of the pack.
+
+    Built with ``challenge_tables`` and cached until pack.json, the set of
+    parquet files or the DuckDB version (its parser) changes.
+    """
+    pack_json = Path(pack_dir) / "pack.json"
+    table_names = [f.stem for f in parquet_files(pack_dir)]
+    key = hashlib.sha256(json.dumps({
+        'pack': file_digest(pack_json),
+        'tables': table_names,
+        'duckdb': duckdb.__version__,
+    }, sort_keys=True).encode()).hexdigest()
+
+    path = cache_path(pack_dir).with_suffix(TABLE_INDEX_SUFFIX)
+    try:
+        with open(path, 'r') as f:
+            cached = json.load(f)
+        if cached.get('key') == key:
+            return cached['challenges']
+    except (OSError, ValueError):
+        pass
+
+    with open(pack_json, 'r') as f:
+        pack = json.load(f)
+    index = {c['id']: sorted(challenge_tables(c, table_names)) for c in pack['challenges']}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'w') as f:
+        json.dump({'key': key, 'challenges': index}, f, indent=2)
+    tmp.replace(path)
+    return index
+
+
+def needed_tables(index, challenges):
+    """Union of the index's tables for ``challenges``."""
+    return set().union(*(index.get(c['id'], ()) for c in challenges))
+
+
+def cached_result(cache, challenge_id, key):
+    entry = cache['results'].get(challenge_id)
+    if entry and entry['key'] == key:
+        return entry['result']
+    return None
+
+
+def store_result(cache, challenge_id, key, result):
+    cache['results'][challenge_id] = {'key': key, 'result': result}
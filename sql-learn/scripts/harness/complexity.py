@@ -0,0 +1,92 @@
+"""
+Empirical growth classes of query latency.
+
+Latency is modelled as ``t(n) = c + a * n**k``: ``c`` absorbs the fixed
+per-query cost (parsing, planning, result transfer) that dominates on small
+packs, and the exponent ``k`` is what is left once the data gets bigger. The
+fit is a grid search over ``k`` with a least-squares fit of ``c`` and ``a``
+at each step, weighted by relative error so the small-scale points count as
+much as the large ones.
+
+Over a 1000x sweep an ``n log n`` query fits an exponent of about 1.1-1.2,
+so it is reported as ``linear``; only exponents of 1.4 and up are flagged.
+"""
+
+EXPONENTS = [i / 100 for i in range(0, 401, 5)]
+
+# (upper bound of the exponent, class name)
+CLASSES = [
+    (0.5, 'constant'),
+    (1.4, 'linear'),
+    (1.75, 'n^1.5'),
+    (2.5, 'quadratic'),
+    (float('inf'), 'cubic+'),
+]
+SUPER_LINEAR_EXPONENT = 1.4
+
+# Latency that doesn't grow at least this much over the sweep is overhead
+# and timer noise; its fitted exponent means nothing
+MIN_GROWTH = 5.0
+
+
+def _fit_fixed_exponent(rows, ms, k):
+    """Weighted least squares of ``c + a * n**k`` (c, a >= 0); returns (error, c, a)."""
+    xs = [n ** k for n in rows]
+    w = [1 / (t * t) for t in ms]
+    sw = sum(w)
+    swx = sum(wi * x for wi, x in zip(w, xs))
+    swxx = sum(wi * x * x for wi, x in zip(w, xs))
+    swt = sum(wi * t for wi, t in zip(w, ms))
+    swxt = sum(wi * x * t for wi, x, t in zip(w, xs, ms))
+
+    det = sw * swxx - swx * swx
+    c = a = None
+    if det > 0:
+        c = (swxx * swt - swx * swxt) / det
+        a = (sw * swxt - swx * swt) / det
+    if c is None or c < 0 or a < 0:
+        # Fall back to whichever single term fits better
+        candidates = [(0.0, swxt / swxx if swxx else 0.0), (swt / sw, 0.0)]
+    else:
+        candidates = [(c, a)]
+
+    best = None
+    for c, a in candidates:
+        error = sum(wi * (c + a * x - t) ** 2 for wi, x, t in zip(w, xs, ms))
+        if best is None or error < best[0]:
+            best = (error, c, a)
+    return best
+
+
+def growth_exponent(points):
+    """Fit ``(rows, ms)`` points; returns ``{'exponent', 'fixed_ms', 'growth'}``.
+
+    ``growth`` is the ratio of the slowest to the fastest latency. Needs at
+    least three points with distinct row counts.
+    """
+    points = sorted((n, t) for n, t in points if n > 0 and t > 0)
+    if len({n for n, _ in points}) < 3:
+        raise ValueError("Need at least three distinct dataset sizes")
+    rows = [n for n, _ in points]
+    ms = [t for _, t in points]
+
+    best = None
+    for k in EXPONENTS:
+        error, c, a = _fit_fixed_exponent(rows, ms, k)
+        if best is None or error < best[0]:
+            best = (error, k, c)
+    return {'exponent': best[1], 'fixed_ms': best[2], 'growth': max(ms) / min(ms)}
+
+
+def classify(points):
+    """Growth class of ``(rows, ms)`` points.
+
+    Returns ``growth_exponent``'s dict plus ``'class'`` and ``'super_linear'``.
+    Latency that grows less than ``MIN_GROWTH``x over the sweep is
+    ``'constant'`` whatever its fitted exponent.
+    """
+    fit = growth_exponent(points)
+    if fit['growth'] < MIN_GROWTH:
+        return {**fit, 'class': 'constant', 'super_linear': False}
+    name = next(name for bound, name in CLASSES if fit['exponent'] < bound)
+    return {**fit, 'class': name, 'super_linear': fit['exponent'] >= SUPER_LINEAR_EXPONENT}
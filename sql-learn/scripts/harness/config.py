@@ -0,0 +1,17 @@
+"""
+App configuration shared with the browser (``app/config.json``).
+"""
+
+import json
+
+from .pack import ROOT_DIR
+
+CONFIG_PATH = ROOT_DIR / "app" / "config.json"
+
+
+def load_config():
+    with open(CONFIG_PATH, 'r') as f:
+        return json.load(f)
+
+
+config = load_config()
@@ -0,0 +1,303 @@
+"""
+DuckDB connection and dataset loading for pack directories.
+
+Each dataset is registered either as a table (the parquet file is imported
+once) or as a view over ``read_parquet`` (nothing is decoded until a query
+touches it, and then only the columns and row groups it needs).
+
+Tables are imported into a cached ``.duckdb`` file per pack under
+``sql-learn/.cache/duckdb/``. Each table is fingerprinted by the size, mtime
+and SHA-256 of its parquet file, so an unchanged pack opens without importing
+anything and an edited file only rebuilds its own table.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import duckdb
+
+from .pack import table_references
+from .timing import timed
+
+CACHE_DIR = Path(__file__).resolve().parent.parent.parent / ".cache" / "duckdb"
+META_TABLE = "_dataset_cache"
+
+LOAD_MODES = ('tables', 'views', 'auto')
+
+# --load=auto: files at least this big are left as views unless enough of the
+# selected challenges read them to pay back a full import
+AUTO_VIEW_MIN_BYTES = 8 * 1024 * 1024
+AUTO_TABLE_MIN_REFERENCES = 3
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(pack_dir):
+    """Cache file for a pack, unique per pack directory (app/ and public/ packs share ids)."""
+    pack_dir = Path(pack_dir).resolve()
+    dir_hash = hashlib.sha1(str(pack_dir).encode()).hexdigest()[:8]
+    return CACHE_DIR / f"{pack_dir.name}-{dir_hash}.duckdb"
+
+
+def parquet_files(pack_dir):
+    return sorted(Path(pack_dir).glob("*.parquet"))
+
+
+def _sql_str(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def load_strategies(pack_dir, mode, challenges=()):
+    """Decide per dataset whether to load it as a ``'table'`` or a ``'view'``.
+
+    ``tables`` and ``views`` apply to every dataset. ``auto`` uses a view for
+    datasets none of ``challenges`` read, and for large files read by only a
+    few of them; everything else becomes a table.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode: {mode}")
+
+    files = parquet_files(pack_dir)
+    if mode != 'auto':
+        kind = 'table' if mode == 'tables' else 'view'
+        return {f.stem: kind for f in files}
+
+    references = table_references(challenges, [f.stem for f in files])
+    strategies = {}
+    for f in files:
+        refs = references[f.stem]
+        large = f.stat().st_size >= AUTO_VIEW_MIN_BYTES
+        use_view = refs == 0 or (large and refs < AUTO_TABLE_MIN_REFERENCES)
+        strategies[f.stem] = 'view' if use_view else 'table'
+    return strategies
+
+
+def _create_dataset(conn, table_name, parquet_file, kind):
+    source = f"SELECT * FROM read_parquet({_sql_str(parquet_file)})"
+    if kind == 'view':
+        conn.execute(f"CREATE OR REPLACE VIEW {table_name} AS {source}")
+    else:
+        conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS {source}")
+    # A view's COUNT(*) is answered from the parquet footer
+    return conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+
+
+def load_datasets(conn, pack_dir, strategies=None, tables=None):
+    """Register the parquet files of the pack in ``conn``.
+
+    ``strategies`` maps table names to ``'table'`` or ``'view'`` (default:
+    ``'table'``). ``tables`` limits loading to those datasets (default:
+    all). Returns a list of ``{'table', 'rows', 'kind', 'status', 'wall_ms',
+    'cpu_ms'}`` dicts, in file order.
+    """
+    strategies = strategies or {}
+    datasets = []
+    for parquet_file in parquet_files(pack_dir):
+        table_name = parquet_file.stem
+        if tables is not None and table_name not in tables:
+            continue
+        kind = strategies.get(table_name, 'table')
+        with timed() as timing:
+            row_count = _create_dataset(conn, table_name, parquet_file, kind)
+        datasets.append({'table': table_name, 'rows': row_count, 'kind': kind, 'status': 'loaded', **timing})
+    return datasets
+
+
+def _drop_dataset(conn, table_name, kind):
+    conn.execute(f"DROP {'VIEW' if kind == 'view' else 'TABLE'} IF EXISTS {table_name}")
+
+
+def _sync_dataset(conn, parquet_file, kind, entry):
+    """Reuse, create or rebuild one dataset of a cached database.
+
+    ``entry`` is the dataset's row in the metadata table (without its name),
+    or None if it isn't cached yet.
+    """
+    table_name = parquet_file.stem
+    stat = parquet_file.stat()
+    same_kind = entry is not None and entry[4] == kind
+
+    if same_kind and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+        return {'table': table_name, 'rows': entry[3], 'kind': kind, 'status': 'cached'}
+
+    # mtime or size changed: only re-import a table when the content did too
+    sha256 = file_digest(parquet_file) if kind == 'table' else None
+    if same_kind and kind == 'table' and entry[2] == sha256:
+        conn.execute(f"UPDATE {META_TABLE} SET size = ?, mtime_ns = ? WHERE table_name = ?",
+                     [stat.st_size, stat.st_mtime_ns, table_name])
+        return {'table': table_name, 'rows': entry[3], 'kind': kind, 'status': 'cached'}
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        if entry is not None and not same_kind:
+            _drop_dataset(conn, table_name, entry[4])
+        row_count = _create_dataset(conn, table_name, parquet_file, kind)
+        conn.execute(f"INSERT OR REPLACE INTO {META_TABLE} VALUES (?, ?, ?, ?, ?, ?)",
+                     [table_name, stat.st_size, stat.st_mtime_ns, sha256, row_count, kind])
+        conn.execute("COMMIT")
+    except duckdb.Error:
+        conn.execute("ROLLBACK")
+        raise
+    status = 'rebuilt' if same_kind and kind == 'table' else 'loaded'
+    return {'table': table_name, 'rows': row_count, 'kind': kind, 'status': status}
+
+
+def _sync_cached_datasets(conn, pack_dir, strategies, tables=None):
+    """Bring the datasets in a cached database in line with the pack's parquet files.
+
+    With ``tables``, other datasets are left as they are (and not imported
+    if they aren't cached yet).
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {META_TABLE} (
+            table_name VARCHAR PRIMARY KEY,
+            size BIGINT,
+            mtime_ns BIGINT,
+            sha256 VARCHAR,
+            row_count BIGINT
+        )
+    """)
+    conn.execute(f"ALTER TABLE {META_TABLE} ADD COLUMN IF NOT EXISTS kind VARCHAR DEFAULT 'table'")
+    cached = {
+        row[0]: row[1:]
+        for row in conn.execute(
+            f"SELECT table_name, size, mtime_ns, sha256, row_count, kind FROM {META_TABLE}"
+        ).fetchall()
+    }
+
+    datasets = []
+    seen = set()
+    for parquet_file in parquet_files(pack_dir):
+        table_name = parquet_file.stem
+        seen.add(table_name)
+        if tables is not None and table_name not in tables:
+            continue
+        kind = strategies.get(table_name, 'table')
+        with timed() as timing:
+            dataset = _sync_dataset(conn, parquet_file, kind, cached.get(table_name))
+        datasets.append({**dataset, **timing})
+
+    # Parquet files that were removed from the pack
+    for table_name in set(cached) - seen:
+        _drop_dataset(conn, table_name, cached[table_name][4])
+        conn.execute(f"DELETE FROM {META_TABLE} WHERE table_name = ?", [table_name])
+
+    return datasets
+
+
+def refresh_datasets(conn, pack_dir, tables, strategies=None):
+    """Re-register ``tables`` of an open pack database after their parquet files changed.
+
+    Works on both cached and in-memory databases; tables whose file is gone
+    are dropped. Returns ``load_datasets``-style dicts for the tables that
+    still exist.
+    """
+    strategies = strategies or {}
+    has_meta = conn.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = ?", [META_TABLE]
+    ).fetchone()[0] > 0
+    cached = {}
+    if has_meta:
+        cached = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                f"SELECT table_name, size, mtime_ns, sha256, row_count, kind FROM {META_TABLE}"
+            ).fetchall()
+        }
+
+    datasets = []
+    for table_name in sorted(tables):
+        parquet_file = Path(pack_dir) / f"{table_name}.parquet"
+        kind = strategies.get(table_name, 'table')
+        if not parquet_file.exists():
+            entry = cached.get(table_name)
+            _drop_dataset(conn, table_name, entry[4] if entry else kind)
+            if has_meta:
+                conn.execute(f"DELETE FROM {META_TABLE} WHERE table_name = ?", [table_name])
+            continue
+
+        with timed() as timing:
+            if has_meta:
+                dataset = _sync_dataset(conn, parquet_file, kind, cached.get(table_name))
+            else:
+                row_count = _create_dataset(conn, table_name, parquet_file, kind)
+                dataset = {'table': table_name, 'rows': row_count, 'kind': kind, 'status': 'loaded'}
+        datasets.append({**dataset, **timing})
+    return datasets
+
+
+def open_pack_db(pack_dir, use_cache=True, strategies=None, tables=None):
+    """Open a DuckDB connection with the pack's datasets registered.
+
+    ``strategies`` and ``tables`` are as in ``load_datasets``; a cached
+    database may also hold datasets outside ``tables``. With ``use_cache``
+    the pack's cached database is reused and synced (and rebuilt from
+    scratch if this DuckDB version can't read it). If another run holds the
+    cache's lock, the datasets are loaded into memory instead.
+
+    Returns ``(conn, datasets)`` where ``datasets`` is as in ``load_datasets``.
+    """
+    strategies = strategies or {}
+    if use_cache:
+        db_file = cache_path(pack_dir)
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            conn = duckdb.connect(str(db_file))
+        except duckdb.Error as e:
+            if 'lock' in str(e).lower():
+                # Another run holds the cache; don't wait for it
+                conn = None
+            else:
+                # Written by an incompatible DuckDB version: start over
+                os.remove(db_file)
+                conn = duckdb.connect(str(db_file))
+
+        if conn is not None:
+            return conn, _sync_cached_datasets(conn, pack_dir, strategies, tables)
+
+    conn = duckdb.connect(':memory:')
+    return conn, load_datasets(conn, pack_dir, strategies, tables)
+
+
+def open_read_only(pack_dir, sync=True):
+    """Open the pack's cached database read-only, after syncing it.
+
+    Queries on the connection and its cursors can't modify or drop the
+    datasets; temp tables still work. External access is disabled and the
+    configuration locked, so queries can't read or write host files
+    (``read_csv``, ``read_text``, ``glob``, ``COPY``, ``ATTACH``) or switch
+    that back on. Without ``sync`` the cache is opened as it is, for worker
+    processes whose parent already synced it; any number of processes can
+    hold it read-only. Raises ``RuntimeError`` if another run holds the
+    cache's write lock.
+
+    Returns ``(conn, datasets)`` as ``open_pack_db``; without ``sync``,
+    ``datasets`` is empty.
+    """
+    if sync:
+        conn, datasets = open_pack_db(pack_dir)
+        db_path = conn.execute(
+            "SELECT path FROM duckdb_databases() WHERE database_name = current_database()"
+        ).fetchone()[0]
+        conn.close()
+    else:
+        db_path, datasets = str(cache_path(pack_dir)), []
+
+    if db_path is None:
+        # open_pack_db fell back to an in-memory database, which queries could modify
+        raise RuntimeError(f"Can't open {cache_path(pack_dir)} read-only: another run holds its lock")
+    try:
+        conn = duckdb.connect(db_path, read_only=True)
+    except duckdb.Error as e:
+        raise RuntimeError(f"Can't open {db_path} read-only: {e}") from None
+    conn.execute("SET enable_external_access = false")
+    conn.execute("SET lock_configuration = true")
+    return conn, datasets
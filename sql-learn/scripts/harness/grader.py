@@ -0,0 +1,485 @@
+"""
+Challenge grading against a DuckDB connection.
+
+Python counterpart of ``app/lib/grader.ts``, used by the pack scripts.
+
+Results are read with DuckDB's native fetch methods (``fetchone``, cursor
+``description``) so grading never builds a DataFrame; pandas is only imported
+by ``fetch_result`` for printed previews.
+
+Like ``executeQueryWithTimeout`` in the browser, every query can be given a
+time budget: a watchdog timer interrupts the connection when it runs over,
+and the assertion fails with a message starting with ``TIMEOUT_PREFIX``.
+
+SET_EQ and NEAR compare the solution result with the test's expected rows
+inside DuckDB: the expected columns are bound as list parameters and
+unnested next to an explicit row number, so no row is compared in Python
+and no file is read.
+Expected values keep their own JSON types: like grader.ts, a number only
+matches a numeric column (compared as DOUBLE unless both sides are
+integers), a string a text or date/time column (compared as text) and a
+boolean a BOOLEAN column; any other pairing is a mismatch, never a cast.
+
+``grade`` grades a submission end to end and returns grader.ts's
+``GradeResult`` shape, for services that answer the app.
+"""
+
+import threading
+import uuid
+from decimal import Decimal
+
+import duckdb
+
+from .precheck import estimate_cost
+from .profile import last_profile
+from .timing import timed
+
+TIMEOUT_PREFIX = "Timeout"
+
+# Prefix of the temp tables holding solution results. Temp tables are private
+# to a connection; each result gets a fresh name and is dropped once graded
+# (``drop_result``), so a submission can't read an earlier one.
+RESULT_TABLE = "_solution_result"
+
+# Default NEAR tolerance (grader.ts)
+DEFAULT_TOLERANCE = {'abs': 0.0001}
+
+INTEGER_TYPES = ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT',
+                 'UINTEGER', 'UBIGINT', 'UHUGEINT')
+NUMERIC_TYPES = INTEGER_TYPES + ('FLOAT', 'DOUBLE')
+TEXT_TYPES = ('VARCHAR', 'DATE', 'TIME', 'TIMESTAMP', 'TIMESTAMP WITH TIME ZONE', 'TIMESTAMP_S',
+              'TIMESTAMP_MS', 'TIMESTAMP_NS', 'UUID')
+
+
+class QueryTimeout(Exception):
+    def __init__(self, timeout_ms):
+        super().__init__(f"{TIMEOUT_PREFIX}: query exceeded {timeout_ms} ms")
+        self.timeout_ms = timeout_ms
+
+
+def is_timeout(message):
+    """Whether an error/assertion message from this module reports a timeout."""
+    return bool(message) and message.startswith(TIMEOUT_PREFIX)
+
+
+def execute(conn, sql, timeout_ms=None, profiles=None, params=None):
+    """``conn.execute(sql, params)``, interrupted with ``QueryTimeout`` after ``timeout_ms``.
+
+    When ``profiles`` is a list (and profiling is enabled on ``conn``), the
+    query's profile is appended to it.
+    """
+    args = (sql,) if params is None else (sql, params)
+    if not timeout_ms:
+        cursor = conn.execute(*args)
+    else:
+        # The timer can fire after the query returned but before cancel():
+        # it must not interrupt whatever the caller runs next on ``conn``
+        guard = {'lock': threading.Lock(), 'finished': False}
+
+        def interrupt():
+            with guard['lock']:
+                if not guard['finished']:
+                    conn.interrupt()
+
+        watchdog = threading.Timer(timeout_ms / 1000, interrupt)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            cursor = conn.execute(*args)
+        except duckdb.InterruptException:
+            raise QueryTimeout(timeout_ms) from None
+        finally:
+            with guard['lock']:
+                guard['finished'] = True
+            watchdog.cancel()
+
+    if profiles is not None:
+        profiles.append(last_profile(conn))
+    return cursor
+
+
+def clean_sql(sql):
+    """Remove trailing semicolons (matching grader behavior)."""
+    return sql.rstrip(';').strip()
+
+
+def run_solution(conn, solution_sql, timeout_ms=None, profiles=None, precheck=False):
+    """Execute the solution SQL once, materializing its result in a temp table.
+
+    Returns ``(result, error)``; ``result`` is a dict with the ``relation``
+    holding the rows, its ``columns`` and its number of ``rows``. Pass it to
+    ``run_test`` so assertions are evaluated against the stored rows instead
+    of re-running the solution, then to ``drop_result`` before the
+    connection runs anything else.
+
+    The solution gets ``timeout_ms``; on timeout ``error`` is the timeout
+    message. Its profile is appended to ``profiles`` (see ``execute``).
+    With ``precheck``, a query whose estimated cost is over ``timeout_ms``
+    (see ``harness/precheck.py``) isn't run and ``error`` is a timeout
+    message saying why.
+    """
+    sql = clean_sql(solution_sql)
+    if precheck and timeout_ms:
+        estimate = estimate_cost(conn, sql, timeout_ms)
+        if estimate['verdict'] == 'reject':
+            return None, f"{TIMEOUT_PREFIX} (estimated): {estimate['message']}"
+    relation = f"{RESULT_TABLE}_{uuid.uuid4().hex}"
+    try:
+        execute(conn, f"CREATE TEMP TABLE {relation} AS {sql}", timeout_ms, profiles)
+        columns = result_columns(conn, f"SELECT * FROM {relation}")
+        rows = conn.execute(f"SELECT COUNT(*) FROM {relation}").fetchone()[0]
+        return {'relation': relation, 'columns': columns, 'rows': rows}, None
+    except Exception as e:
+        drop_result(conn, {'relation': relation})
+        return None, str(e)
+
+
+def drop_result(conn, result):
+    """Drop a result materialized by ``run_solution`` (no-op for None)."""
+    if result is not None:
+        conn.execute(f"DROP TABLE IF EXISTS {result['relation']}")
+
+
+def fetch_result(conn, result):
+    """Return a materialized solution result as a DataFrame (imports pandas)."""
+    return conn.execute(f"SELECT * FROM {result['relation']}").fetchdf()
+
+
+def result_fingerprint(conn, result, timeout_ms=None, ordered=False):
+    """Fingerprint of a materialized result: column names and types, row count and a sum of row hashes.
+
+    The default ignores row order; ``ordered`` hashes each row with its
+    position, so equal fingerprints mean every test sees the same rows. The
+    column types are part of it: ``hash`` doesn't encode them (an INTEGER
+    and a BIGINT 2 hash alike) and the checks compare values by type.
+    """
+    types = _column_types(conn, result['relation'])
+    columns = ", ".join(_quote(name) for name in result['columns'])
+    if ordered:
+        columns = f"rowid, {columns}"
+    rows, digest = execute(
+        conn, f"SELECT COUNT(*), SUM(hash({columns})::HUGEINT) FROM {result['relation']}", timeout_ms
+    ).fetchone()
+    return f"{types}:{rows}:{digest}"
+
+
+def first_row(conn, sql, timeout_ms=None, profiles=None):
+    """Execute ``sql`` and return its first row as a dict ({} when empty)."""
+    cursor = execute(conn, sql, timeout_ms, profiles)
+    row = cursor.fetchone()
+    if row is None:
+        return {}
+    return {d[0]: value for d, value in zip(cursor.description, row)}
+
+
+def result_columns(conn, sql, timeout_ms=None, profiles=None):
+    """Column names of a query, without fetching its rows."""
+    return [d[0] for d in execute(conn, f"SELECT * FROM ({sql}) LIMIT 0", timeout_ms, profiles).description]
+
+
+def _comparable(actual, expected):
+    """Coerce a fetched value the way the DataFrame-based checks used to."""
+    if isinstance(expected, bool):
+        return bool(actual)
+    if isinstance(actual, Decimal) and isinstance(expected, (int, float)):
+        return float(actual)
+    return actual
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _column_types(conn, relation):
+    return [(row[0], row[1]) for row in conn.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()]
+
+
+def _is_numeric(column_type):
+    return column_type in NUMERIC_TYPES or column_type.startswith('DECIMAL')
+
+
+def _keys_match(expected, columns):
+    """Whether every expected row has exactly the result's columns (grader.ts compares keys)."""
+    names = set(columns)
+    return all(isinstance(row, dict) and row.keys() == names for row in expected)
+
+
+def _json_kind(value):
+    """grader.ts's ``typeof`` of an expected value: ``'boolean'``, ``'number'``, ``'string'`` or ``'object'``."""
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    return 'string' if isinstance(value, str) else 'object'
+
+
+def _column_kind(column_type):
+    """The kind of expected value (see ``_json_kind``) a column can equal; None if only NULL."""
+    if _is_numeric(column_type):
+        return 'number'
+    if column_type in TEXT_TYPES:
+        return 'string'
+    return 'boolean' if column_type == 'BOOLEAN' else None
+
+
+def _comparison(expected, types):
+    """Typed SQL for comparing a result with ``expected``.
+
+    Returns ``(mismatched, actual, expected_sql, params)``. ``mismatched``
+    maps the columns with expected values of a kind the column can't hold
+    to the first row holding one. ``actual`` is a select list casting the
+    result's columns to their comparison types. ``expected_sql`` selects the
+    expected rows in the same types, numbered from 1 in ``__rn``, from the
+    list ``params``; values of the wrong kind are NULL there.
+    """
+    mismatched = {}
+    actual = []
+    unnest = [f"UNNEST(range(1, {len(expected) + 1})) AS __rn"]
+    params = []
+    for name, column_type in types:
+        kind = _column_kind(column_type)
+        values = [row[name] for row in expected]
+        bad = [i for i, value in enumerate(values) if value is not None and _json_kind(value) != kind]
+        if bad:
+            mismatched[name] = bad[0]
+            values = [None if _json_kind(value) != kind else value for value in values]
+        if kind == 'number':
+            integers = column_type in INTEGER_TYPES and all(isinstance(value, (int, type(None))) for value in values)
+            comparison_type = 'HUGEINT' if integers else 'DOUBLE'
+        else:
+            comparison_type = {'string': 'VARCHAR', 'boolean': 'BOOLEAN'}.get(kind, column_type)
+        actual.append(f"{_quote(name)}::{comparison_type} AS {_quote(name)}")
+        unnest.append(f"UNNEST(?::{comparison_type}[]) AS {_quote(name)}")
+        params.append(values)
+    return mismatched, ", ".join(actual), f"SELECT {', '.join(unnest)}", params
+
+
+def check_set_eq(conn, test, result, timeout_ms=None, profiles=None):
+    """Order-insensitive multiset comparison of the result with ``test['expected']``.
+
+    Both sides are compared with ``EXCEPT ALL``, which DuckDB runs as a hash
+    aggregate; NULLs match NULLs as in grader.ts. Expected values of a type
+    the column can't hold (see the module docstring) fail the check.
+    """
+    expected = test.get('expected') or []
+    if result['rows'] != len(expected):
+        return False, f"Set size mismatch: expected {len(expected)}, got {result['rows']}"
+    if not expected:
+        return True, "OK"
+
+    types = _column_types(conn, result['relation'])
+    if not _keys_match(expected, [name for name, _ in types]):
+        return False, "Sets do not match"
+
+    mismatched, actual, expected_sql, params = _comparison(expected, types)
+    if mismatched:
+        name, row = next(iter(mismatched.items()))
+        kind = _json_kind(expected[row][name])
+        return False, f"Sets do not match (expected a {kind} in column {name}, got {dict(types)[name]})"
+
+    columns = ", ".join(_quote(name) for name, _ in types)
+    sql = f"""
+        WITH expected AS ({expected_sql}),
+        actual AS (SELECT {actual} FROM {result['relation']})
+        SELECT
+            (SELECT COUNT(*) FROM (SELECT * FROM actual EXCEPT ALL SELECT {columns} FROM expected)),
+            (SELECT COUNT(*) FROM (SELECT {columns} FROM expected EXCEPT ALL SELECT * FROM actual))
+    """
+    extra, missing = execute(conn, sql, timeout_ms, profiles, params).fetchone()
+    if extra or missing:
+        return False, f"Sets do not match ({extra} unexpected, {missing} missing rows)"
+    return True, "OK"
+
+
+def check_near(conn, test, result, timeout_ms=None, profiles=None):
+    """Row-by-row comparison of the result with ``test['expected']`` within a tolerance.
+
+    Numeric columns pass within ``tolerance`` (``abs`` first, else ``rel`` of
+    the larger magnitude; default ``DEFAULT_TOLERANCE``), other columns must
+    be equal. Rows are matched by position: the result's ``rowid`` against
+    the expected rows' ``__rn`` ordinal. Expected values of a type the
+    column can't hold (see the module docstring) never match.
+    """
+    expected = test.get('expected') or []
+    tolerance = test.get('tolerance')
+    if tolerance is None:
+        tolerance = DEFAULT_TOLERANCE
+    if result['rows'] != len(expected):
+        return False, f"Row count mismatch: expected {len(expected)}, got {result['rows']}"
+    if not expected:
+        return True, "OK"
+
+    types = _column_types(conn, result['relation'])
+    if not _keys_match(expected, [name for name, _ in types]):
+        # grader.ts: differing keys fail the first row
+        return False, "Value mismatch at row 0"
+
+    mismatched, actual, expected_sql, params = _comparison(expected, types)
+    conditions = []
+    for name, column_type in types:
+        a, e = f"a.{_quote(name)}", f"e.{_quote(name)}"
+        equal = f"{a} IS NOT DISTINCT FROM {e}"
+        if not _is_numeric(column_type) or ('abs' not in tolerance and 'rel' not in tolerance):
+            conditions.append(equal)
+            continue
+        diff = f"ABS({a}::DOUBLE - {e}::DOUBLE)"
+        if 'abs' in tolerance:
+            within = f"{diff} <= {float(tolerance['abs'])!r}"
+        else:
+            within = f"{diff} <= {float(tolerance['rel'])!r} * GREATEST(ABS({a}::DOUBLE), ABS({e}::DOUBLE))"
+        conditions.append(f"CASE WHEN {a} IS NULL OR {e} IS NULL THEN {equal} ELSE COALESCE({within}, false) END")
+
+    # A value of the wrong kind fails its row, unless an earlier row differs
+    mismatch = min(mismatched.values(), default=None)
+    sql = f"""
+        WITH expected AS ({expected_sql}),
+        actual AS (SELECT rowid + 1 AS __rn, {actual} FROM {result['relation']})
+        SELECT MIN(__rn) - 1 FROM actual a JOIN expected e USING (__rn)
+        WHERE NOT ({' AND '.join(conditions)})
+    """
+    found = execute(conn, sql, timeout_ms, profiles, params).fetchone()[0]
+    if found is not None:
+        mismatch = found if mismatch is None else min(mismatch, found)
+    if mismatch is not None:
+        return False, f"Value mismatch at row {mismatch}"
+    return True, "OK"
+
+
+def run_test(conn, test, user_sql, result=None, timeout_ms=None, profiles=None):
+    """Run a single test assertion and return (passed, message).
+
+    ``result`` is the materialized result from ``run_solution``; without it
+    ``user_sql`` is executed (or inlined) again for every assertion. Each
+    query gets ``timeout_ms`` (see ``is_timeout``) and has its profile
+    appended to ``profiles`` (see ``execute``).
+    """
+    user_sql_clean = clean_sql(user_sql)
+    if result is not None:
+        # Preserves the solution's row order (preserve_insertion_order)
+        user_sql_clean = f"SELECT * FROM {result['relation']}"
+
+    if test['assert'] == 'ROWCOUNT':
+        try:
+            if result is not None:
+                actual_count = result['rows']
+            else:
+                actual_count = execute(conn, f"SELECT COUNT(*) FROM ({user_sql_clean})", timeout_ms, profiles).fetchone()[0]
+            expected_count = test['expected']
+            passed = actual_count == expected_count
+            msg = f"Expected {expected_count} rows, got {actual_count}"
+            return passed, msg
+        except QueryTimeout as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"SQL Error: {e}"
+
+    elif test['assert'] == 'SQL':
+        try:
+            # Replace {{USER_SQL}} with the actual user SQL
+            test_sql = test['sql'].replace('{{USER_SQL}}', user_sql_clean)
+            actual_row = first_row(conn, test_sql, timeout_ms, profiles)
+
+            # Check against expected
+            expected = test['expected']
+            if isinstance(expected, list) and len(expected) > 0:
+                # Compare first row
+                expected_row = expected[0]
+
+                passed = True
+                msg_parts = []
+                for key, exp_val in expected_row.items():
+                    if key in actual_row:
+                        act_val = _comparable(actual_row[key], exp_val)
+                        if act_val != exp_val:
+                            passed = False
+                            msg_parts.append(f"{key}: expected {exp_val}, got {act_val}")
+                    else:
+                        passed = False
+                        msg_parts.append(f"Missing key: {key}")
+
+                msg = "; ".join(msg_parts) if msg_parts else "OK"
+                return passed, msg
+            else:
+                return True, "No expected value to compare"
+        except QueryTimeout as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"SQL Error: {e}"
+
+    elif test['assert'] == 'SCHEMA_EQ':
+        try:
+            if result is not None:
+                actual_cols = result['columns']
+            else:
+                actual_cols = result_columns(conn, user_sql_clean, timeout_ms, profiles)
+            expected_cols = test.get('expected_columns', [])
+            passed = actual_cols == expected_cols
+            msg = f"Expected columns {expected_cols}, got {actual_cols}"
+            return passed, msg
+        except QueryTimeout as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"SQL Error: {e}"
+
+    elif test['assert'] in ('SET_EQ', 'NEAR'):
+        try:
+            check = check_set_eq if test['assert'] == 'SET_EQ' else check_near
+            if result is not None:
+                return check(conn, test, result, timeout_ms, profiles)
+            result, error = run_solution(conn, user_sql, timeout_ms, profiles)
+            if error:
+                return False, error if is_timeout(error) else f"SQL Error: {error}"
+            try:
+                return check(conn, test, result, timeout_ms, profiles)
+            finally:
+                drop_result(conn, result)
+        except QueryTimeout as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"SQL Error: {e}"
+
+    else:
+        return False, f"Unknown assert type: {test['assert']}"
+
+
+def grade(conn, user_sql, tests, timeout_ms=None, max_rows=None, precheck=False):
+    """Grade ``user_sql`` against ``tests`` like ``gradeQuery`` in grader.ts.
+
+    Returns ``{'pass', 'checks', 'stats'}`` with grader.ts's keys: each check
+    is ``{'name', 'pass'}`` plus a ``'message'`` when it fails, and ``stats``
+    holds ``elapsedMs`` (the submission's own query) and ``rowsReturned``.
+    A query that fails or returns more than ``max_rows`` rows gets a single
+    ``execution_error`` or ``row_limit`` check; ``precheck`` is as in
+    ``run_solution``.
+    """
+    with timed() as timing:
+        result, error = run_solution(conn, user_sql, timeout_ms, precheck=precheck)
+    stats = {'elapsedMs': round(timing['wall_ms'], 3), 'rowsReturned': result['rows'] if result else 0}
+
+    if error:
+        return {'pass': False, 'checks': [{'name': 'execution_error', 'pass': False, 'message': error}], 'stats': stats}
+    try:
+        if max_rows is not None and result['rows'] > max_rows:
+            message = f"Query returned {result['rows']} rows, exceeding limit of {max_rows}"
+            return {'pass': False, 'checks': [{'name': 'row_limit', 'pass': False, 'message': message}], 'stats': stats}
+
+        checks = grade_checks(conn, tests, user_sql, result, timeout_ms)
+        return {'pass': all(c['pass'] for c in checks), 'checks': checks, 'stats': stats}
+    finally:
+        drop_result(conn, result)
+
+
+def grade_checks(conn, tests, user_sql, result, timeout_ms=None):
+    """``grade``'s checks for an already materialized ``result``."""
+    checks = []
+    for test in tests:
+        passed, msg = run_test(conn, test, user_sql, result, timeout_ms)
+        check = {'name': test.get('name', 'unnamed'), 'pass': passed}
+        if not passed:
+            check['message'] = msg
+        checks.append(check)
+    return checks
@@ -0,0 +1,116 @@
+"""
+Mutants of challenge solutions for mutation testing.
+
+Each operator makes one small, plausible mistake in a solution (dropping a
+year filter, ``COUNT(DISTINCT x)`` -> ``COUNT(x)``, ``>=`` -> ``>``, ``LEFT
+JOIN`` -> ``INNER JOIN``, removing ``HAVING``) at one place in the SQL. A good
+test suite fails for every mutant whose result differs from the solution's.
+
+Operators match on a copy of the SQL with string literals and comments
+blanked out, so text inside them is never mutated.
+"""
+
+import re
+
+from .sqltext import mask_sql
+
+YEAR_FILTER = re.compile(
+    r"(?:\bYEAR\s*\(\s*[\w.]+\s*\)|\bEXTRACT\s*\(\s*YEAR\s+FROM\s+[\w.]+\s*\)|(?<![\w.])(?:\w+\.)?year\b)"
+    r"\s*=\s*\d{4}\b",
+    re.IGNORECASE,
+)
+COUNT_DISTINCT = re.compile(r"\bCOUNT\s*\(\s*DISTINCT\s+", re.IGNORECASE)
+COMPARISON = re.compile(r">=|<=")
+LEFT_JOIN = re.compile(r"\bLEFT\s+(?:OUTER\s+)?JOIN\b", re.IGNORECASE)
+HAVING = re.compile(r"\bHAVING\b", re.IGNORECASE)
+# Clauses that can follow HAVING at the same nesting level
+AFTER_HAVING = re.compile(r"\b(?:ORDER\s+BY|LIMIT|QUALIFY|WINDOW|UNION|INTERSECT|EXCEPT)\b", re.IGNORECASE)
+
+
+def _having_end(masked, start):
+    """End of the HAVING clause starting at ``start``: the next clause at its level, a closing paren or the end."""
+    depth = 0
+    i = start
+    while i < len(masked):
+        char = masked[i]
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            if depth == 0:
+                return i
+            depth -= 1
+        elif char == ';' and depth == 0:
+            return i
+        elif depth == 0:
+            match = AFTER_HAVING.match(masked, i)
+            if match and (i == 0 or not (masked[i - 1].isalnum() or masked[i - 1] == '_')):
+                return i
+        i += 1
+    return len(masked)
+
+
+# Operators yield (description, start, end, replacement) edits of the SQL
+
+def drop_year_filter(sql, masked):
+    for m in YEAR_FILTER.finditer(masked):
+        yield "drop year filter", m.start(), m.end(), "TRUE"
+
+
+def count_distinct(sql, masked):
+    for m in COUNT_DISTINCT.finditer(masked):
+        yield "COUNT(DISTINCT ...) -> COUNT(...)", m.start(), m.end(), "COUNT("
+
+
+def boundary(sql, masked):
+    for m in COMPARISON.finditer(masked):
+        op = sql[m.start():m.end()]
+        yield f"{op} -> {op[0]}", m.start(), m.end(), op[0]
+
+
+def left_to_inner_join(sql, masked):
+    for m in LEFT_JOIN.finditer(masked):
+        yield "LEFT JOIN -> INNER JOIN", m.start(), m.end(), "INNER JOIN"
+
+
+def drop_having(sql, masked):
+    for m in HAVING.finditer(masked):
+        end = _having_end(masked, m.end())
+        yield "drop HAVING", m.start(), end, " "
+
+
+OPERATORS = {
+    'year_filter': drop_year_filter,
+    'count_distinct': count_distinct,
+    'boundary': boundary,
+    'left_join': left_to_inner_join,
+    'having': drop_having,
+}
+
+
+def context(sql, start, end, width=30):
+    """The mutated span of ``sql`` with up to ``width`` characters around it, on one line."""
+    before = " ".join(sql[max(0, start - width):start].split())
+    span = " ".join(sql[start:end].split())
+    after = " ".join(sql[end:end + width].split())
+    return f"{'…' if start > width else ''}{before} [{span}] {after}{'…' if end + width < len(sql) else ''}"
+
+
+def mutants(sql, operators=None):
+    """Mutants of ``sql`` as ``{'id', 'operator', 'description', 'context', 'sql'}`` dicts.
+
+    ``operators`` is a list of ``OPERATORS`` names (default: all). Ids are
+    ``<operator>-<n>``, numbered per operator in order of position;
+    ``context`` shows the original text around the change.
+    """
+    masked = mask_sql(sql)
+    found = []
+    for name in operators or OPERATORS:
+        for n, (description, start, end, replacement) in enumerate(OPERATORS[name](sql, masked), 1):
+            found.append({
+                'id': f"{name}-{n}",
+                'operator': name,
+                'description': description,
+                'context': context(sql, start, end),
+                'sql': sql[:start] + replacement + sql[end:],
+            })
+    return found
@@ -0,0 +1,126 @@
+"""
+Pack loading and challenge metadata helpers.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import duckdb
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+PACKS_DIR = ROOT_DIR / "public" / "packs"
+APP_PACKS_DIR = ROOT_DIR / "app" / "packs"
+
+# Stands in for {{USER_SQL}} when test SQL is parsed
+USER_SQL_STANDIN = "SELECT 1"
+
+# In-memory connection used only to parse SQL (json_serialize_sql)
+_parser = {'conn': None, 'lock': threading.Lock()}
+
+
+def discover_packs(roots=(PACKS_DIR, APP_PACKS_DIR)):
+    """Return every directory containing a pack.json under ``roots``, sorted."""
+    pack_dirs = []
+    for root in roots:
+        pack_dirs.extend(sorted(p.parent for p in Path(root).glob("*/pack.json")))
+    return pack_dirs
+
+
+def pack_label(pack_dir):
+    """Short name for a pack directory, e.g. ``public/packs/pack_basics``."""
+    pack_dir = Path(pack_dir).resolve()
+    try:
+        return str(pack_dir.relative_to(ROOT_DIR))
+    except ValueError:
+        return str(pack_dir)
+
+
+def pack_key(pack_dir):
+    """File-name-safe key unique per pack directory (app/ and public/ packs share ids).
+
+    Packs inside the repo use their path, e.g. ``public-packs-pack_basics``,
+    so the key is the same on every checkout; other directories get their
+    name and a hash of their absolute path.
+    """
+    pack_dir = Path(pack_dir).resolve()
+    try:
+        return "-".join(pack_dir.relative_to(ROOT_DIR).parts)
+    except ValueError:
+        dir_hash = hashlib.sha1(str(pack_dir).encode()).hexdigest()[:8]
+        return f"{pack_dir.name}-{dir_hash}"
+
+
+def load_pack(pack_dir):
+    """Load and return a pack's pack.json."""
+    with open(Path(pack_dir) / "pack.json", 'r') as f:
+        return json.load(f)
+
+
+def challenge_sql(challenge):
+    """All SQL run for a challenge: its solution followed by its SQL tests."""
+    sql = [challenge.get('solution_sql', '')]
+    sql.extend(test['sql'] for test in challenge.get('tests', []) if test.get('sql'))
+    return sql
+
+
+def _table_refs(node, found):
+    if isinstance(node, dict):
+        if node.get('type') == 'BASE_TABLE':
+            found.add(node['table_name'].lower())
+        for value in node.values():
+            _table_refs(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _table_refs(value, found)
+
+
+@lru_cache(maxsize=4096)
+def sql_tables(sql):
+    """Lower-cased names of the tables a SELECT statement reads, from DuckDB's parser.
+
+    CTE names are included. Returns None if DuckDB can't parse ``sql``.
+    """
+    sql = sql.replace('{{USER_SQL}}', USER_SQL_STANDIN).strip().rstrip(';')
+    with _parser['lock']:
+        if _parser['conn'] is None:
+            _parser['conn'] = duckdb.connect(':memory:')
+        serialized = _parser['conn'].execute("SELECT json_serialize_sql(?)", [sql]).fetchone()[0]
+    tree = json.loads(serialized)
+    if tree.get('error'):
+        return None
+    found = set()
+    _table_refs(tree, found)
+    return frozenset(found)
+
+
+def challenge_tables(challenge, table_names):
+    """Return the set of dataset tables a challenge reads.
+
+    Each statement's tables come from DuckDB's parser; statements it can't
+    parse fall back to the table names that appear as words in them. The
+    challenge's ``tables`` field is added, so an incomplete list can't hide
+    a table.
+    """
+    by_name = {name.lower(): name for name in table_names}
+    found = set()
+    for sql in challenge_sql(challenge):
+        parsed = sql_tables(sql) if sql else frozenset()
+        if parsed is None:
+            text = sql.lower()
+            found.update(name for lower, name in by_name.items() if re.search(rf"\b{re.escape(lower)}\b", text))
+        else:
+            found.update(by_name[lower] for lower in parsed if lower in by_name)
+    return found | (set(challenge.get('tables') or []) & set(table_names))
+
+
+def table_references(challenges, table_names):
+    """Count how many of ``challenges`` read each table."""
+    counts = {name: 0 for name in table_names}
+    for challenge in challenges:
+        for name in challenge_tables(challenge, table_names):
+            counts[name] += 1
+    return counts
@@ -0,0 +1,136 @@
+"""
+Query cost pre-check from DuckDB's ``EXPLAIN`` plan.
+
+The optimizer's plan carries an estimated cardinality per operator. Each
+operator's rows are priced at a rate measured for its kind (``ROWS_PER_MS``)
+and the sum is an estimated run time. Rates are deliberately optimistic, so
+a query is only rejected when even the fast case couldn't finish within the
+time budget. The usual culprits are nested-loop joins, which evaluate their
+condition for every pair of input rows, range joins with huge outputs and
+cross products whose result has to be stored.
+"""
+
+import json
+
+# Rows per millisecond, by kind of work. Measured on the meta pack's tables
+# with runaway self-joins, then rounded up so estimates stay below real times.
+ROWS_PER_MS = {
+    # Row pairs of a cross product (emitted in constant-vector batches)
+    'cross_product': 10_000_000,
+    # Row pairs a nested-loop join evaluates its condition on
+    'nested_loop': 500_000,
+    # Rows emitted by other joins
+    'join_output': 50_000,
+    # Rows read or emitted by any other operator
+    'operator': 10_000_000,
+    # Values (rows x columns) of the result, which grading stores
+    'result_value': 20_000,
+}
+
+# Estimates above this share of the budget are reported as 'slow'
+SLOW_SHARE = 0.25
+
+# Hotspots cheaper than this aren't worth naming
+HOTSPOT_MIN_MS = 1.0
+
+NESTED_LOOP_JOINS = ('NESTED_LOOP_JOIN', 'BLOCKWISE_NL_JOIN')
+
+VERDICTS = ('ok', 'slow', 'reject')
+
+
+def explain(conn, sql):
+    """Physical plan of ``sql`` as a tree of ``{'name', 'children', 'extra_info'}`` dicts."""
+    row = conn.execute(f"EXPLAIN (FORMAT JSON) {sql}").fetchone()
+    plans = json.loads(row[1])
+    return plans[0] if len(plans) == 1 else {'name': 'PLAN', 'children': plans, 'extra_info': {}}
+
+
+def _cardinality(node):
+    value = (node.get('extra_info') or {}).get('Estimated Cardinality')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _label(node):
+    """Operator name, with the table for scans."""
+    table = (node.get('extra_info') or {}).get('Table')
+    return f"{node['name']} {table.split('.')[-1]}" if table else node['name']
+
+
+def plan_cost(node):
+    """``(rows_out, estimated_ms, hotspots)`` of a plan subtree.
+
+    ``hotspots`` lists ``(ms, description)`` of the joins that cost at
+    least ``HOTSPOT_MIN_MS``.
+    """
+    children = [plan_cost(child) for child in node.get('children', [])]
+    inputs = [rows for rows, _, _ in children]
+    ms = sum(cost for _, cost, _ in children)
+    hotspots = [h for _, _, spots in children for h in spots]
+
+    name = node['name']
+    rows = 1 if name == 'UNGROUPED_AGGREGATE' else _cardinality(node)
+    sides = " × ".join(f"{_label(child)} ({n:,} rows)" for child, n in zip(node.get('children', []), inputs))
+    if name == 'CROSS_PRODUCT' or name in NESTED_LOOP_JOINS:
+        pairs = inputs[0] * inputs[1] if len(inputs) == 2 else 0
+        cost = pairs / ROWS_PER_MS['cross_product' if name == 'CROSS_PRODUCT' else 'nested_loop']
+        if name != 'CROSS_PRODUCT' and rows is not None:
+            cost += rows / ROWS_PER_MS['join_output']
+        if rows is None:
+            # Unestimated: at most every pair matches
+            rows = pairs
+        description = f"{name} of {sides}: {pairs:,} row pairs"
+    elif name.endswith('JOIN'):
+        rows = rows if rows is not None else max(inputs, default=0)
+        cost = rows / ROWS_PER_MS['join_output']
+        description = f"{name} of {sides}: about {rows:,} rows"
+    else:
+        rows = rows if rows is not None else max(inputs, default=0)
+        cost = 0.0
+        description = None
+
+    ms += cost + (rows + sum(inputs)) / ROWS_PER_MS['operator']
+    if description and cost >= HOTSPOT_MIN_MS:
+        hotspots.append((cost, description))
+    return rows, ms, hotspots
+
+
+def estimate_cost(conn, sql, timeout_ms):
+    """Estimate whether ``sql`` can finish within ``timeout_ms``.
+
+    Returns ``{'verdict', 'estimated_ms', 'rows', 'message'}``. ``verdict``
+    is ``'reject'`` when the estimate is over the budget (``message`` then
+    names the costliest join or the result size), ``'slow'`` over
+    ``SLOW_SHARE`` of it and ``'ok'`` otherwise. SQL that can't be explained
+    is ``'ok'``: running it reports the actual error.
+    """
+    try:
+        plan = explain(conn, sql)
+    except Exception:
+        return {'verdict': 'ok', 'estimated_ms': None, 'rows': None, 'message': None}
+
+    rows, estimated_ms, hotspots = plan_cost(plan)
+    try:
+        columns = len(conn.execute(f"DESCRIBE {sql}").fetchall())
+    except Exception:
+        columns = 1
+    result_ms = rows * columns / ROWS_PER_MS['result_value']
+    estimated_ms += result_ms
+    if result_ms >= HOTSPOT_MIN_MS:
+        hotspots.append((result_ms, f"storing a result of about {rows:,} rows x {columns} columns"))
+
+    if not timeout_ms or estimated_ms <= timeout_ms * SLOW_SHARE:
+        verdict = 'ok'
+    elif estimated_ms <= timeout_ms:
+        verdict = 'slow'
+    else:
+        verdict = 'reject'
+
+    message = None
+    if verdict == 'reject':
+        message = f"query would take about {estimated_ms:,.0f} ms, over the {timeout_ms} ms budget"
+        if hotspots:
+            message += f"; {max(hotspots)[1]}"
+    return {'verdict': verdict, 'estimated_ms': estimated_ms, 'rows': rows, 'message': message}
@@ -0,0 +1,75 @@
+"""
+DuckDB query profiles for the harness's ``--profile`` mode.
+
+Profiling is switched on per connection (each worker cursor is its own
+connection). ``grader.execute`` appends the JSON profile of a query to the
+``profiles`` list it is given, and the profiles of a challenge are written
+to ``<profile dir>/<pack key>/<challenge id>.json`` (``pack.pack_key``, since
+app/ and public/ packs share ids).
+"""
+
+import json
+from pathlib import Path
+
+from .duck import CACHE_DIR
+
+PROFILES_DIR = CACHE_DIR.parent / "profiles"
+
+
+def enable_profiling(conn):
+    if not hasattr(conn, 'get_profiling_information'):
+        raise RuntimeError("--profile needs a DuckDB version with get_profiling_information() (1.1+)")
+    # Keep profiles in memory; they are read back after each query
+    conn.execute("SET enable_profiling = 'no_output'")
+
+
+def last_profile(conn):
+    """JSON profile of the last query executed on ``conn``."""
+    return json.loads(conn.get_profiling_information(format='json'))
+
+
+def _field(node, *names):
+    for name in names:
+        if name in node:
+            return node[name]
+    return None
+
+
+def operators(profile):
+    """Flatten a profile's operator tree into ``{'operator', 'seconds', 'rows', 'extra'}`` dicts."""
+    found = []
+    stack = list(profile.get('children', []))
+    while stack:
+        node = stack.pop()
+        found.append({
+            'operator': _field(node, 'operator_name', 'name', 'operator_type') or '?',
+            'seconds': _field(node, 'operator_timing', 'timing') or 0.0,
+            'rows': _field(node, 'operator_cardinality', 'cardinality') or 0,
+            'extra': node.get('extra_info') or {},
+        })
+        stack.extend(node.get('children', []))
+    return found
+
+
+def write_challenge_profiles(profile_dir, pack_key, challenge_id, queries):
+    """Save ``[{'query': label, 'profile': ...}]`` for one challenge; returns the path."""
+    path = Path(profile_dir) / pack_key / f"{challenge_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'challenge': challenge_id, 'queries': queries}, f, indent=2)
+    return path
+
+
+def top_operators(challenge_profiles, n):
+    """Most expensive operators across challenges.
+
+    ``challenge_profiles`` maps challenge ids to their ``[{'query', 'profile'}]``
+    lists. Returns up to ``n`` operator dicts with ``challenge`` and ``query``
+    added, most expensive first.
+    """
+    found = []
+    for challenge_id, queries in challenge_profiles.items():
+        for query in queries:
+            for op in operators(query['profile']):
+                found.append({**op, 'challenge': challenge_id, 'query': query['query']})
+    return sorted(found, key=lambda op: op['seconds'], reverse=True)[:n]
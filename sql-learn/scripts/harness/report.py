@@ -0,0 +1,85 @@
+"""
+Machine-readable harness reports (JSON and JUnit XML).
+
+Both are built from the per-pack reports of ``test-solutions-duckdb.py``:
+``{'pack', 'title', 'path', 'datasets', 'challenges'}`` where datasets and
+challenges carry the ``wall_ms``/``cpu_ms`` timings recorded during the run.
+"""
+
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import duckdb
+
+from .timing import summarize
+
+
+def pack_stats(pack_report):
+    """Timing summaries (p50/p95/max) for a pack's loads, solutions, assertions and challenges."""
+    challenges = [c for c in pack_report['challenges'] if not c.get('cached')]
+    return {
+        'dataset_load': summarize([d['wall_ms'] for d in pack_report['datasets']]),
+        'solution': summarize([c['solution']['wall_ms'] for c in challenges if 'solution' in c]),
+        'assertion': summarize([t['wall_ms'] for c in challenges for t in c.get('tests', [])]),
+        'challenge': summarize([c['wall_ms'] for c in challenges if 'wall_ms' in c]),
+    }
+
+
+def challenge_stats(challenge):
+    """Timing summary of a challenge's assertions."""
+    return summarize([t['wall_ms'] for t in challenge.get('tests', [])])
+
+
+def write_json_report(path, pack_reports, timeout_ms):
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'duckdb_version': duckdb.__version__,
+        'timeout_ms': timeout_ms,
+        'packs': [
+            {
+                **pack_report,
+                'stats': pack_stats(pack_report),
+                'challenges': [
+                    {**c, 'assertion_stats': challenge_stats(c)} for c in pack_report['challenges']
+                ],
+            }
+            for pack_report in pack_reports
+        ],
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def write_junit_report(path, pack_reports):
+    """One <testsuite> per pack and one <testcase> per challenge."""
+    suites = ET.Element('testsuites')
+    for pack_report in pack_reports:
+        challenges = pack_report['challenges']
+        suite = ET.SubElement(suites, 'testsuite', {
+            'name': pack_report['path'],
+            'tests': str(len(challenges)),
+            'failures': str(sum(1 for c in challenges if not c['passed'] and 'error' not in c)),
+            'errors': str(sum(1 for c in challenges if 'error' in c)),
+            'time': f"{sum(c.get('wall_ms', 0) for c in challenges) / 1000:.3f}",
+        })
+        for c in challenges:
+            case = ET.SubElement(suite, 'testcase', {
+                'classname': pack_report['pack'],
+                'name': c['id'],
+                'time': f"{c.get('wall_ms', 0) / 1000:.3f}",
+            })
+            if 'error' in c:
+                ET.SubElement(case, 'error', {'message': c['error'], 'type': 'timeout' if c.get('timeout') else 'sql'})
+            elif not c['passed']:
+                failed = [t for t in c.get('tests', []) if not t['passed']]
+                failure = ET.SubElement(case, 'failure', {
+                    'message': f"{len(failed)} of {len(c['tests'])} assertions failed",
+                    'type': 'timeout' if c.get('timeout') else 'assertion',
+                })
+                failure.text = "\n".join(f"{t['name']}: {t['message']}" for t in failed)
+            if c.get('cached'):
+                ET.SubElement(case, 'system-out').text = "Result reused from cache"
+
+    ET.indent(suites)
+    ET.ElementTree(suites).write(path, encoding='utf-8', xml_declaration=True)
@@ -0,0 +1,185 @@
+"""
+Scaled copies of a pack's datasets for benchmarking.
+
+A pack at scale factor N grows both its population and its density, the
+way a real product's data does. With ``g = ceil(sqrt(N))``:
+
+- Entity tables (a single id column with unique values, e.g. ``users``,
+  ``events``, ``pages``) hold ``g`` copies, each with its ids shifted by a
+  per-copy offset: ``g`` times the users, events and pages.
+- Every other table with id columns (``id`` and ``*_id`` integers) holds N
+  copies. A unique first id column (the row's own key, e.g. ``action_id``)
+  is shifted per copy; each remaining id column points into one of the
+  ``g`` entity copies, with the copies chosen so that every pair of them
+  is used once. ``friendships`` copy ``(i, j)`` links users of population
+  ``i`` to users of population ``j``: new, distinct edges.
+
+So each user, event and page gets about ``sqrt(N)`` times the rows and
+friends, a join on a foreign key grows like N and a friend-of-friend
+self-join like ``N**1.5``, which the complexity classifier can see.
+Tables without id columns (e.g. ``monthly_active``) describe no population
+and are kept at 1x, so joins on their dates or months don't grow.
+
+``sweep`` times challenges on such copies at several scale factors.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import duckdb
+
+from .bench import bench_challenge
+from .duck import _sql_str, open_pack_db, parquet_files
+from .grader import is_timeout
+from .pack import challenge_tables
+
+# One-line summary of the model above, for the sweep scripts' reports
+SCALE_MODEL = ("Nx rows over sqrt(N)x users/events/pages (rows per key grow with sqrt(N)); "
+               "tables without id columns stay at 1x")
+
+INTEGER_TYPES = ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+                 'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT')
+
+
+def _is_id_column(name, column_type):
+    name = name.lower()
+    return (name == 'id' or name.endswith('_id')) and column_type in INTEGER_TYPES
+
+
+def _columns(conn, parquet_file):
+    return conn.execute(
+        f"DESCRIBE SELECT * FROM read_parquet({_sql_str(parquet_file)})"
+    ).fetchall()
+
+
+def id_stride(conn, files):
+    """Smallest power of ten above every id value in ``files``."""
+    largest = 0
+    for parquet_file in files:
+        ids = [name for name, column_type, *_ in _columns(conn, parquet_file) if _is_id_column(name, column_type)]
+        if ids:
+            maxima = ", ".join(f'MAX(ABS("{name}"))' for name in ids)
+            row = conn.execute(f"SELECT {maxima} FROM read_parquet({_sql_str(parquet_file)})").fetchone()
+            largest = max([largest, *(v or 0 for v in row)])
+    stride = 10
+    while stride <= largest:
+        stride *= 10
+    return stride
+
+
+def _unique(conn, parquet_file, name):
+    rows, distinct = conn.execute(
+        f'SELECT COUNT(*), COUNT(DISTINCT "{name}") FROM read_parquet({_sql_str(parquet_file)})'
+    ).fetchone()
+    return rows == distinct
+
+
+def population_copies(scale):
+    """Number of entity copies at ``scale``: the smallest ``g`` with ``g * g >= scale``."""
+    g = 1
+    while g * g < scale:
+        g += 1
+    return g
+
+
+def scale_pack(pack_dir, scale, out_dir):
+    """Write a copy of the pack at scale factor ``scale`` (see the module docstring).
+
+    Returns ``out_dir``.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copy(Path(pack_dir) / "pack.json", out_dir / "pack.json")
+
+    conn = duckdb.connect(':memory:')
+    files = parquet_files(pack_dir)
+    stride = id_stride(conn, files)
+    g = population_copies(scale)
+    for parquet_file in files:
+        columns = _columns(conn, parquet_file)
+        id_columns = [name for name, column_type, *_ in columns if _is_id_column(name, column_type)]
+        if not id_columns:
+            shutil.copy(parquet_file, out_dir / parquet_file.name)
+            continue
+
+        # The row's own key: a unique first column
+        key = columns[0][0] if columns[0][0] in id_columns else None
+        if key and not _unique(conn, parquet_file, key):
+            key = None
+        if key and len(id_columns) == 1:
+            # Entity table: one copy per population
+            copies, shifts = g, {key: "copy"}
+        else:
+            # Copy c points its first reference at population c % g, its second at c // g
+            references = [name for name in id_columns if name != key]
+            copies = scale
+            shifts = {name: f"(copy // {g ** (i % 2)}) % {g}" for i, name in enumerate(references)}
+            if key:
+                shifts[key] = "copy"
+        select = ", ".join(
+            f'"{name}" + {shifts[name]} * {stride} AS "{name}"' if name in shifts else f'"{name}"'
+            for name, *_ in columns
+        )
+        conn.execute(f"""
+            COPY (
+                SELECT {select}
+                FROM range({copies}) r(copy), read_parquet({_sql_str(parquet_file)})
+            ) TO {_sql_str(out_dir / parquet_file.name)} (FORMAT parquet)
+        """)
+    conn.close()
+    return out_dir
+
+
+def sweep_point(conn, datasets, challenge, scale, runs=3, warmup=1, timeout_ms=None, budget_ms=None):
+    """Benchmark one challenge on a loaded scaled pack.
+
+    Returns ``{'scale', 'rows', 'solution_ms', 'assertions_ms',
+    'slowest_query_ms', 'within_budget', 'tests'}`` with p50 timings, where
+    ``rows`` counts the rows of the tables the challenge reads and ``tests``
+    maps test names to their p50. If the solution fails, ``solution_ms``
+    and the following keys are replaced by ``'error'`` and ``'timeout'``.
+    """
+    rows = {d['table']: d['rows'] for d in datasets}
+    point = {
+        'scale': scale,
+        'rows': sum(rows[name] for name in challenge_tables(challenge, rows)),
+    }
+    m = bench_challenge(conn, challenge, runs=runs, warmup=warmup, timeout_ms=timeout_ms)
+    if 'error' in m:
+        return {**point, 'error': m['error'], 'timeout': is_timeout(m['error']), 'within_budget': False}
+
+    tests = {t['name']: t['p50_ms'] for t in m['tests']}
+    slowest = max([m['solution']['p50_ms'], *tests.values()])
+    return {
+        **point,
+        'solution_ms': m['solution']['p50_ms'],
+        'assertions_ms': m['assertions']['p50_ms'],
+        'slowest_query_ms': slowest,
+        'within_budget': budget_ms is None or slowest <= budget_ms,
+        'tests': tests,
+    }
+
+
+def sweep(pack_dir, challenges, scales, runs=3, warmup=1, timeout_ms=None, budget_ms=None, log=print):
+    """Run ``sweep_point`` for every challenge at every scale factor, smallest first.
+
+    A challenge whose solution timed out is not run at larger scales.
+    Returns ``{challenge_id: [point, ...]}`` in challenge order.
+    """
+    series = {c['id']: [] for c in challenges}
+    active = list(challenges)
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in sorted(scales):
+            if not active:
+                break
+            scaled_dir = pack_dir if scale == 1 else scale_pack(pack_dir, scale, Path(tmp) / f"x{scale}")
+            log(f"Running {len(active)} challenge(s) at {scale}x...")
+            conn, datasets = open_pack_db(scaled_dir, use_cache=False)
+            for challenge in active:
+                series[challenge['id']].append(
+                    sweep_point(conn, datasets, challenge, scale, runs, warmup, timeout_ms, budget_ms)
+                )
+            conn.close()
+            active = [c for c in active if not series[c['id']][-1].get('timeout')]
+    return series
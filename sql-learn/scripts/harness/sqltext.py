@@ -0,0 +1,119 @@
+"""
+Lexical helpers for SQL text: finding string literals, quoted identifiers
+and comments, and normalizing whitespace.
+
+Nothing here parses SQL; the helpers only need to know which characters are
+code and which are inside a literal, an identifier or a comment.
+"""
+
+import re
+
+# Whitespace that can be dropped without joining two tokens
+SPACE_AFTER_OPEN = re.compile(r"\(\s+")
+SPACE_BEFORE_CLOSE = re.compile(r"\s+([),])")
+PLACEHOLDER = re.compile(r"\0(\d+)\0")
+# Comments, E'...' escape strings, plain quotes and $tag$ dollar quotes
+# (not $1 parameters); E and $ only start a span at the beginning of a word
+SPAN_START = re.compile(r"--|/\*|(?<![\w$])[Ee]'|['\"]|(?<![\w$])\$(?:[A-Za-z_]\w*)?\$")
+
+
+def quoted_spans(sql):
+    """``(kind, start, end)`` of every comment, string literal and quoted identifier.
+
+    ``kind`` is ``'comment'``, ``'string'`` or ``'identifier'``. Strings
+    include ``E'...'`` escape strings (where a backslash escapes the next
+    character) and ``$$...$$``/``$tag$...$tag$`` dollar-quoted strings. An
+    unterminated span runs to the end of ``sql``.
+    """
+    i = 0
+    while True:
+        match = SPAN_START.search(sql, i)
+        if match is None:
+            return
+        i = match.start()
+        token = match.group()
+        if token == '--':
+            end = sql.find('\n', i)
+            end = len(sql) if end == -1 else end
+            kind = 'comment'
+        elif token == '/*':
+            end = sql.find('*/', i + 2)
+            end = len(sql) if end == -1 else end + 2
+            kind = 'comment'
+        elif token.startswith('$'):
+            end = sql.find(token, i + len(token))
+            end = len(sql) if end == -1 else end + len(token)
+            kind = 'string'
+        elif token in ("E'", "e'"):
+            end = i + 2
+            while end < len(sql):
+                # A backslash or a doubled quote escapes a quote
+                if sql[end] == '\\' or sql.startswith("''", end):
+                    end += 2
+                    continue
+                end += 1
+                if sql[end - 1] == "'":
+                    break
+            end = min(end, len(sql))
+            kind = 'string'
+        else:
+            end = i + 1
+            while True:
+                end = sql.find(token, end)
+                if end == -1:
+                    end = len(sql)
+                    break
+                # A doubled quote is an escaped quote
+                if sql.startswith(token * 2, end):
+                    end += 2
+                    continue
+                end += 1
+                break
+            kind = 'string' if token == "'" else 'identifier'
+        yield kind, i, end
+        i = end
+
+
+def mask_sql(sql):
+    """Copy of ``sql`` with string literals, quoted identifiers and comments replaced by spaces."""
+    masked = list(sql)
+    for _, start, end in quoted_spans(sql):
+        for j in range(start, end):
+            if masked[j] != '\n':
+                masked[j] = ' '
+    return ''.join(masked)
+
+
+def normalize_sql(sql):
+    """Canonical text of a query for caching verdicts.
+
+    Comments are removed, whitespace outside literals and quoted identifiers
+    is collapsed (and dropped inside parentheses and before commas), and
+    trailing semicolons are stripped. Case is kept: unquoted aliases name
+    the result's columns, which SCHEMA_EQ and SET_EQ compare.
+    """
+    # Swap literals for placeholders without whitespace, squeeze, swap back
+    literals = []
+    parts = []
+    code_start = 0
+    for kind, start, end in quoted_spans(sql):
+        parts.append(sql[code_start:start])
+        if kind == 'comment':
+            # A comment separates tokens like whitespace does
+            parts.append(" ")
+        else:
+            parts.append(f"\0{len(literals)}\0")
+            literals.append(sql[start:end])
+        code_start = end
+    parts.append(sql[code_start:])
+
+    text = " ".join("".join(parts).split())
+    text = SPACE_AFTER_OPEN.sub("(", text)
+    text = SPACE_BEFORE_CLOSE.sub(r"\1", text)
+    text = text.rstrip("; ")
+    return PLACEHOLDER.sub(lambda m: literals[int(m.group(1))], text)
+
+
+def statement_count(sql):
+    """Number of non-empty statements in ``sql``, split on semicolons outside literals and comments."""
+    return sum(1 for statement in mask_sql(sql).split(';') if statement.strip())
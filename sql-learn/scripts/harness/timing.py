@@ -0,0 +1,42 @@
+"""
+Wall-clock and CPU timing of harness steps.
+
+CPU time is process-wide, so it includes DuckDB's worker threads; with
+``--jobs`` it also includes whatever other workers ran in the meantime.
+"""
+
+import math
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def timed():
+    """Time a block; the yielded dict gets ``wall_ms`` and ``cpu_ms`` on exit."""
+    timing = {}
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield timing
+    finally:
+        timing['wall_ms'] = (time.perf_counter() - wall) * 1000
+        timing['cpu_ms'] = (time.process_time() - cpu) * 1000
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (``q`` in 0-100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values):
+    """Count, total, p50, p95 and max of a list of milliseconds."""
+    if not values:
+        return {'count': 0, 'total_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+    return {
+        'count': len(values),
+        'total_ms': sum(values),
+        'p50_ms': percentile(values, 50),
+        'p95_ms': percentile(values, 95),
+        'max_ms': max(values),
+    }
@@ -0,0 +1,57 @@
+"""
+Polling file watcher for ``test-solutions-duckdb.py --watch``.
+
+A pack's files are its ``pack.json`` and parquet files. Stat-polling them a
+few times a second is cheap for a pack's couple of dozen files and needs no
+extra dependency.
+"""
+
+import time
+from pathlib import Path
+
+from .duck import parquet_files
+
+
+def snapshot(pack_dir):
+    """``{path: (size, mtime_ns)}`` of a pack's pack.json and parquet files."""
+    state = {}
+    for path in [Path(pack_dir) / "pack.json", *parquet_files(pack_dir)]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        state[str(path)] = (stat.st_size, stat.st_mtime_ns)
+    return state
+
+
+def changed_files(before, after):
+    """Paths added, removed or modified between two snapshots."""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+def wait_for_changes(pack_dirs, snapshots, interval=0.1):
+    """Block until files of any pack change and stay unchanged for one ``interval``.
+
+    ``snapshots`` maps each pack directory to its last ``snapshot`` and is
+    updated in place. Returns ``{pack_dir: changed paths}`` for the packs
+    that changed. Waiting for a quiet interval lets editors finish writing.
+    """
+    while True:
+        time.sleep(interval)
+        current = {pack_dir: snapshot(pack_dir) for pack_dir in pack_dirs}
+        if all(current[d] == snapshots[d] for d in pack_dirs):
+            continue
+
+        # Debounce: wait until a poll sees no further change
+        while True:
+            time.sleep(interval)
+            settled = {pack_dir: snapshot(pack_dir) for pack_dir in pack_dirs}
+            if settled == current:
+                break
+            current = settled
+
+        changes = {d: changed_files(snapshots[d], current[d]) for d in pack_dirs}
+        snapshots.update(current)
+        changes = {d: paths for d, paths in changes.items() if paths}
+        if changes:
+            return changes
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Mutation-test the challenge test suites against DuckDB.
+
+This script:
+1. Derives wrong variants ("mutants") of each solution_sql (see harness/mutate.py):
+   dropped year filters, COUNT(DISTINCT) -> COUNT, >= -> >, <= -> <,
+   LEFT JOIN -> INNER JOIN and removed HAVING clauses
+2. Runs every mutant and its challenge's tests on a pool of workers sharing
+   the pack's loaded datasets
+3. Reports the mutants no test fails for ("survivors") per challenge
+
+A mutant that returns exactly the solution's rows is reported as equivalent:
+no test can fail for it on this data, so the dataset needs a row that tells
+the two apart. A mutant that fails to run (a SQL error) is reported as
+invalid: it isn't a wrong answer a learner could submit, so like equivalent
+mutants it is left out of the mutation score. A mutant that times out counts
+as killed.
+
+Outcomes are cached in .cache/mutants/ keyed like the test result cache
+(mutant SQL, tests, dataset hashes, DuckDB and grader versions), and
+challenges the result cache already knows pass are not re-tested.
+
+Usage:
+    python scripts/mutation-test.py [challenge_id] [--pack DIR | --all] [--jobs N]
+                                    [--operators year_filter,having,...] [--no-cache]
+                                    [--timeout-ms MS] [--quiet] [--report-json PATH]
+
+Examples:
+    python scripts/mutation-test.py                          # Meta pack
+    python scripts/mutation-test.py q8_users_3plus_calls     # One challenge
+    python scripts/mutation-test.py --all --report-json mutants.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from harness.cache import (
+    RESULTS_DIR, cached_result, challenge_key, dataset_hashes, load_result_cache, needed_tables, save_result_cache,
+    store_result, table_index,
+)
+from harness.config import config
+from harness.duck import open_pack_db
+from harness.grader import drop_result, is_timeout, result_fingerprint, run_solution, run_test
+from harness.mutate import OPERATORS, mutants
+from harness.pack import PACKS_DIR, discover_packs, load_pack, pack_label
+
+# ANSI color codes
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+CYAN = '\033[96m'
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+MUTANTS_DIR = RESULTS_DIR.parent / "mutants"
+STATUSES = ('killed', 'survived', 'equivalent', 'invalid', 'timeout')
+
+
+def check_original(conn, challenge, passed, timeout_ms=None):
+    """Run the solution once; returns ``{'passed', 'fingerprint'}`` or ``{'passed': False, 'error'}``.
+
+    ``passed`` is the solution's cached test outcome, or None to run its tests.
+    """
+    solution_sql = challenge['solution_sql']
+    result, error = run_solution(conn, solution_sql, timeout_ms)
+    if error:
+        return {'passed': False, 'error': error}
+    try:
+        if passed is None:
+            passed = all(run_test(conn, test, solution_sql, result, timeout_ms)[0]
+                         for test in challenge.get('tests', []))
+        return {'passed': passed, 'fingerprint': result_fingerprint(conn, result, timeout_ms)}
+    finally:
+        drop_result(conn, result)
+
+
+def run_mutant(conn, challenge, mutant, fingerprint, timeout_ms=None):
+    """Run one mutant and the challenge's tests; returns ``{'status', ...}``.
+
+    ``status`` is one of ``STATUSES``; killed mutants name the first failing
+    test in ``'killed_by'``.
+    """
+    result, error = run_solution(conn, mutant['sql'], timeout_ms)
+    if error:
+        return {'status': 'timeout' if is_timeout(error) else 'invalid', 'message': error}
+    try:
+        if result_fingerprint(conn, result, timeout_ms) == fingerprint:
+            return {'status': 'equivalent'}
+        for test in challenge.get('tests', []):
+            passed, msg = run_test(conn, test, mutant['sql'], result, timeout_ms)
+            if not passed:
+                if is_timeout(msg):
+                    return {'status': 'timeout', 'message': msg}
+                return {'status': 'killed', 'killed_by': test.get('name', 'unnamed')}
+        return {'status': 'survived'}
+    finally:
+        drop_result(conn, result)
+
+
+def parallel_map(conn, fn, items, jobs):
+    """``[fn(cursor, item) for item in items]`` on ``jobs`` threads, each with its own cursor."""
+    if jobs <= 1 or len(items) <= 1:
+        return [fn(conn, item) for item in items]
+
+    local = threading.local()
+    cursors = []
+    cursors_lock = threading.Lock()
+
+    def run_one(item):
+        if not hasattr(local, 'cursor'):
+            local.cursor = conn.cursor()
+            with cursors_lock:
+                cursors.append(local.cursor)
+        return fn(local.cursor, item)
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(run_one, items))
+    finally:
+        for cursor in cursors:
+            cursor.close()
+
+
+def mutate_pack(pack_dir, args):
+    """Mutation-test the selected challenges of a pack; returns its report."""
+    pack = load_pack(pack_dir)
+    challenges = [
+        c for c in pack['challenges']
+        if c.get('solution_sql') and (not args.challenge_id or c['id'] == args.challenge_id)
+    ]
+    report = {'pack': pack['id'], 'path': pack_label(pack_dir), 'challenges': []}
+    if not challenges:
+        return report
+
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Mutation testing: {pack['title']}{RESET}")
+    print(f"Path: {pack_label(pack_dir)}")
+    print(f"{CYAN}{'='*60}{RESET}")
+
+    results_cache = load_result_cache(pack_dir)
+    cache = {'files': {}, 'results': {}} if args.no_cache else load_result_cache(pack_dir, MUTANTS_DIR)
+    hashes = dataset_hashes(pack_dir, cache)
+
+    plans = []
+    for challenge in challenges:
+        key = challenge_key(challenge, hashes, args.timeout_ms)
+        cached = cached_result(results_cache, challenge['id'], key)
+        plans.append({
+            'challenge': challenge,
+            'key': key,
+            'solution_passed': cached['passed'] if cached else None,
+            'original': cached_result(cache, challenge['id'], key),
+            'mutants': [
+                {**m, 'key': challenge_key({**challenge, 'solution_sql': m['sql']}, hashes, args.timeout_ms)}
+                for m in mutants(challenge['solution_sql'], args.operators)
+            ],
+        })
+    for plan in plans:
+        for m in plan['mutants']:
+            m['outcome'] = cached_result(cache, f"{plan['challenge']['id']}/{m['id']}", m['key'])
+
+    dirty = [
+        p for p in plans
+        if any(m['outcome'] is None for m in p['mutants']) and (p['original'] is None or p['original']['passed'])
+    ]
+    total = sum(len(p['mutants']) for p in plans)
+    cached = sum(1 for p in plans for m in p['mutants'] if m['outcome'] is not None)
+    print(f"\n{CYAN}{total} mutants of {len(plans)} challenges, {cached} from cache{RESET}")
+
+    if dirty:
+        conn, _ = open_pack_db(pack_dir, tables=needed_tables(table_index(pack_dir), [p['challenge'] for p in dirty]))
+        originals = [p for p in dirty if p['original'] is None]
+        outcomes = parallel_map(
+            conn, lambda c, p: check_original(c, p['challenge'], p['solution_passed'], args.timeout_ms),
+            originals, args.jobs,
+        )
+        for plan, original in zip(originals, outcomes):
+            plan['original'] = original
+            if 'error' not in original:
+                store_result(cache, plan['challenge']['id'], plan['key'], original)
+
+        # Mutants of a solution that doesn't pass its own tests tell nothing
+        runnable = [
+            (p, m) for p in dirty if p['original'].get('passed')
+            for m in p['mutants'] if m['outcome'] is None
+        ]
+        outcomes = parallel_map(
+            conn, lambda c, pm: run_mutant(c, pm[0]['challenge'], pm[1], pm[0]['original']['fingerprint'],
+                                           args.timeout_ms),
+            runnable, args.jobs,
+        )
+        conn.close()
+        for (plan, m), outcome in zip(runnable, outcomes):
+            m['outcome'] = outcome
+            # Timeouts depend on machine load; always retry them
+            if outcome['status'] != 'timeout':
+                store_result(cache, f"{plan['challenge']['id']}/{m['id']}", m['key'], outcome)
+        save_result_cache(pack_dir, cache, MUTANTS_DIR)
+
+    for plan in plans:
+        report['challenges'].append(print_challenge(plan, args.quiet))
+    return report
+
+
+def print_challenge(plan, quiet=False):
+    """Print a challenge's mutant outcomes; returns its report entry."""
+    challenge = plan['challenge']
+    entry = {'id': challenge['id'], 'mutants': []}
+    original = plan['original'] or {}
+    if plan['mutants'] and not original.get('passed'):
+        reason = original.get('error') or "solution fails its own tests"
+        print(f"\n{YELLOW}⚠ {challenge['id']}: skipped ({reason}){RESET}")
+        entry['skipped'] = reason
+        return entry
+
+    counts = {status: 0 for status in STATUSES}
+    for m in plan['mutants']:
+        counts[m['outcome']['status']] += 1
+        entry['mutants'].append({k: m[k] for k in ('id', 'operator', 'description', 'context')} | m['outcome'])
+
+    summary = ", ".join(f"{n} {status}" for status, n in counts.items() if n) or "no mutants"
+    mark = f"{RED}✗" if counts['survived'] else f"{GREEN}✓"
+    if counts['survived'] or not quiet:
+        print(f"\n{mark} {challenge['id']}{RESET}: {summary}")
+    for m in plan['mutants']:
+        status = m['outcome']['status']
+        if status == 'survived':
+            print(f"  {RED}survived{RESET}   {m['id']}: {m['description']}")
+            print(f"             {m['context']}")
+        elif status == 'equivalent' and not quiet:
+            print(f"  {YELLOW}equivalent{RESET} {m['id']}: {m['description']} (same rows as the solution on this data)")
+            print(f"             {m['context']}")
+    return entry
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mutation-test challenge test suites.")
+    parser.add_argument('challenge_id', nargs='?', help="Only test this challenge")
+    parser.add_argument('--pack', action='append', type=Path, dest='packs', metavar='DIR',
+                        help="Pack directory (repeatable; default: pack_meta_interview)")
+    parser.add_argument('--all', action='store_true',
+                        help="Test every pack under public/packs and app/packs")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Worker threads running mutants (default: CPU count)")
+    parser.add_argument('--operators', type=lambda s: s.split(','), default=None,
+                        help=f"Comma-separated mutation operators (default: all of {','.join(OPERATORS)})")
+    parser.add_argument('--timeout-ms', type=int, default=config['limits']['timeoutMs'],
+                        help="Per-query time budget, 0 to disable (default: timeoutMs from app/config.json)")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore cached mutant outcomes")
+    parser.add_argument('--quiet', '-q', action='store_true', help="Only print challenges with survivors")
+    parser.add_argument('--report-json', type=Path, metavar='PATH', help="Write every mutant outcome as JSON")
+    args = parser.parse_args()
+    unknown = set(args.operators or []) - set(OPERATORS)
+    if unknown:
+        parser.error(f"unknown operators: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main():
+    args = parse_args()
+    pack_dirs = discover_packs() if args.all else (args.packs or [PACKS_DIR / "pack_meta_interview"])
+    reports = [mutate_pack(pack_dir, args) for pack_dir in pack_dirs]
+
+    outcomes = [m['status'] for r in reports for c in r['challenges'] for m in c['mutants']]
+    counts = {status: outcomes.count(status) for status in STATUSES}
+    # Equivalent and invalid mutants can't be told apart from the solution by tests
+    scored = counts['killed'] + counts['timeout'] + counts['survived']
+
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}SUMMARY{RESET}")
+    print(f"{CYAN}{'='*60}{RESET}")
+    print(f"Mutants: {len(outcomes)}")
+    for status in STATUSES:
+        print(f"  {status}: {counts[status]}")
+    if scored:
+        print(f"Mutation score: {(counts['killed'] + counts['timeout']) / scored:.0%}")
+
+    if args.report_json:
+        with open(args.report_json, 'w') as f:
+            json.dump({'packs': reports, 'counts': counts}, f, indent=2)
+
+    if counts['survived']:
+        print(f"\n{RED}✗ {counts['survived']} mutant(s) survived{RESET}\n")
+        sys.exit(1)
+    print(f"\n{GREEN}✓ Every mutant was killed{RESET}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Regrade a corpus of past submissions after a pack's tests changed.
+
+This script:
+1. Streams a JSONL file of submissions ({"challenge_id", "user_sql"} per
+   line) into an on-disk DuckDB work database, keyed by the SQL normalized
+   for whitespace, comments and trailing semicolons (harness/sqltext.py)
+2. Deduplicates the queries per challenge on that key inside DuckDB, which
+   spills to disk, so memory stays bounded however many submissions there
+   are; the first submission's own text is what gets graded
+3. Grades each unique query once against the old and the new tests on a
+   process pool. Every worker opens the pack's cached database read-only
+   and materializes each challenge's reference solution once: a query whose
+   result (rows in order, column names and types) matches an already graded
+   result reuses its verdicts without running any assertion. Queries whose
+   EXPLAIN estimate is over the time budget fail without running
+   (--no-precheck)
+4. Joins the verdicts back to the submissions and writes one parquet row per
+   submission whose verdict changed (or every submission, --all-rows)
+
+The old tests come from pack.json at a git revision (--old-rev, default HEAD)
+or from another pack.json file (--old-pack-json); the new tests are the
+working tree's pack.json.
+
+Output columns: line, submission_id, challenge_id, change (newly_passing,
+newly_failing, unchanged), old_pass, new_pass, old_failed, new_failed (names
+of the failing checks), error and sql (as submitted).
+
+Usage:
+    python scripts/regrade-submissions.py SUBMISSIONS.jsonl [--pack DIR] [--out PATH]
+                                          [--old-rev REV | --old-pack-json PATH] [--jobs N]
+                                          [--all-rows] [--timeout-ms MS] [--no-precheck] [--work-dir DIR]
+
+Examples:
+    python scripts/regrade-submissions.py attempts.jsonl --out regrade.parquet
+    python scripts/regrade-submissions.py attempts.jsonl --old-rev HEAD~3 --jobs 8
+    python scripts/regrade-submissions.py attempts.jsonl --old-pack-json /tmp/pack.old.json --all-rows
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from harness.config import config
+from harness.duck import open_pack_db, open_read_only
+from harness.grader import drop_result, grade_checks, is_timeout, result_fingerprint, run_solution
+from harness.pack import PACKS_DIR, load_pack, pack_label
+from harness.sqltext import normalize_sql
+from harness.timing import timed
+
+# ANSI color codes
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+CYAN = '\033[96m'
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+# Submissions parsed per insert into the work database
+READ_BATCH = 50000
+# Unique queries per task sent to a worker
+GRADE_BATCH = 200
+# Tasks in flight per worker; bounds the verdicts held in memory
+TASKS_PER_WORKER = 4
+# Verdicts each worker remembers by result fingerprint
+FINGERPRINT_MEMO = 50000
+# Distinct submission texts whose normalized SQL is remembered while reading
+NORMALIZE_MEMO = 100000
+
+VERDICT_SCHEMA = pa.schema([
+    ('digest', pa.string()),
+    ('old_pass', pa.bool_()),
+    ('new_pass', pa.bool_()),
+    ('old_failed', pa.string()),
+    ('new_failed', pa.string()),
+    ('error', pa.string()),
+    ('reused', pa.bool_()),
+])
+
+# Per-process state of the grading workers (see init_worker)
+_worker = {}
+
+
+def old_pack(pack_dir, old_rev=None, old_pack_json=None):
+    """The pack.json the submissions were graded with: a file, or pack.json at a git revision."""
+    if old_pack_json:
+        with open(old_pack_json, 'r') as f:
+            return json.load(f)
+    shown = subprocess.run(
+        ['git', 'show', f"{old_rev}:./pack.json"], cwd=pack_dir, capture_output=True, text=True,
+    )
+    if shown.returncode != 0:
+        raise SystemExit(f"{RED}✗ Could not read pack.json at {old_rev}: {shown.stderr.strip()}{RESET}")
+    return json.loads(shown.stdout)
+
+
+# Resubmissions are often byte-identical; normalize each distinct text once
+cached_normalize = lru_cache(maxsize=NORMALIZE_MEMO)(normalize_sql)
+
+
+def submission_digest(challenge_id, normalized):
+    return hashlib.sha1(f"{challenge_id}\0{normalized}".encode()).hexdigest()
+
+
+def read_submissions(path, conn):
+    """Stream the JSONL submissions into the ``submissions`` table of the work database.
+
+    Returns ``(count, skipped)``; lines that aren't JSON or lack a
+    challenge_id and user_sql (or sql) are skipped.
+    """
+    conn.execute("""
+        CREATE TABLE submissions (
+            line BIGINT, submission_id VARCHAR, challenge_id VARCHAR, digest VARCHAR, sql VARCHAR
+        )
+    """)
+    count = skipped = 0
+    batch = {name: [] for name in ('line', 'submission_id', 'challenge_id', 'digest', 'sql')}
+
+    def flush():
+        arrow_batch = pa.table(batch)
+        conn.execute("INSERT INTO submissions SELECT * FROM arrow_batch")
+        for values in batch.values():
+            values.clear()
+
+    with open(path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            try:
+                record = json.loads(line)
+                challenge_id = record['challenge_id']
+                sql = record.get('user_sql', record.get('sql'))
+                if not isinstance(sql, str):
+                    raise ValueError
+            except (ValueError, TypeError, KeyError):
+                if line.strip():
+                    skipped += 1
+                continue
+            normalized = cached_normalize(sql)
+            submission_id = record.get('submission_id', record.get('id'))
+            batch['line'].append(line_no)
+            batch['submission_id'].append(None if submission_id is None else str(submission_id))
+            batch['challenge_id'].append(challenge_id)
+            batch['digest'].append(submission_digest(challenge_id, normalized))
+            batch['sql'].append(sql)
+            count += 1
+            if len(batch['line']) >= READ_BATCH:
+                flush()
+    if batch['line']:
+        flush()
+    return count, skipped
+
+
+def init_worker(pack_dir, old_tests, new_tests, timeout_ms, max_rows, precheck):
+    """Open the pack read-only in a worker process; the parent already synced its cache."""
+    conn, _ = open_read_only(pack_dir, sync=False)
+    _worker.update({
+        'conn': conn,
+        'old_tests': old_tests,
+        'new_tests': new_tests,
+        'timeout_ms': timeout_ms,
+        'max_rows': max_rows,
+        'precheck': precheck,
+        'memo': {},
+        'solutions': set(),
+    })
+
+
+def failing(checks):
+    return ",".join(c['name'] for c in checks if not c['pass'])
+
+
+def grade_query(challenge_id, sql):
+    """Verdicts of one query against the old and new tests of its challenge.
+
+    Returns ``(old_pass, new_pass, old_failed, new_failed, error, reused)``;
+    a side is None when the challenge doesn't exist in that pack version.
+    """
+    w = _worker
+    old_tests, new_tests = w['old_tests'].get(challenge_id), w['new_tests'].get(challenge_id)
+    if old_tests is None and new_tests is None:
+        return None, None, None, None, f"Unknown challenge: {challenge_id}", False
+
+    conn, timeout_ms = w['conn'], w['timeout_ms']
+    result, error = run_solution(conn, sql, timeout_ms, precheck=w['precheck'])
+    try:
+        failed = 'execution_error'
+        if not error and w['max_rows'] is not None and result['rows'] > w['max_rows']:
+            error = f"Query returned {result['rows']} rows, exceeding limit of {w['max_rows']}"
+            failed = 'row_limit'
+        if error:
+            old, new = old_tests is not None, new_tests is not None
+            return (
+                False if old else None, False if new else None,
+                failed if old else None, failed if new else None, error, False,
+            )
+
+        try:
+            fingerprint = (challenge_id, result_fingerprint(conn, result, timeout_ms, ordered=True))
+        except Exception:
+            fingerprint = None
+        if fingerprint in w['memo']:
+            return (*w['memo'][fingerprint], True)
+
+        verdicts = []
+        timed_out = False
+        for tests in (old_tests, new_tests):
+            if tests is None:
+                verdicts.append((None, None))
+                continue
+            checks = grade_checks(conn, tests, sql, result, timeout_ms)
+            timed_out = timed_out or any(is_timeout(c.get('message')) for c in checks)
+            verdicts.append((all(c['pass'] for c in checks), failing(checks)))
+        graded = (verdicts[0][0], verdicts[1][0], verdicts[0][1], verdicts[1][1], None)
+
+        # Timeouts depend on machine load; don't let other queries reuse them
+        if fingerprint is not None and not timed_out:
+            if len(w['memo']) >= FINGERPRINT_MEMO:
+                w['memo'].pop(next(iter(w['memo'])))
+            w['memo'][fingerprint] = graded
+        return (*graded, False)
+    finally:
+        # Dropped before the next query, which could otherwise select from it
+        drop_result(conn, result)
+
+
+def grade_batch(queries):
+    """Grade ``[(digest, challenge_id, sql, solution_sql)]``; returns a pyarrow table of verdicts.
+
+    Each challenge's reference solution is graded first, once per worker, so
+    every correct submission reuses its verdicts.
+    """
+    rows = {name: [] for name in VERDICT_SCHEMA.names}
+    for digest, challenge_id, sql, solution_sql in queries:
+        if solution_sql and challenge_id not in _worker['solutions']:
+            _worker['solutions'].add(challenge_id)
+            grade_query(challenge_id, solution_sql)
+        verdict = grade_query(challenge_id, sql)
+        for name, value in zip(VERDICT_SCHEMA.names, (digest, *verdict)):
+            rows[name].append(value)
+    return pa.table(rows, schema=VERDICT_SCHEMA)
+
+
+def grade_unique(conn, pack_dir, old, new, verdicts_path, args):
+    """Grade every unique query of the work database on a process pool, writing verdicts to parquet.
+
+    Queries are handed out in challenge order, ``GRADE_BATCH`` at a time,
+    with at most ``TASKS_PER_WORKER`` tasks per worker in flight. Each
+    unique query runs as the text of its first submission: normalization
+    only decides which submissions share a verdict. Returns ``(unique,
+    reused)`` counts.
+    """
+    solutions = {c['id']: c.get('solution_sql') for c in new['challenges']}
+    tests = [{c['id']: c.get('tests', []) for c in pack['challenges']} for pack in (old, new)]
+    cursor = conn.execute("""
+        SELECT digest, challenge_id, sql
+        FROM (SELECT digest, any_value(challenge_id) AS challenge_id, arg_min(sql, line) AS sql
+              FROM submissions GROUP BY digest)
+        ORDER BY challenge_id, digest
+    """)
+
+    def batches():
+        while True:
+            chunk = cursor.fetchmany(GRADE_BATCH)
+            if not chunk:
+                return
+            yield [(digest, cid, sql, solutions.get(cid)) for digest, cid, sql in chunk]
+
+    unique = reused = 0
+    with pq.ParquetWriter(verdicts_path, VERDICT_SCHEMA) as writer, ProcessPoolExecutor(
+        max_workers=args.jobs, initializer=init_worker,
+        initargs=(pack_dir, *tests, args.timeout_ms, config['limits']['maxRowsLoadedPerPack'], not args.no_precheck),
+    ) as pool:
+        pending = set()
+        todo = batches()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < args.jobs * TASKS_PER_WORKER:
+                chunk = next(todo, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(grade_batch, chunk))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                table = future.result()
+                writer.write_table(table)
+                unique += table.num_rows
+                reused += sum(table.column('reused').to_pylist())
+            if not args.quiet:
+                print(f"\r{CYAN}Graded {unique} unique queries{RESET}", end='', flush=True)
+    if not args.quiet:
+        print()
+    return unique, reused
+
+
+def write_diff(conn, verdicts_path, out_path, all_rows=False):
+    """Join the verdicts back to the submissions and write the diff parquet; returns counts per change."""
+    changed = "" if all_rows else "WHERE change <> 'unchanged'"
+    verdicts_path, out_path = (str(p).replace("'", "''") for p in (verdicts_path, out_path))
+    conn.execute(f"""
+        CREATE VIEW diff AS
+        SELECT s.line, s.submission_id, s.challenge_id,
+               CASE WHEN v.old_pass IS NOT DISTINCT FROM v.new_pass THEN 'unchanged'
+                    WHEN v.new_pass THEN 'newly_passing'
+                    ELSE 'newly_failing' END AS change,
+               v.old_pass, v.new_pass, v.old_failed, v.new_failed, v.error, s.sql
+        FROM submissions s JOIN read_parquet('{verdicts_path}') v USING (digest)
+    """)
+    conn.execute(f"COPY (SELECT * FROM diff {changed} ORDER BY line) TO '{out_path}' (FORMAT parquet)")
+    return conn.execute("""
+        SELECT challenge_id, change, COUNT(*) FROM diff GROUP BY ALL ORDER BY challenge_id, change
+    """).fetchall()
+
+
+def print_summary(counts, submissions, unique, reused, timing):
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}SUMMARY{RESET}")
+    print(f"{CYAN}{'='*60}{RESET}")
+    print(f"Submissions: {submissions}, unique queries: {unique} "
+          f"({reused} reused a matching result's verdicts)")
+    print(f"Time: {timing['wall_ms'] / 1000:.1f}s")
+
+    by_challenge = {}
+    for challenge_id, change, n in counts:
+        by_challenge.setdefault(challenge_id, {})[change] = n
+    totals = {'newly_failing': 0, 'newly_passing': 0, 'unchanged': 0}
+    for challenge_id, changes in sorted(by_challenge.items()):
+        for change, n in changes.items():
+            totals[change] += n
+        if changes.get('newly_failing') or changes.get('newly_passing'):
+            print(f"  {challenge_id}: {RED}{changes.get('newly_failing', 0)} newly failing{RESET}, "
+                  f"{GREEN}{changes.get('newly_passing', 0)} newly passing{RESET}")
+    print(f"Newly failing: {totals['newly_failing']}, newly passing: {totals['newly_passing']}, "
+          f"unchanged: {totals['unchanged']}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Regrade past submissions against changed tests.")
+    parser.add_argument('submissions', type=Path, help="JSONL file of {challenge_id, user_sql} submissions")
+    parser.add_argument('--pack', type=Path, default=PACKS_DIR / "pack_meta_interview",
+                        help="Pack directory (default: public/packs/pack_meta_interview)")
+    parser.add_argument('--out', type=Path, default=Path("regrade.parquet"),
+                        help="Diff parquet file to write (default: regrade.parquet)")
+    old = parser.add_mutually_exclusive_group()
+    old.add_argument('--old-rev', default='HEAD', help="Git revision of the old pack.json (default: HEAD)")
+    old.add_argument('--old-pack-json', type=Path, metavar='PATH', help="Old pack.json file")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Grading processes (default: CPU count)")
+    parser.add_argument('--all-rows', action='store_true', help="Write unchanged submissions too")
+    parser.add_argument('--timeout-ms', type=int, default=config['limits']['timeoutMs'],
+                        help="Per-query time budget, 0 to disable (default: timeoutMs from app/config.json)")
+    parser.add_argument('--no-precheck', action='store_true',
+                        help="Run every query instead of failing ones estimated to exceed the time budget")
+    parser.add_argument('--memory-limit', default='1GB',
+                        help="DuckDB memory limit of the work database (default: 1GB)")
+    parser.add_argument('--work-dir', type=Path,
+                        help="Keep the work database and verdicts here (default: a temporary directory)")
+    parser.add_argument('--quiet', '-q', action='store_true', help="No progress output")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    new = load_pack(args.pack)
+    old = old_pack(args.pack, args.old_rev, args.old_pack_json)
+
+    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    print(f"{BOLD}Regrading: {new['title']}{RESET}")
+    print(f"Path: {pack_label(args.pack)}")
+    print(f"Old tests: {args.old_pack_json or args.old_rev}")
+    print(f"{CYAN}{'='*60}{RESET}\n")
+
+    # Sync the dataset cache once; workers open it read-only
+    conn, _ = open_pack_db(args.pack)
+    conn.close()
+
+    with tempfile.TemporaryDirectory(prefix="regrade_") as tmp, timed() as timing:
+        work_dir = args.work_dir or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        work_db = work_dir / "work.duckdb"
+        if work_db.exists():
+            work_db.unlink()
+        conn = duckdb.connect(str(work_db))
+        conn.execute(f"SET memory_limit = '{args.memory_limit}'")
+        conn.execute(f"SET temp_directory = '{work_dir / 'spill'}'")
+
+        submissions, skipped = read_submissions(args.submissions, conn)
+        print(f"{CYAN}Read {submissions} submissions{RESET}"
+              + (f" {YELLOW}({skipped} malformed lines skipped){RESET}" if skipped else ""))
+
+        verdicts_path = work_dir / "verdicts.parquet"
+        unique, reused = grade_unique(conn, args.pack, old, new, verdicts_path, args)
+        counts = write_diff(conn, verdicts_path, args.out, args.all_rows)
+        conn.close()
+
+    print_summary(counts, submissions, unique, reused, timing)
+    print(f"\nDiff written to {args.out}\n")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,18 +10,21 @@ Usage:
 """
 
 import json
-import duckdb
+from decimal import Decimal
 from pathlib import Path
 
+from harness.duck import open_pack_db
+from harness.grader import first_row
+
 def get_expected_values(conn, solution_sql):
     """Execute solution and return expected values."""
     sql = solution_sql.rstrip(';').strip()
     try:
-        result = conn.execute(sql).fetchdf()
-        if len(result) == 0:
+        # Return first row as dict (DECIMAL columns as floats)
+        row = first_row(conn, sql)
+        if not row:
             return None
-        # Return first row as dict
-        return result.iloc[0].to_dict()
+        return {k: float(v) if isinstance(v, Decimal) else v for k, v in row.items()}
     except Exception as e:
         print(f"Error executing solution: {e}")
         return None
@@ -63,16 +66,10 @@ def main():
     with open(pack_json, 'r') as f:
         pack = json.load(f)
 
-    # Create DuckDB connection and load data
-    conn = duckdb.connect(':memory:')
-
-    # Load datasets
-    parquet_files = list(pack_dir.glob("*.parquet"))
-    for parquet_file in parquet_files:
-        table_name = parquet_file.stem
-        conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM read_parquet('{parquet_file}')")
+    # Open DuckDB with the pack's datasets (shares the harness's dataset cache)
+    conn, datasets = open_pack_db(pack_dir)
 
-    print(f"Loaded {len(parquet_files)} datasets\n")
+    print(f"Loaded {len(datasets)} datasets\n")
 
     # Analyze each challenge
     for challenge in pack['challenges']:
@@ -3,25 +3,58 @@
 Test all challenge solutions against DuckDB to verify they produce correct results.
 
 This script:
-1. Loads all parquet files into DuckDB
+1. Loads the parquet files the selected challenges read into DuckDB (cached in
+   .cache/duckdb/ between runs, with the challenge -> tables index)
 2. Runs each challenge's solution_sql
 3. Runs each test assertion against the solution
 4. Reports pass/fail status
 
+Results are cached in .cache/results/ and reused for challenges whose SQL,
+tests and datasets haven't changed since the last run (--no-cache to re-run).
+
+With --watch the process stays alive after the run with the datasets loaded,
+and re-tests the challenges whose solution, tests or tables change on save.
+On Ctrl-C it exits 1 if any challenge failed its latest run, like a run
+without --watch.
+
 Usage:
-    python scripts/test-solutions-duckdb.py [challenge_id]
+    python scripts/test-solutions-duckdb.py [challenge_id] [--pack DIR | --all] [--jobs N] [--load MODE]
+                                            [--quiet] [--no-cache] [--no-db-cache]
+                                            [--timeout-ms MS] [--precheck] [--profile [--profile-dir DIR]]
+                                            [--report-json PATH] [--junit PATH] [--watch]
 
 Examples:
     python scripts/test-solutions-duckdb.py                    # Test all challenges
     python scripts/test-solutions-duckdb.py q2_mau_retention   # Test specific challenge
+    python scripts/test-solutions-duckdb.py --jobs 8           # Test challenges on 8 workers
+    python scripts/test-solutions-duckdb.py --load views       # Query parquet files in place
+    python scripts/test-solutions-duckdb.py --all              # Test every pack in the repo
+    python scripts/test-solutions-duckdb.py --all --junit results.xml --report-json timings.json
+    python scripts/test-solutions-duckdb.py q16_mutual_friends_count --profile
+    python scripts/test-solutions-duckdb.py --watch            # Re-test on every save
 """
 
-import json
+import argparse
 import sys
 import os
-import duckdb
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from harness.cache import (
+    cached_result, challenge_key, dataset_hashes, load_result_cache, needed_tables, save_result_cache, store_result,
+    table_index,
+)
+from harness.config import config
+from harness.duck import LOAD_MODES, load_strategies, open_pack_db, refresh_datasets
+from harness.grader import drop_result, fetch_result, is_timeout, run_solution, run_test
+from harness.pack import PACKS_DIR, discover_packs, load_pack, pack_key, pack_label
+from harness.profile import PROFILES_DIR, enable_profiling, top_operators, write_challenge_profiles
+from harness.report import pack_stats, write_json_report, write_junit_report
+from harness.timing import timed
+from harness.watch import snapshot, wait_for_changes
+
 # ANSI color codes
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -30,190 +63,471 @@ CYAN = '\033[96m'
 RESET = '\033[0m'
 BOLD = '\033[1m'
 
-def load_datasets(conn, pack_dir):
-    """Load all parquet files from the pack directory into DuckDB."""
-    parquet_files = list(Path(pack_dir).glob("*.parquet"))
-    print(f"\n{CYAN}Loading {len(parquet_files)} datasets...{RESET}")
-
-    for parquet_file in parquet_files:
-        table_name = parquet_file.stem
-        conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM read_parquet('{parquet_file}')")
-        row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-        print(f"  {table_name}: {row_count} rows")
-
-    print()
+# Browser query budget; queries above this share of it are flagged
+TIMEOUT_MS = config['limits']['timeoutMs']
+SLOW_QUERY_SHARE = 0.5
 
-def run_solution(conn, solution_sql):
-    """Execute the solution SQL and return results."""
-    # Remove trailing semicolon (matching grader behavior)
-    sql = solution_sql.rstrip(';').strip()
-    try:
-        result = conn.execute(sql).fetchdf()
-        return result, None
-    except Exception as e:
-        return None, str(e)
+def print_datasets(datasets, log=print):
+    """Print the datasets loaded by ``open_pack_db``."""
+    cached = sum(1 for d in datasets if d['status'] == 'cached')
+    from_cache = f" ({cached} from cache)" if cached else ""
+    log(f"\n{CYAN}Loading {len(datasets)} datasets{from_cache}...{RESET}")
 
-def run_test(conn, test, user_sql):
-    """Run a single test assertion and return (passed, message)."""
-    user_sql_clean = user_sql.rstrip(';').strip()
+    for dataset in datasets:
+        notes = [n for n in (dataset['kind'] == 'view' and 'view', dataset['status'] == 'rebuilt' and 'rebuilt') if n]
+        note = f" {YELLOW}({', '.join(notes)}){RESET}" if notes else ""
+        log(f"  {dataset['table']}: {dataset['rows']} rows{note}")
 
-    if test['assert'] == 'ROWCOUNT':
-        try:
-            result = conn.execute(user_sql_clean).fetchdf()
-            actual_count = len(result)
-            expected_count = test['expected']
-            passed = actual_count == expected_count
-            msg = f"Expected {expected_count} rows, got {actual_count}"
-            return passed, msg
-        except Exception as e:
-            return False, f"SQL Error: {e}"
+    log("")
 
-    elif test['assert'] == 'SQL':
-        try:
-            # Replace {{USER_SQL}} with the actual user SQL
-            test_sql = test['sql'].replace('{{USER_SQL}}', user_sql_clean)
-            result = conn.execute(test_sql).fetchdf()
-
-            # Check against expected
-            expected = test['expected']
-            if isinstance(expected, list) and len(expected) > 0:
-                # Compare first row
-                actual_row = result.iloc[0].to_dict() if len(result) > 0 else {}
-                expected_row = expected[0]
-
-                passed = True
-                msg_parts = []
-                for key, exp_val in expected_row.items():
-                    if key in actual_row:
-                        act_val = actual_row[key]
-                        # Handle boolean comparisons
-                        if isinstance(exp_val, bool):
-                            act_val = bool(act_val)
-                        if act_val != exp_val:
-                            passed = False
-                            msg_parts.append(f"{key}: expected {exp_val}, got {act_val}")
-                    else:
-                        passed = False
-                        msg_parts.append(f"Missing key: {key}")
-
-                msg = "; ".join(msg_parts) if msg_parts else "OK"
-                return passed, msg
-            else:
-                return True, "No expected value to compare"
-        except Exception as e:
-            return False, f"SQL Error: {e}"
+def test_challenge(conn, challenge, verbose=True, log=print, timeout_ms=None, profile=False, precheck=False):
+    """Test a single challenge and return results.
 
-    elif test['assert'] == 'SCHEMA_EQ':
-        try:
-            result = conn.execute(user_sql_clean).fetchdf()
-            actual_cols = list(result.columns)
-            expected_cols = test.get('expected_columns', [])
-            passed = actual_cols == expected_cols
-            msg = f"Expected columns {expected_cols}, got {actual_cols}"
-            return passed, msg
-        except Exception as e:
-            return False, f"SQL Error: {e}"
-
-    else:
-        return True, f"Unknown assert type: {test['assert']}"
-
-def test_challenge(conn, challenge, verbose=True):
-    """Test a single challenge and return results."""
+    Output goes through ``log`` so parallel runs can buffer it per challenge.
+    Every query gets ``timeout_ms``; timeouts are flagged with ``'timeout'``.
+    With ``precheck``, a solution whose estimated cost is over ``timeout_ms``
+    isn't run and counts as timed out.
+    With ``profile``, the query profiles are returned under ``'profiles'``.
+    """
     challenge_id = challenge['id']
     title = challenge['title']
     solution_sql = challenge.get('solution_sql', '')
     tests = challenge.get('tests', [])
 
     if verbose:
-        print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
-        print(f"{BOLD}Challenge: {title}{RESET}")
-        print(f"ID: {challenge_id}")
-        print(f"{CYAN}{'='*60}{RESET}")
+        log(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+        log(f"{BOLD}Challenge: {title}{RESET}")
+        log(f"ID: {challenge_id}")
+        log(f"{CYAN}{'='*60}{RESET}")
 
     if not solution_sql:
         if verbose:
-            print(f"{RED}  ❌ No solution_sql provided{RESET}")
+            log(f"{RED}  ❌ No solution_sql provided{RESET}")
         return {'id': challenge_id, 'passed': False, 'error': 'No solution'}
 
     # Run the solution
     if verbose:
-        print(f"\n{YELLOW}Solution SQL:{RESET}")
-        print(f"  {solution_sql[:100]}..." if len(solution_sql) > 100 else f"  {solution_sql}")
+        log(f"\n{YELLOW}Solution SQL:{RESET}")
+        log(f"  {solution_sql[:100]}..." if len(solution_sql) > 100 else f"  {solution_sql}")
 
-    result_df, error = run_solution(conn, solution_sql)
+    profiles = None
+    if profile:
+        enable_profiling(conn)
+        profiles = []
+
+    # Materialized once; every test below reads the stored result
+    with timed() as solution_timing:
+        result, error = run_solution(conn, solution_sql, timeout_ms, profiles, precheck)
+    queries = [{'query': 'solution', 'profile': p} for p in profiles or []]
 
     if error:
         if verbose:
-            print(f"\n{RED}  ❌ Solution Error: {error}{RESET}")
-        return {'id': challenge_id, 'passed': False, 'error': error}
+            log(f"\n{RED}  ❌ Solution Error: {error}{RESET}")
+        return {'id': challenge_id, 'passed': False, 'error': error, 'timeout': is_timeout(error),
+                'solution': solution_timing, **solution_timing, **({'profiles': queries} if profile else {})}
 
     if verbose:
-        print(f"\n{GREEN}  ✓ Solution executed successfully ({len(result_df)} rows){RESET}")
-        if len(result_df) <= 10:
-            print(f"\n  Result preview:")
-            print(result_df.to_string(index=False).replace('\n', '\n  '))
+        log(f"\n{GREEN}  ✓ Solution executed successfully ({result['rows']} rows, "
+            f"{solution_timing['wall_ms']:.1f} ms){RESET}")
+        if result['rows'] <= 10:
+            log(f"\n  Result preview:")
+            log(fetch_result(conn, result).to_string(index=False).replace('\n', '\n  '))
 
     # Run tests
     if verbose:
-        print(f"\n{CYAN}Running {len(tests)} tests:{RESET}")
+        log(f"\n{CYAN}Running {len(tests)} tests:{RESET}")
 
     all_passed = True
     test_results = []
 
     for test in tests:
         test_name = test.get('name', 'unnamed')
-        passed, msg = run_test(conn, test, solution_sql)
-        test_results.append({'name': test_name, 'passed': passed, 'message': msg})
+        test_profiles = [] if profile else None
+        with timed() as test_timing:
+            passed, msg = run_test(conn, test, solution_sql, result, timeout_ms, test_profiles)
+        queries.extend({'query': test_name, 'profile': p} for p in test_profiles or [])
+        test_results.append({'name': test_name, 'passed': passed, 'message': msg,
+                             'timeout': not passed and is_timeout(msg), **test_timing})
 
         if passed:
             if verbose:
-                print(f"  {GREEN}✓ {test_name}{RESET}")
+                log(f"  {GREEN}✓ {test_name}{RESET}")
         else:
             all_passed = False
             if verbose:
-                print(f"  {RED}✗ {test_name}: {msg}{RESET}")
+                log(f"  {RED}✗ {test_name}: {msg}{RESET}")
+    drop_result(conn, result)
 
-    return {
+    challenge_result = {
         'id': challenge_id,
         'title': title,
         'passed': all_passed,
-        'tests': test_results
+        'timeout': any(t['timeout'] for t in test_results),
+        'tests': test_results,
+        'solution': {'rows': result['rows'], **solution_timing},
+        'wall_ms': solution_timing['wall_ms'] + sum(t['wall_ms'] for t in test_results),
+        'cpu_ms': solution_timing['cpu_ms'] + sum(t['cpu_ms'] for t in test_results),
     }
+    if profile:
+        challenge_result['profiles'] = queries
+    return challenge_result
+
+def run_challenges(conn, challenges, jobs=1, verbose=True, log=print, timeout_ms=None, profile=False,
+                   precheck=False):
+    """Test challenges serially or on a pool of ``jobs`` worker threads.
+
+    Each worker gets its own cursor onto the already-loaded in-memory database
+    (DuckDB releases the GIL while executing), and output is buffered per
+    challenge so it is printed in pack order once the challenge finishes.
+    """
+    if jobs <= 1 or len(challenges) <= 1:
+        return [test_challenge(conn, challenge, verbose=verbose, log=log, timeout_ms=timeout_ms, profile=profile,
+                               precheck=precheck)
+                for challenge in challenges]
+
+    local = threading.local()
+    cursors = []
+    cursors_lock = threading.Lock()
+
+    def worker_conn():
+        if not hasattr(local, 'cursor'):
+            local.cursor = conn.cursor()
+            with cursors_lock:
+                cursors.append(local.cursor)
+        return local.cursor
+
+    def run_one(challenge):
+        lines = []
+        result = test_challenge(worker_conn(), challenge, verbose=verbose, log=lines.append,
+                                timeout_ms=timeout_ms, profile=profile, precheck=precheck)
+        return result, lines
 
-def main():
-    pack_dir = Path(__file__).parent.parent / "public" / "packs" / "pack_meta_interview"
-    pack_json = pack_dir / "pack.json"
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            # map() yields in submission order, so output stays deterministic
+            for result, lines in pool.map(run_one, challenges):
+                for line in lines:
+                    log(line)
+                results.append(result)
+    finally:
+        for cursor in cursors:
+            cursor.close()
+
+    return results
+
+def save_profiles(pack_dir, results, args, log=print):
+    """Write each challenge's query profiles and print the pack's most expensive operators.
+
+    Removes the ``'profiles'`` entries from ``results``.
+    """
+    key = pack_key(pack_dir)
+    challenge_profiles = {}
+    for challenge_id, result in results.items():
+        queries = result.pop('profiles', [])
+        write_challenge_profiles(args.profile_dir, key, challenge_id, queries)
+        challenge_profiles[challenge_id] = queries
+
+    log(f"\n{CYAN}Profiles written to {args.profile_dir / key}/{RESET}")
+    log(f"{CYAN}Top {args.profile_top} operators by time:{RESET}")
+    for op in top_operators(challenge_profiles, args.profile_top):
+        log(f"  {op['seconds'] * 1000:>8.2f} ms  {op['operator']:<20} {op['rows']:>10} rows  "
+            f"{op['challenge']} / {op['query']}")
+
+def select_challenges(pack, challenge_id=None):
+    """The pack's challenges, or only ``challenge_id`` if given."""
+    return [
+        challenge for challenge in pack['challenges']
+        if not challenge_id or challenge['id'] == challenge_id
+    ]
+
+def test_pack(pack_dir, args, log=print):
+    """Test the selected challenges of one pack on its own DuckDB connection.
+
+    Returns the pack report: ``{'pack', 'title', 'path', 'datasets',
+    'challenges'}`` with one result per selected challenge (none if the pack
+    has no selected challenges).
+    """
+    pack = load_pack(pack_dir)
+    challenges = select_challenges(pack, args.challenge_id)
+    report = {'pack': pack['id'], 'title': pack['title'], 'path': pack_label(pack_dir),
+              'datasets': [], 'challenges': []}
+    if not challenges:
+        return report
+
+    log(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
+    log(f"{BOLD}Testing Pack: {pack['title']}{RESET}")
+    log(f"Path: {pack_label(pack_dir)}")
+    log(f"Challenges: {len(pack['challenges'])}")
+    log(f"{CYAN}{'='*60}{RESET}")
+
+    # Reuse results of challenges whose SQL, tests and datasets are unchanged
+    # (profiling needs every challenge to actually run)
+    cache = None if args.no_cache else load_result_cache(pack_dir)
+    keys = {}
+    cached = {}
+    if cache is not None:
+        hashes = dataset_hashes(pack_dir, cache)
+        for challenge in challenges:
+            keys[challenge['id']] = challenge_key(challenge, hashes, args.timeout_ms, args.precheck)
+            result = None if args.profile else cached_result(cache, challenge['id'], keys[challenge['id']])
+            if result is not None:
+                cached[challenge['id']] = result
+
+    if cached:
+        log(f"\n{CYAN}Reusing {len(cached)} unchanged results (--no-cache to re-run):{RESET}")
+        if not args.quiet:
+            for challenge in challenges:
+                result = cached.get(challenge['id'])
+                if result is not None:
+                    mark = f"{GREEN}✓" if result['passed'] else f"{RED}✗"
+                    log(f"  {mark} {challenge['id']}{RESET}")
+
+    dirty = [challenge for challenge in challenges if challenge['id'] not in cached]
+    fresh = {}
+    if dirty:
+        # Open DuckDB with the datasets these challenges read (reusing the on-disk cache)
+        strategies = load_strategies(pack_dir, args.load, dirty)
+        tables = needed_tables(table_index(pack_dir), dirty)
+        conn, datasets = open_pack_db(pack_dir, use_cache=not args.no_db_cache, strategies=strategies,
+                                      tables=tables)
+        print_datasets(datasets, log=log)
+        report['datasets'] = datasets
+
+        # Test challenges
+        results = run_challenges(conn, dirty, jobs=args.jobs, verbose=not args.quiet, log=log,
+                                 timeout_ms=args.timeout_ms, profile=args.profile, precheck=args.precheck)
+        for result in results:
+            fresh[result['id']] = result
+        conn.close()
+
+        if args.profile:
+            save_profiles(pack_dir, fresh, args, log=log)
+
+    if cache is not None and fresh:
+        for challenge_id, result in fresh.items():
+            # Timeouts depend on machine load; always retry them
+            if not result.get('timeout'):
+                store_result(cache, challenge_id, keys[challenge_id], result)
+        save_result_cache(pack_dir, cache)
+
+    report['challenges'] = [
+        {**cached[c['id']], 'cached': True} if c['id'] in cached else {**fresh[c['id']], 'cached': False}
+        for c in challenges
+    ]
+    return report
+
+def run_packs(pack_dirs, args):
+    """Test packs concurrently, printing each pack's output in order.
+
+    Returns the list of pack reports from ``test_pack``.
+    """
+    if len(pack_dirs) == 1:
+        return [test_pack(pack_dirs[0], args)]
+
+    def run_one(pack_dir):
+        lines = []
+        return test_pack(pack_dir, args, log=lines.append), lines
+
+    reports = []
+    with ThreadPoolExecutor(max_workers=min(len(pack_dirs), os.cpu_count() or 1)) as pool:
+        for report, lines in pool.map(run_one, pack_dirs):
+            for line in lines:
+                print(line)
+            reports.append(report)
+    return reports
+
+def start_watch_session(pack_dir, args, report):
+    """Open a pack's database for --watch and record what its challenges were last tested against.
+
+    ``report`` is the pack's report from the initial run; its failing
+    challenges are tracked in ``'failing'`` as they are re-tested.
+    """
+    pack = load_pack(pack_dir)
+    challenges = select_challenges(pack, args.challenge_id)
+    strategies = load_strategies(pack_dir, args.load, challenges)
+    conn, _ = open_pack_db(pack_dir, use_cache=not args.no_db_cache, strategies=strategies)
+    cache = {'files': {}, 'results': {}} if args.no_cache else load_result_cache(pack_dir)
+    hashes = dataset_hashes(pack_dir, cache)
+    return {
+        'dir': pack_dir,
+        'pack': pack,
+        'conn': conn,
+        'strategies': strategies,
+        'cache': cache,
+        'keys': {c['id']: challenge_key(c, hashes, args.timeout_ms, args.precheck) for c in challenges},
+        'failing': {r['id'] for r in report['challenges'] if not r['passed']},
+    }
 
-    if not pack_json.exists():
-        print(f"{RED}Error: pack.json not found at {pack_json}{RESET}")
-        sys.exit(1)
+def retest_watch_session(session, changed, args):
+    """Reload what changed in a watched pack and re-test the affected challenges.
 
-    # Load pack
-    with open(pack_json, 'r') as f:
-        pack = json.load(f)
+    A challenge is affected when its cache key changed: its solution or
+    tests, or the content of a table it reads.
+    """
+    pack_dir = session['dir']
+    conn = session['conn']
+    changed = [Path(path) for path in changed]
 
-    print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
-    print(f"{BOLD}Testing Pack: {pack['title']}{RESET}")
-    print(f"Challenges: {len(pack['challenges'])}")
-    print(f"{CYAN}{'='*60}{RESET}")
+    if any(path.name == 'pack.json' for path in changed):
+        try:
+            session['pack'] = load_pack(pack_dir)
+        except ValueError as e:
+            print(f"{RED}  pack.json is not valid JSON: {e}{RESET}")
+            return
 
-    # Create DuckDB connection
-    conn = duckdb.connect(':memory:')
+    tables = {path.stem for path in changed if path.suffix == '.parquet'}
+    if tables:
+        try:
+            datasets = refresh_datasets(conn, pack_dir, tables, session['strategies'])
+        except Exception as e:
+            print(f"{RED}  Could not reload {', '.join(sorted(tables))}: {e}{RESET}")
+            return
+        for dataset in datasets:
+            print(f"  {CYAN}{dataset['table']}: {dataset['rows']} rows ({dataset['status']}){RESET}")
+
+    hashes = dataset_hashes(pack_dir, session['cache'])
+    challenges = select_challenges(session['pack'], args.challenge_id)
+    keys = {c['id']: challenge_key(c, hashes, args.timeout_ms, args.precheck) for c in challenges}
+    dirty = [c for c in challenges if session['keys'].get(c['id']) != keys[c['id']]]
+    session['keys'] = keys
+    session['failing'] &= keys.keys()
+    if not dirty:
+        print(f"  {CYAN}No challenge affected{RESET}")
+        return
+
+    results = run_challenges(conn, dirty, jobs=args.jobs, verbose=not args.quiet,
+                             timeout_ms=args.timeout_ms, precheck=args.precheck)
+    for result in results:
+        if result['passed']:
+            session['failing'].discard(result['id'])
+        else:
+            session['failing'].add(result['id'])
+        mark = f"{GREEN}✓" if result['passed'] else f"{RED}✗"
+        print(f"  {mark} {result['id']}{RESET} ({result.get('wall_ms', 0):.0f} ms)")
+        if not result['passed']:
+            if 'error' in result:
+                print(f"    Error: {result['error']}")
+            for t in result.get('tests', []):
+                if not t['passed']:
+                    print(f"    - {t['name']}: {t['message']}")
+        if not args.no_cache and not result.get('timeout'):
+            store_result(session['cache'], result['id'], keys[result['id']], result)
+    if not args.no_cache:
+        save_result_cache(pack_dir, session['cache'])
+
+def watch_packs(pack_dirs, args, reports):
+    """Keep the packs' datasets loaded and re-test challenges whenever their files change.
+
+    ``reports`` are the initial run's pack reports, in ``pack_dirs`` order.
+    Returns the number of challenges failing when the watch is stopped.
+    """
+    sessions = {pack_dir: start_watch_session(pack_dir, args, report)
+                for pack_dir, report in zip(pack_dirs, reports)}
+    snapshots = {pack_dir: snapshot(pack_dir) for pack_dir in pack_dirs}
+    print(f"{CYAN}Watching {len(pack_dirs)} pack(s) for changes (Ctrl-C to stop)...{RESET}")
+    try:
+        while True:
+            changes = wait_for_changes(pack_dirs, snapshots, args.watch_interval)
+            for pack_dir, changed in changes.items():
+                start = time.perf_counter()
+                names = ", ".join(sorted(Path(path).name for path in changed))
+                print(f"\n{BOLD}{pack_label(pack_dir)}{RESET}: {names} changed")
+                retest_watch_session(sessions[pack_dir], changed, args)
+                print(f"{CYAN}Done in {(time.perf_counter() - start) * 1000:.0f} ms{RESET}")
+    except KeyboardInterrupt:
+        print()
+    finally:
+        for session in sessions.values():
+            session['conn'].close()
+    return sum(len(session['failing']) for session in sessions.values())
+
+def print_timing_summary(reports, top=5):
+    """Print p50/p95/max timings and the slowest challenges against the browser's timeout."""
+    for report in reports:
+        stats = pack_stats(report)
+        if not stats['challenge']['count']:
+            continue
+        label = f" for {report['path']}" if len(reports) > 1 else ""
+        print(f"\n{CYAN}Timing{label} (ms, p50 / p95 / max):{RESET}")
+        for step in ('dataset_load', 'solution', 'assertion', 'challenge'):
+            st = stats[step]
+            print(f"  {step:<13} {st['p50_ms']:>8.1f} / {st['p95_ms']:>8.1f} / {st['max_ms']:>8.1f}  (n={st['count']})")
+
+    # Queries near timeoutMs are the ones learners may hit in the browser
+    timed_challenges = [
+        (report, c) for report in reports for c in report['challenges']
+        if 'solution' in c and not c.get('cached')
+    ]
+    slowest = sorted(
+        timed_challenges,
+        key=lambda rc: max([rc[1]['solution']['wall_ms']] + [t['wall_ms'] for t in rc[1].get('tests', [])]),
+        reverse=True,
+    )[:top]
+    if slowest:
+        print(f"\n{CYAN}Slowest queries (timeoutMs: {TIMEOUT_MS}):{RESET}")
+        for report, c in slowest:
+            query_ms = max([c['solution']['wall_ms']] + [t['wall_ms'] for t in c.get('tests', [])])
+            share = query_ms / TIMEOUT_MS
+            color = RED if share >= 1 else YELLOW if share >= SLOW_QUERY_SHARE else GREEN
+            prefix = f"{report['path']}/" if len(reports) > 1 else ""
+            print(f"  {color}{prefix}{c['id']}: {query_ms:.1f} ms ({share:.0%} of budget){RESET}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Test challenge solutions against DuckDB.")
+    parser.add_argument('challenge_id', nargs='?', help="Only test this challenge")
+    parser.add_argument('--pack', action='append', type=Path, dest='packs', metavar='DIR',
+                        help="Pack directory to test (repeatable; default: pack_meta_interview)")
+    parser.add_argument('--all', action='store_true',
+                        help="Test every pack under public/packs and app/packs, packs running concurrently")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Number of challenges to test concurrently (default: 1)")
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help="Only print the summary (skips result previews and the pandas import)")
+    parser.add_argument('--timeout-ms', type=int, default=TIMEOUT_MS,
+                        help=f"Per-query time budget, 0 to disable (default: timeoutMs from app/config.json, {TIMEOUT_MS})")
+    parser.add_argument('--precheck', action='store_true',
+                        help="Skip solutions whose EXPLAIN-estimated cost is over the time budget (counted as timeouts)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile every query, save JSON profiles per challenge and print the top operators")
+    parser.add_argument('--profile-dir', type=Path, default=PROFILES_DIR, metavar='DIR',
+                        help="Where --profile writes <pack path>/<challenge>.json (default: .cache/profiles)")
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N',
+                        help="Number of operators --profile prints (default: 10)")
+    parser.add_argument('--report-json', type=Path, metavar='PATH',
+                        help="Write timings and results as JSON")
+    parser.add_argument('--junit', type=Path, metavar='PATH',
+                        help="Write results as JUnit XML")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-run every challenge instead of reusing unchanged results")
+    parser.add_argument('--no-db-cache', action='store_true',
+                        help="Load datasets into memory instead of the cached .duckdb database")
+    parser.add_argument('--load', choices=LOAD_MODES, default='tables',
+                        help="Import datasets as tables, register them as parquet views, "
+                             "or pick per dataset from file size and usage (default: tables)")
+    parser.add_argument('--watch', action='store_true',
+                        help="After the run, keep the datasets loaded and re-test challenges affected by edits "
+                             "to pack.json or the parquet files")
+    parser.add_argument('--watch-interval', type=float, default=0.1, metavar='SECONDS',
+                        help="How often --watch checks the files (default: 0.1)")
+    return parser.parse_args()
 
-    # Load all datasets
-    load_datasets(conn, pack_dir)
+def main():
+    args = parse_args()
 
-    # Get specific challenge ID if provided
-    target_challenge = sys.argv[1] if len(sys.argv) > 1 else None
+    if args.all:
+        pack_dirs = discover_packs()
+    else:
+        pack_dirs = args.packs or [PACKS_DIR / "pack_meta_interview"]
 
-    # Test challenges
-    results = []
-    for challenge in pack['challenges']:
-        if target_challenge and challenge['id'] != target_challenge:
-            continue
+    for pack_dir in pack_dirs:
+        pack_json = pack_dir / "pack.json"
+        if not pack_json.exists():
+            print(f"{RED}Error: pack.json not found at {pack_json}{RESET}")
+            sys.exit(1)
 
-        result = test_challenge(conn, challenge, verbose=True)
-        results.append(result)
+    reports = run_packs(pack_dirs, args)
+    results = [r for report in reports for r in report['challenges']]
 
     # Summary
     print(f"\n{BOLD}{CYAN}{'='*60}{RESET}")
@@ -223,14 +537,29 @@ def main():
     passed = sum(1 for r in results if r['passed'])
     failed = len(results) - passed
 
+    if len(reports) > 1:
+        print()
+        for report in reports:
+            pack_passed = sum(1 for r in report['challenges'] if r['passed'])
+            color = GREEN if pack_passed == len(report['challenges']) else RED
+            print(f"  {color}{report['path']}: {pack_passed}/{len(report['challenges'])} passed{RESET}")
+
+    print_timing_summary(reports)
+
     print(f"\n{GREEN}✓ Passed: {passed}{RESET}")
     print(f"{RED}✗ Failed: {failed}{RESET}")
+    timed_out = sum(1 for r in results if r.get('timeout'))
+    if timed_out:
+        print(f"{YELLOW}⏱ Timed out: {timed_out} (budget {args.timeout_ms} ms){RESET}")
 
     if failed > 0:
         print(f"\n{RED}Failed challenges:{RESET}")
-        for r in results:
-            if not r['passed']:
-                print(f"  - {r['id']}: {r.get('title', 'Unknown')}")
+        for report in reports:
+            for r in report['challenges']:
+                if r['passed']:
+                    continue
+                prefix = f"{report['path']}/" if len(reports) > 1 else ""
+                print(f"  - {prefix}{r['id']}: {r.get('title', 'Unknown')}")
                 if 'error' in r:
                     print(f"    Error: {r['error']}")
                 elif 'tests' in r:
@@ -240,7 +569,16 @@ def main():
 
     print(f"\n{CYAN}{'='*60}{RESET}\n")
 
-    conn.close()
+    if args.report_json:
+        write_json_report(args.report_json, reports, TIMEOUT_MS)
+        print(f"JSON report: {args.report_json}")
+    if args.junit:
+        write_junit_report(args.junit, reports)
+        print(f"JUnit report: {args.junit}")
+
+    if args.watch:
+        failed = watch_packs(pack_dirs, args, reports)
+
     sys.exit(0 if failed == 0 else 1)
 
 if __name__ == "__main__":
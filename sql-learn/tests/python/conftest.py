@@ -0,0 +1,11 @@
+"""
+Pytest setup for the Python test harness (scripts/harness).
+
+The scripts import the harness as ``harness.*`` from the scripts directory,
+so the tests do the same.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
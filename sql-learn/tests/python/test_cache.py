@@ -0,0 +1,46 @@
+"""
+Tests for harness/cache.py's result cache keys.
+
+Run with: python -m pytest tests/python
+"""
+
+from harness.cache import cached_result, challenge_key, store_result
+
+CHALLENGE = {
+    'id': 'q1',
+    'solution_sql': "SELECT user_id FROM users",
+    'tests': [{'name': 'rows', 'assert': 'ROWCOUNT', 'expected': 3}],
+}
+HASHES = {'users': 'a' * 64, 'posts': 'b' * 64}
+
+
+def test_key_is_stable():
+    assert challenge_key(CHALLENGE, HASHES) == challenge_key(dict(CHALLENGE), dict(HASHES))
+
+
+def test_key_covers_sql_tests_and_read_datasets():
+    key = challenge_key(CHALLENGE, HASHES)
+    assert challenge_key({**CHALLENGE, 'solution_sql': "SELECT * FROM users"}, HASHES) != key
+    assert challenge_key({**CHALLENGE, 'tests': []}, HASHES) != key
+    assert challenge_key(CHALLENGE, {**HASHES, 'users': 'c' * 64}) != key
+    # posts isn't read by the challenge
+    assert challenge_key(CHALLENGE, {**HASHES, 'posts': 'c' * 64}) == key
+
+
+def test_key_covers_timeout_and_precheck():
+    key = challenge_key(CHALLENGE, HASHES, timeout_ms=1500)
+    assert challenge_key(CHALLENGE, HASHES, timeout_ms=100) != key
+    assert challenge_key(CHALLENGE, HASHES) != key
+    assert challenge_key(CHALLENGE, HASHES, timeout_ms=1500, precheck=True) != key
+    # No budget, no pre-check: the flag changes nothing
+    assert challenge_key(CHALLENGE, HASHES, precheck=True) == challenge_key(CHALLENGE, HASHES)
+    assert challenge_key(CHALLENGE, HASHES, timeout_ms=0) == challenge_key(CHALLENGE, HASHES)
+
+
+def test_cached_result_needs_the_same_key():
+    cache = {'files': {}, 'results': {}}
+    key = challenge_key(CHALLENGE, HASHES, timeout_ms=1500)
+    store_result(cache, 'q1', key, {'passed': True})
+    assert cached_result(cache, 'q1', key) == {'passed': True}
+    assert cached_result(cache, 'q1', challenge_key(CHALLENGE, HASHES, timeout_ms=100)) is None
+    assert cached_result(cache, 'q2', key) is None
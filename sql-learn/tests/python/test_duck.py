@@ -0,0 +1,87 @@
+"""
+Tests for harness/duck.py's read-only pack connections.
+
+Run with: python -m pytest tests/python
+"""
+
+import subprocess
+import sys
+
+import duckdb
+import pytest
+
+from harness import duck
+from harness.duck import cache_path, open_read_only
+
+
+@pytest.fixture
+def pack_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(duck, 'CACHE_DIR', tmp_path / "cache")
+    pack_dir = tmp_path / "pack"
+    pack_dir.mkdir()
+    duckdb.execute(f"COPY (SELECT range AS id FROM range(3)) TO '{pack_dir / 'items.parquet'}'")
+    (tmp_path / "secret.csv").write_text("token\nhunter2\n")
+    return pack_dir
+
+
+@pytest.fixture
+def conn(pack_dir):
+    conn, datasets = open_read_only(pack_dir)
+    assert [d['table'] for d in datasets] == ['items']
+    yield conn
+    conn.close()
+
+
+def test_reads_datasets_and_temp_tables(conn):
+    cursor = conn.cursor()
+    assert cursor.execute("SELECT COUNT(*) FROM items").fetchone() == (3,)
+    cursor.execute("CREATE TEMP TABLE t AS SELECT * FROM items")
+    assert cursor.execute("SELECT SUM(id) FROM t").fetchone() == (3,)
+
+
+def test_datasets_are_read_only(conn):
+    with pytest.raises(duckdb.Error):
+        conn.execute("DROP TABLE items")
+    with pytest.raises(duckdb.Error):
+        conn.execute("DELETE FROM items")
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM read_csv('{secret}')",
+    "SELECT * FROM read_text('{secret}')",
+    "SELECT * FROM glob('{dir}/*')",
+    "COPY (SELECT 1) TO '{dir}/out.csv'",
+    "ATTACH '{dir}/other.duckdb'",
+])
+def test_host_files_are_off_limits(conn, pack_dir, sql):
+    sql = sql.format(secret=pack_dir.parent / "secret.csv", dir=pack_dir.parent)
+    with pytest.raises(duckdb.PermissionException):
+        conn.cursor().execute(sql)
+
+
+@pytest.mark.parametrize("sql", [
+    "SET enable_external_access = true",
+    "SET lock_configuration = false",
+    "RESET lock_configuration",
+])
+def test_configuration_is_locked(conn, sql):
+    with pytest.raises(duckdb.Error):
+        conn.cursor().execute(sql)
+
+
+def test_locked_cache_fails_instead_of_falling_back(pack_dir):
+    # Sync the cache, then hold its write lock from another process
+    open_read_only(pack_dir)[0].close()
+    holder = subprocess.Popen(
+        [sys.executable, "-c",
+         "import duckdb, sys; conn = duckdb.connect(sys.argv[1]); print('locked', flush=True); sys.stdin.read()",
+         str(cache_path(pack_dir))],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        with pytest.raises(RuntimeError, match="read-only"):
+            open_read_only(pack_dir)
+    finally:
+        holder.stdin.close()
+        holder.wait()
@@ -0,0 +1,126 @@
+"""
+Tests for harness/grader.py: the SET_EQ and NEAR checks and query timeouts.
+
+Run with: python -m pytest tests/python
+"""
+
+import threading
+import time
+
+import duckdb
+import pytest
+
+from harness import grader
+from harness.grader import QueryTimeout, drop_result, execute, result_fingerprint, run_solution, run_test
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect(':memory:')
+    yield conn
+    conn.close()
+
+
+def check(conn, sql, assert_type, expected, **test):
+    result, error = run_solution(conn, sql)
+    assert error is None
+    return run_test(conn, {'assert': assert_type, 'expected': expected, **test}, sql, result)
+
+
+def test_set_eq_ignores_order(conn):
+    sql = "SELECT * FROM (VALUES (1, 'a'), (2, 'b')) t(id, name)"
+    expected = [{'id': 2, 'name': 'b'}, {'id': 1, 'name': 'a'}]
+    assert check(conn, sql, 'SET_EQ', expected) == (True, "OK")
+
+
+def test_set_eq_counts_duplicates(conn):
+    sql = "SELECT * FROM (VALUES (1), (1), (2)) t(id)"
+    passed, message = check(conn, sql, 'SET_EQ', [{'id': 1}, {'id': 2}, {'id': 2}])
+    assert not passed
+    assert message == "Sets do not match (1 unexpected, 1 missing rows)"
+
+
+def test_set_eq_does_not_round_expected_values(conn):
+    # Cast to the INTEGER column, an expected 1.5 would become 2 and pass
+    sql = "SELECT 2::INTEGER AS n"
+    assert not check(conn, sql, 'SET_EQ', [{'n': 1.5}])[0]
+    assert check(conn, sql, 'SET_EQ', [{'n': 2}])[0]
+    assert check(conn, sql, 'SET_EQ', [{'n': 2.0}])[0]
+
+
+def test_set_eq_rejects_mismatched_kinds(conn):
+    # grader.ts compares typeof: the string '2' never equals the number 2
+    passed, message = check(conn, "SELECT 2 AS n", 'SET_EQ', [{'n': '2'}])
+    assert not passed
+    assert message == "Sets do not match (expected a string in column n, got INTEGER)"
+    assert not check(conn, "SELECT '1' AS s", 'SET_EQ', [{'s': 1}])[0]
+    assert not check(conn, "SELECT 1 AS b", 'SET_EQ', [{'b': True}])[0]
+
+
+def test_set_eq_compares_decimals_dates_and_nulls(conn):
+    sql = "SELECT 12.35::DECIMAL(18, 2) AS amount, DATE '2024-01-05' AS day, NULL::INTEGER AS missing"
+    assert check(conn, sql, 'SET_EQ', [{'amount': 12.35, 'day': '2024-01-05', 'missing': None}])[0]
+    assert not check(conn, sql, 'SET_EQ', [{'amount': 12.35, 'day': '2024-01-06', 'missing': None}])[0]
+
+
+def test_set_eq_needs_the_same_columns(conn):
+    assert check(conn, "SELECT 1 AS a", 'SET_EQ', [{'b': 1}]) == (False, "Sets do not match")
+
+
+def test_near_within_tolerance(conn):
+    sql = "SELECT * FROM (VALUES (1, 0.33333), (2, 0.66667)) t(id, share)"
+    expected = [{'id': 1, 'share': 1 / 3}, {'id': 2, 'share': 2 / 3}]
+    assert check(conn, sql, 'NEAR', expected) == (True, "OK")
+    assert check(conn, sql, 'NEAR', expected, tolerance={'abs': 1e-6}) == (False, "Value mismatch at row 0")
+
+
+def test_near_matches_rows_by_position(conn):
+    sql = "SELECT * FROM (VALUES (1), (2), (3)) t(id)"
+    assert check(conn, sql, 'NEAR', [{'id': 1}, {'id': 2}, {'id': 3}])[0]
+    assert check(conn, sql, 'NEAR', [{'id': 1}, {'id': 3}, {'id': 2}]) == (False, "Value mismatch at row 1")
+
+
+def test_near_does_not_coerce_expected_values(conn):
+    sql = "SELECT * FROM (VALUES (1, 'x'), (2, 'y')) t(n, s)"
+    assert check(conn, sql, 'NEAR', [{'n': 1, 's': 'x'}, {'n': 2, 's': 2}]) == (False, "Value mismatch at row 1")
+    assert check(conn, "SELECT 2::INTEGER AS n", 'NEAR', [{'n': 1.5}], tolerance={'abs': 0.1}) == (
+        False, "Value mismatch at row 0")
+
+
+def test_timeout_interrupts_the_query(conn):
+    with pytest.raises(QueryTimeout):
+        execute(conn, "SELECT COUNT(*) FROM range(10000000000)", timeout_ms=50)
+    assert execute(conn, "SELECT 42", timeout_ms=50).fetchone() == (42,)
+
+
+def test_late_watchdog_does_not_interrupt_the_next_query(conn, monkeypatch):
+    # Hold the watchdog back until its query has returned, then let it fire
+    # while the next query on the connection runs
+    timers = []
+
+    class LateTimer(threading.Timer):
+        def start(self):
+            timers.append(self)
+
+        def cancel(self):
+            pass
+
+    monkeypatch.setattr(grader.threading, 'Timer', LateTimer)
+    assert execute(conn, "SELECT 1", timeout_ms=1).fetchone() == (1,)
+    monkeypatch.undo()
+
+    fire = threading.Thread(target=lambda: (time.sleep(0.05), timers[0].function()))
+    fire.start()
+    assert execute(conn, "SELECT COUNT(*) FROM range(300000000)").fetchone() == (300000000,)
+    fire.join()
+
+
+def test_result_fingerprint_includes_column_types(conn):
+    fingerprints = []
+    for sql in ("SELECT 2 AS x", "SELECT 2::BIGINT AS x", "SELECT 2 AS x"):
+        result, error = run_solution(conn, sql)
+        assert error is None
+        fingerprints.append(result_fingerprint(conn, result))
+        drop_result(conn, result)
+    assert fingerprints[0] != fingerprints[1]
+    assert fingerprints[0] == fingerprints[2]
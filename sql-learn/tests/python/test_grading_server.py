@@ -0,0 +1,70 @@
+"""
+Tests for scripts/grading-server.py's request handling.
+
+Run with: python -m pytest tests/python
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from harness import duck
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "grading-server.py"
+
+
+@pytest.fixture(scope="module")
+def server():
+    spec = importlib.util.spec_from_file_location("grading_server", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def state(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(duck, 'CACHE_DIR', tmp_path / "cache")
+    pack_dir = tmp_path / "pack"
+    pack_dir.mkdir()
+    duckdb.execute(f"COPY (SELECT range AS id FROM range(3)) TO '{pack_dir / 'items.parquet'}'")
+    tests = [{'name': 'all_items', 'assert': 'SET_EQ', 'expected': [{'id': 0}, {'id': 1}, {'id': 2}]}]
+    pack = {'id': 'pack_test', 'challenges': [{'id': 'q1', 'tests': tests}]}
+    (pack_dir / "pack.json").write_text(json.dumps(pack))
+
+    # One pooled connection, so every request reuses the same cursor
+    pack = server.open_pack(pack_dir, workers=1)
+    yield {
+        'packs': {pack['id']: pack},
+        'verdicts': server.new_verdict_cache(16),
+        'metrics': server.new_metrics(),
+        'timeout_ms': 1000,
+        'max_rows': None,
+        'precheck': False,
+        'verbose': False,
+    }
+    pack['conn'].close()
+
+
+def grade(server, state, sql):
+    body = json.dumps({'pack_id': 'pack_test', 'challenge_id': 'q1', 'sql': sql})
+    status, payload = server.handle_grade(state, body)
+    assert status == 200
+    return payload
+
+
+def test_grades_a_submission(server, state):
+    assert grade(server, state, "SELECT id FROM items")['pass']
+    assert not grade(server, state, "SELECT id FROM items WHERE id > 0")['pass']
+
+
+def test_submissions_cannot_read_an_earlier_result(server, state):
+    assert grade(server, state, "SELECT id FROM items")['pass']
+    leak = grade(server, state, "SELECT * FROM _solution_result")
+    assert not leak['pass']
+    assert leak['checks'][0]['name'] == 'execution_error'
+    # Nothing is left behind on the pooled connection either
+    cursor = state['packs']['pack_test']['pool'].get()
+    assert cursor.execute("SELECT COUNT(*) FROM duckdb_tables() WHERE temporary").fetchone() == (0,)
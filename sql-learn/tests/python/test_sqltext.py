@@ -0,0 +1,55 @@
+"""
+Tests for harness/sqltext.py: literal spans, normalization and statement counts.
+
+Run with: python -m pytest tests/python
+"""
+
+from harness.sqltext import normalize_sql, quoted_spans, statement_count
+
+
+def test_normalize_collapses_whitespace_and_comments():
+    sql = "SELECT  a ,\n  b  -- note\nFROM ( SELECT 1 AS a, 2 AS b ) /* x */ t ;"
+    assert normalize_sql(sql) == "SELECT a, b FROM (SELECT 1 AS a, 2 AS b) t"
+
+
+def test_normalize_keeps_case():
+    assert normalize_sql("SELECT 1 AS Total") != normalize_sql("SELECT 1 AS total")
+
+
+def test_normalize_keeps_plain_literals_and_identifiers():
+    assert normalize_sql("SELECT 'a  b' AS \"x  y\"") == "SELECT 'a  b' AS \"x  y\""
+    assert normalize_sql("SELECT 'a  b'") != normalize_sql("SELECT 'a b'")
+
+
+def test_normalize_keeps_dollar_quoted_strings():
+    assert normalize_sql("SELECT $$a  b$$") != normalize_sql("SELECT $$a b$$")
+    assert normalize_sql("SELECT $tag$a  ' b$tag$ ,  1") == "SELECT $tag$a  ' b$tag$, 1"
+
+
+def test_normalize_keeps_escape_strings():
+    # \' does not end an E-string, so the spaces after it are still inside
+    assert normalize_sql("SELECT E'it\\'s   x'") != normalize_sql("SELECT E'it\\'s x'")
+    assert normalize_sql("SELECT e'a\\\\'  ,  'b  c'") == "SELECT e'a\\\\', 'b  c'"
+
+
+def test_dollar_parameters_are_code():
+    assert list(quoted_spans("SELECT $1,  $2")) == []
+    assert normalize_sql("SELECT $1,  $2") == "SELECT $1, $2"
+
+
+def test_escape_prefix_only_at_word_start():
+    # LIKE'...' is a plain string after the keyword, not an E-string
+    assert list(quoted_spans("SELECT x LIKE'a\\'")) == [('string', 13, 17)]
+
+
+def test_unterminated_span_runs_to_end():
+    assert list(quoted_spans("SELECT $$open")) == [('string', 7, 13)]
+    assert list(quoted_spans("SELECT E'open\\'")) == [('string', 7, 15)]
+
+
+def test_statement_count():
+    assert statement_count("SELECT 1") == 1
+    assert statement_count("SELECT 1;;  ") == 1
+    assert statement_count("SELECT 1; SELECT 2") == 2
+    assert statement_count("SELECT ';' -- ;\n/* ; */") == 1
+    assert statement_count("SELECT $$;$$; SELECT E'\\';'") == 2